@@ -170,6 +170,9 @@ def main():
             st.error("Content-fighter mapping not found. Please ensure 'content_fighter_mapping.csv' exists.")
             return
         
+        # Precomputed fighter tags (persisted per data version) back themes.tag_fighter
+        data_loader.prepare_fighter_tags(fighters_df, mapping_df)
+        
         # Fight data is optional - silently continue if empty (only used for bundles)
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
@@ -470,12 +473,12 @@ def render_fighter_profile(fighter_name, fighters_df, mapping_df, content_df):
     st.subheader("Fighter Biography")
     
     # Get thematic tags for biography generation
-    fighter_row = fighters_df[fighters_df['fighter'] == fighter_name]
-    if len(fighter_row) > 0:
-        fighter_tags = themes.tag_fighter(fighter_row.iloc[0], mapping_df)
+    fighter_row = data_loader.get_fighter_row(fighter_name, fighters_df)
+    if fighter_row is not None:
+        fighter_tags = themes.tag_fighter(fighter_row, mapping_df)
         # Generate extended biography
         extended_bio = fighter_profile.generate_extended_biography(
-            profile, fighter_row.iloc[0], fighter_tags
+            profile, fighter_row, fighter_tags
         )
         st.write(extended_bio)
     else:
@@ -529,9 +532,9 @@ def render_fighter_profile(fighter_name, fighters_df, mapping_df, content_df):
             st.plotly_chart(bar_fig, use_container_width=True)
     
     # Thematic tags - use collapsible container instead of expander (to avoid nesting)
-    fighter_row = fighters_df[fighters_df['fighter'] == fighter_name]
-    if len(fighter_row) > 0:
-        fighter_tags = themes.tag_fighter(fighter_row.iloc[0], mapping_df)
+    fighter_row = data_loader.get_fighter_row(fighter_name, fighters_df)
+    if fighter_row is not None:
+        fighter_tags = themes.tag_fighter(fighter_row, mapping_df)
         
         # Use a collapsible container with checkbox to toggle visibility
         show_tags = st.checkbox("Show Thematic Tags", value=False, key=f"show_tags_{fighter_name}")
@@ -685,6 +688,26 @@ def render_bundle_recommendations(selected_content, content_df, fighters_df, fig
                     hide_index=True
                 )
             
+            # Fights between this bundle's fighters
+            if bundle.get('head_to_head'):
+                st.subheader("Head-to-Head")
+                h2h_df = pd.DataFrame(bundle['head_to_head'])
+                st.dataframe(
+                    h2h_df[['event_name', 'event_date', 'fighter_1', 'fighter_2', 'winner', 'method']],
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+            # Fights against opponents the bundle's fighters have in common
+            if bundle.get('shared_opponent_fights'):
+                st.subheader("Shared Opponents")
+                shared_df = pd.DataFrame(bundle['shared_opponent_fights'])
+                st.dataframe(
+                    shared_df[['event_name', 'event_date', 'fighter_1', 'fighter_2', 'winner', 'method']],
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
             # Thematic connection
             if bundle['thematic_connection']:
                 st.subheader("Why This Bundle Works")
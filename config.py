@@ -6,8 +6,19 @@ Configuration file for Streamlit UFC Fighter Recommendation App
 CONTENT_FEATURES_FILE = 'paramount_content_features.csv'
 FIGHTERS_WITH_LORE_FILE = 'fighters_with_lore.csv'
 CONTENT_FIGHTER_MAPPING_FILE = 'content_fighter_mapping.csv'
+CLUSTER_STYLES_FILE = 'cluster_styles.json'
 FIGHT_DATA_FILE = 'UFC-DataLab/data/merged_stats_n_scorecards/merged_stats_n_scorecards.csv'
 
+# Derived data cache (tag tables, indexes) - safe to delete, rebuilt on demand
+CACHE_DIR = '.cache'
+
+# Parquet snapshots of the data files (build with: python -m utils.snapshots)
+SNAPSHOT_DIR = '.cache/snapshots'
+
+# Fighter recommendation backend: 'mapping' (precomputed content_fighter_mapping.csv rows)
+# or 'vector' (theme / genre / narrative vectors, see utils.vector_index)
+RECOMMENDATION_MODE = 'mapping'
+
 # Default settings
 DEFAULT_N_RECOMMENDATIONS = 10
 DEFAULT_N_BUNDLES = 3
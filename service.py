@@ -0,0 +1,327 @@
+"""
+Headless recommendation HTTP service, separate from the Streamlit app.
+A plain ASGI application exposing the recommendation functions as JSON endpoints:
+
+    GET  /health
+    POST /recommendations/fighters   {"genres": [], "themes": [], "types": [], "characters": [],
+                                      "content": [], "n": 10, "mode": "mapping" | "vector"}
+    GET  /recommendations/content?fighter=<name>&n=5
+    POST /bundles                    {"content": [], "n_bundles": 3, "n_fighters": 3}
+
+Data files and indexes are loaded once per worker process at startup. Run with:
+    uvicorn service:app --workers 4
+"""
+
+import json
+import asyncio
+import logging
+import threading
+from urllib.parse import parse_qs
+import numpy as np
+import pandas as pd
+import config
+from utils import data_loader
+from utils import recommendations
+from utils import bundles
+
+
+logger = logging.getLogger(__name__)
+
+# Frames the service cannot run without (fight data is optional)
+REQUIRED_FRAMES = ('content', 'fighters', 'mapping')
+
+# Upper bound for the number of results a request may ask for
+MAX_RESULTS = 100
+
+# Largest accepted request body in bytes
+MAX_BODY_BYTES = 64 * 1024
+
+# Per-process data (frames and warmed indexes), loaded once by _get_data
+_data = None
+_data_lock = threading.Lock()
+
+
+class RequestError(Exception):
+    """Client error reported as a JSON error response."""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _load_data():
+    """
+    Load the data files and warm the indexes the endpoints use.
+    
+    Returns:
+        Dictionary with keys: 'content', 'fighters', 'mapping', 'fights'
+    
+    Raises:
+        RuntimeError: If a required frame loaded empty (the loaders log the cause)
+    """
+    data = {
+        'content': data_loader.load_content_catalog(),
+        'fighters': data_loader.load_fighter_data(),
+        'mapping': data_loader.load_content_fighter_mapping(),
+        'fights': data_loader.load_fight_data()
+    }
+    
+    # The loaders return empty frames on errors; fail startup instead of serving nothing
+    empty = [name for name in REQUIRED_FRAMES if len(data[name]) == 0]
+    if empty:
+        raise RuntimeError(f"Required data failed to load: {', '.join(empty)}")
+    
+    if len(data['fighters']) > 0:
+        data_loader.prepare_fighter_tags(data['fighters'], data['mapping'])
+        data_loader.get_fighter_tag_index(data['fighters'])
+    if len(data['mapping']) > 0:
+        data_loader.get_mapping_matrix(data['mapping'])
+    if len(data['content']) > 0:
+        data_loader.get_content_tag_index(data['content'])
+        if config.RECOMMENDATION_MODE == 'vector' and len(data['fighters']) > 0:
+            data_loader.get_vector_index(data['content'], data['fighters'])
+    return data
+
+
+def _get_data():
+    """Per-process data, loaded on first use."""
+    global _data
+    if _data is None:
+        with _data_lock:
+            if _data is None:
+                _data = _load_data()
+    return _data
+
+
+def _to_json(value):
+    """Convert frames, NumPy values and NaN into JSON-serialisable values."""
+    if isinstance(value, pd.DataFrame):
+        # float32 columns as their shortest decimal form (0.72636098, not 0.7263609766960144)
+        float32_columns = [column for column, dtype in value.dtypes.items() if dtype == np.float32]
+        if float32_columns:
+            value = value.assign(**{
+                column: value[column].to_numpy().astype(str).astype(np.float64)
+                for column in float32_columns
+            })
+        return [_to_json(record) for record in value.to_dict('records')]
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.float32):
+        # Shortest decimal form of the float32 (0.55, not 0.550000011920929)
+        return _to_json(float(str(value)))
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if value is pd.NaT:
+        return None
+    return value
+
+
+def _count(value, default):
+    """Validate a result count parameter."""
+    if value is None:
+        return default
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"Invalid count: {value!r}")
+    if not 1 <= count <= MAX_RESULTS:
+        raise RequestError(f"Count must be between 1 and {MAX_RESULTS}")
+    return count
+
+
+def _string_list(body, key):
+    """Validate an optional list-of-strings body field."""
+    value = body.get(key)
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise RequestError(f"'{key}' must be a list of strings")
+    return value
+
+
+def fighters_for_filters(body):
+    """POST /recommendations/fighters: fighters for filters and/or selected content."""
+    data = _get_data()
+    mode = body.get('mode')
+    if mode not in (None, 'mapping', 'vector'):
+        raise RequestError("'mode' must be 'mapping' or 'vector'")
+    fighter_recs = recommendations.get_fighters_for_filters(
+        selected_genres=_string_list(body, 'genres'),
+        selected_themes=_string_list(body, 'themes'),
+        selected_types=_string_list(body, 'types'),
+        selected_characters=_string_list(body, 'characters'),
+        selected_content=_string_list(body, 'content'),
+        mapping_df=data['mapping'],
+        fighters_df=data['fighters'],
+        content_df=data['content'],
+        n_recommendations=_count(body.get('n'), config.DEFAULT_N_RECOMMENDATIONS),
+        mode=mode
+    )
+    return {'fighters': fighter_recs}
+
+
+def content_for_fighter(query):
+    """GET /recommendations/content: content recommendations for a fighter."""
+    data = _get_data()
+    fighter_name = query.get('fighter')
+    if not fighter_name:
+        raise RequestError("Missing 'fighter' parameter")
+    content_recs = recommendations.get_content_for_fighter(
+        fighter_name,
+        data['mapping'],
+        data['content'],
+        n_recommendations=_count(query.get('n'), 5)
+    )
+    return {'fighter': fighter_name, 'content': content_recs}
+
+
+def bundles_for_content(body):
+    """POST /bundles: content + fighters + fights bundles for selected content."""
+    data = _get_data()
+    content_titles = _string_list(body, 'content')
+    if not content_titles:
+        raise RequestError("'content' must list at least one title")
+    content_bundles = bundles.create_bundles_for_content(
+        content_titles,
+        data['content'],
+        data['fighters'],
+        data['fights'],
+        data['mapping'],
+        n_bundles=_count(body.get('n_bundles'), config.DEFAULT_N_BUNDLES),
+        n_fighters_per_bundle=_count(body.get('n_fighters'), 3)
+    )
+    return {'bundles': content_bundles}
+
+
+def health(query):
+    """GET /health: process is up and which data files loaded (503 if required data is missing)."""
+    try:
+        data = _get_data()
+    except Exception:
+        logger.exception("Health check: data failed to load")
+        return 503, {'status': 'error', 'rows': {}}
+    rows = {name: len(df) for name, df in data.items()}
+    if any(rows[name] == 0 for name in REQUIRED_FRAMES):
+        return 503, {'status': 'error', 'rows': rows}
+    return {'status': 'ok', 'rows': rows}
+
+
+# (method, path) -> (handler, takes a JSON body)
+ROUTES = {
+    ('GET', '/health'): (health, False),
+    ('POST', '/recommendations/fighters'): (fighters_for_filters, True),
+    ('GET', '/recommendations/content'): (content_for_fighter, False),
+    ('POST', '/bundles'): (bundles_for_content, True)
+}
+
+
+async def _read_body(receive):
+    """Read the full request body, enforcing MAX_BODY_BYTES."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise RequestError("Client disconnected")
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise RequestError("Request body too large", status=413)
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def _send_json(send, status, payload):
+    """Send a JSON response."""
+    body = json.dumps(_to_json(payload)).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii'))
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _handle_http(scope, receive, send):
+    """Route one HTTP request to its handler."""
+    method = scope['method']
+    path = scope['path'].rstrip('/') or '/'
+    route = ROUTES.get((method, path))
+    if route is None:
+        if any(route_path == path for _, route_path in ROUTES):
+            await _send_json(send, 405, {'error': f"Method {method} not allowed"})
+        else:
+            await _send_json(send, 404, {'error': f"Unknown path {path}"})
+        return
+    
+    handler, takes_body = route
+    try:
+        if takes_body:
+            raw = await _read_body(receive)
+            try:
+                argument = json.loads(raw) if raw else {}
+            except ValueError:
+                raise RequestError("Request body is not valid JSON")
+            if not isinstance(argument, dict):
+                raise RequestError("Request body must be a JSON object")
+        else:
+            query = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+            argument = {key: values[-1] for key, values in query.items()}
+        
+        # Recommendation calls are CPU-bound: keep them off the event loop
+        result = await asyncio.to_thread(handler, argument)
+    except RequestError as e:
+        await _send_json(send, e.status, {'error': str(e)})
+        return
+    except Exception:
+        # Details stay in the server log; clients get a generic message
+        logger.exception("Error handling %s %s", scope.get('method'), scope.get('path'))
+        await _send_json(send, 500, {'error': "Error getting recommendations"})
+        return
+    
+    # Handlers return a body, or (status, body) for a non-200 response
+    status, result = result if isinstance(result, tuple) else (200, result)
+    await _send_json(send, status, result)
+
+
+async def _handle_lifespan(receive, send):
+    """Load the data at worker startup so the first request does not pay for it."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await asyncio.to_thread(_get_data)
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """
+    ASGI entry point.
+    
+    Args:
+        scope: ASGI connection scope
+        receive: ASGI receive callable
+        send: ASGI send callable
+    """
+    if scope['type'] == 'lifespan':
+        await _handle_lifespan(receive, send)
+    elif scope['type'] == 'http':
+        await _handle_http(scope, receive, send)
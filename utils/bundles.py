@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 from . import fight_finder
 from . import themes
+from . import data_loader
 
 
 def create_bundle(content_title, fighter_names, content_df, fighters_df, fight_data, mapping_df=None):
@@ -28,15 +29,16 @@ def create_bundle(content_title, fighter_names, content_df, fighters_df, fight_d
         'content': None,
         'fighters': [],
         'fights': [],
+        'head_to_head': [],
+        'shared_opponent_fights': [],
         'thematic_connection': '',
         'themes': [],
         'genres': []
     }
     
     # Get content metadata
-    content_row = content_df[content_df['title'] == content_title]
-    if len(content_row) > 0:
-        content_row = content_row.iloc[0]
+    content_row = data_loader.get_content_row(content_title, content_df)
+    if content_row is not None:
         content_tags = themes.tag_content(content_row)
         bundle['content'] = {
             'title': content_title,
@@ -52,15 +54,14 @@ def create_bundle(content_title, fighter_names, content_df, fighters_df, fight_d
     # Get fighter profiles
     bundle_themes = set(bundle['themes'])
     for fighter_name in fighter_names:
-        fighter_row = fighters_df[fighters_df['fighter'] == fighter_name]
-        if len(fighter_row) > 0:
-            fighter_row = fighter_row.iloc[0]
+        fighter_row = data_loader.get_fighter_row(fighter_name, fighters_df)
+        if fighter_row is not None:
             fighter_tags = themes.tag_fighter(fighter_row, mapping_df)
             
             fighter_profile = {
                 'name': fighter_name,
                 'fighting_style': fighter_tags.get('fighting_style', 'Unknown'),
-                'lore': fighter_row.get('lore', ''),
+                'lore': data_loader.get_fighter_lore(fighter_name, fighters_df),
                 'themes': fighter_tags.get('themes', []),
                 'character_archetypes': fighter_tags.get('character_archetypes', [])
             }
@@ -72,9 +73,24 @@ def create_bundle(content_title, fighter_names, content_df, fighters_df, fight_d
     
     # Find related fights
     if fight_data is not None and len(fight_data) > 0:
-        fights = fight_finder.find_fights_for_fighters(fighter_names, fight_data, limit=10)
-        if len(fights) > 0:
-            bundle['fights'] = fights.to_dict('records')
+        bundle['fights'] = fight_finder.find_fights_for_fighters(
+            fighter_names, fight_data, limit=10, as_records=True
+        )
+        
+        # Fights between the bundle's own fighters and against opponents they share,
+        # from the precomputed pair index
+        seen_shared_fights = set()
+        for i, fighter_a in enumerate(fighter_names):
+            for fighter_b in fighter_names[i + 1:]:
+                bundle['head_to_head'].extend(
+                    fight_finder.get_head_to_head(fighter_a, fighter_b, fight_data, as_records=True)
+                )
+                for fight in fight_finder.get_shared_opponent_fights(fighter_a, fighter_b, fight_data, limit=5, as_records=True):
+                    # A bout can come up for several pairs of the bundle's fighters
+                    fight_key = (fight['event_name'], fight['event_date'], fight['fighter_1'], fight['fighter_2'])
+                    if fight_key not in seen_shared_fights:
+                        seen_shared_fights.add(fight_key)
+                        bundle['shared_opponent_fights'].append(fight)
     
     # Generate thematic connection explanation
     bundle['thematic_connection'] = generate_bundle_explanation(bundle)
@@ -3,12 +3,60 @@ Data loading module for Streamlit app.
 All functions use Streamlit caching for performance.
 """
 
+import logging
 import pandas as pd
 import numpy as np
-import ast
 from pathlib import Path
 import streamlit as st
 import config
+from . import mapping_matrix
+from . import themes
+from . import disk_cache
+from . import tag_index
+from . import vector_index
+from . import snapshots
+from . import fighter_store
+from . import fight_finder
+from . import fight_store
+from . import schema
+
+
+logger = logging.getLogger(__name__)
+
+
+def _data_version(file_path):
+    """
+    Identify the on-disk version of a data file.
+    
+    Args:
+        file_path: Path to the data file
+    
+    Returns:
+        String built from file name, modification time and size
+    """
+    return disk_cache.file_version(file_path)
+
+
+def _frame_version(df):
+    """
+    Get the cache key for a DataFrame returned by one of the loaders.
+    Frames built elsewhere have no key, so callers fall back to scanning. pandas copies
+    attrs through sort_values, copy and reindexing, so a reordered frame of the same
+    length shares its loader frame's key: row-position lookups must check the row they
+    land on before trusting it.
+    
+    Args:
+        df: DataFrame
+    
+    Returns:
+        Tuple of (data_version, row count), or None if the frame carries no data version
+    """
+    if df is None:
+        return None
+    data_version = df.attrs.get('data_version')
+    if data_version is None:
+        return None
+    return (data_version, len(df))
 
 
 @st.cache_data
@@ -20,56 +68,376 @@ def load_content_catalog():
         DataFrame with content titles, types, genres, themes, etc.
     """
     try:
-        df = pd.read_csv(config.CONTENT_FEATURES_FILE)
-        
-        # Parse string representations of lists
-        if 'themes' in df.columns:
-            df['themes'] = df['themes'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-        if 'character_archetypes' in df.columns:
-            df['character_archetypes'] = df['character_archetypes'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-        if 'narrative_patterns' in df.columns:
-            df['narrative_patterns'] = df['narrative_patterns'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-        if 'genres' in df.columns:
-            df['genres'] = df['genres'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+        # Prefer a fresh Parquet snapshot (list columns already parsed)
+        df = snapshots.load_snapshot(config.CONTENT_FEATURES_FILE)
+        if df is None:
+            df = snapshots.read_content_catalog_csv(config.CONTENT_FEATURES_FILE)
         
+        df.attrs['data_version'] = _data_version(config.CONTENT_FEATURES_FILE)
         return df
     except Exception as e:
+        # st.error is a no-op outside a Streamlit runtime (e.g. the HTTP service)
+        logger.exception("Error loading content catalog")
         st.error(f"Error loading content catalog: {e}")
         return pd.DataFrame()
 
 
+def _read_fighter_file():
+    """Read the fighters data file, preferring a fresh Parquet snapshot over parsing the CSV."""
+    df = snapshots.load_snapshot(config.FIGHTERS_WITH_LORE_FILE)
+    if df is None:
+        df = pd.read_csv(config.FIGHTERS_WITH_LORE_FILE)
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def _build_content_row_index(_content_df, frame_version):
+    # First occurrence wins, matching content_df[mask].iloc[0]
+    titles = _content_df['title']
+    first = ~titles.duplicated(keep='first')
+    return dict(zip(titles[first], np.flatnonzero(first.to_numpy())))
+
+
+def get_content_row(content_title, content_df):
+    """
+    Look up a content item's row by title.
+    Uses a title -> row position index built once per data version for frames returned
+    by load_content_catalog, and falls back to a scan for any other frame.
+    
+    Args:
+        content_title: Title of the content
+        content_df: Content catalog DataFrame
+    
+    Returns:
+        Content row as a Series, or None if not found
+    """
+    if content_df is None or len(content_df) == 0 or 'title' not in content_df.columns:
+        return None
+    
+    frame_version = _frame_version(content_df)
+    if frame_version is not None:
+        position = _build_content_row_index(content_df, frame_version).get(content_title)
+        if position is None:
+            return None
+        if content_df['title'].iat[position] == content_title:
+            return content_df.iloc[position]
+        # The index was built from a reordered frame of the same version: scan instead
+    
+    content_rows = content_df[content_df['title'] == content_title]
+    return content_rows.iloc[0] if len(content_rows) > 0 else None
+
+
 @st.cache_data
 def load_fighter_data():
     """
-    Load fighter data with lore and stats.
+    Load fighter data with stats.
+    Lore and the numeric stats block are exported to the fighter store and left out of
+    the returned frame, so workers share one memory-mapped copy. get_fighter_row puts a
+    fighter's stats back on its row, get_fighter_lore reads lore on demand, and bulk
+    builders use fighter_store.with_store_columns. Columns use the compact dtypes of
+    utils.schema.
     
     Returns:
-        DataFrame with fighter profiles, stats, lore, etc.
+        DataFrame with fighter profiles, stats, etc.
     """
     try:
-        df = pd.read_csv(config.FIGHTERS_WITH_LORE_FILE)
+        df = schema.compact_fighters(_read_fighter_file(), report=True)
+        data_version = _data_version(config.FIGHTERS_WITH_LORE_FILE)
+        df.attrs['data_version'] = data_version
+        
+        # Keep lore and stats resident only if the store could not be written
+        store = get_fighter_store(df)
+        if store is not None:
+            exported = ['lore'] + list(store['columns'])
+            df = df.drop(columns=[column for column in exported if column in df.columns])
+            df.attrs['data_version'] = data_version
         return df
     except Exception as e:
+        logger.exception("Error loading fighter data")
         st.error(f"Error loading fighter data: {e}")
         return pd.DataFrame()
 
 
+@st.cache_resource(show_spinner=False)
+def _build_fighter_index(_fighters_df, frame_version):
+    # First occurrence wins, matching fighters_df[mask].iloc[0]
+    names = _fighters_df['fighter']
+    first = ~names.duplicated(keep='first')
+    return dict(zip(names[first], np.flatnonzero(first.to_numpy())))
+
+
+def get_fighter_row(fighter_name, fighters_df):
+    """
+    Look up a fighter's row by name.
+    Uses a name -> row position index built once per data version for frames returned
+    by load_fighter_data, and falls back to a scan for any other frame.
+    
+    Args:
+        fighter_name: Name of the fighter
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Fighter row as a Series, or None if not found
+    """
+    if fighters_df is None or len(fighters_df) == 0 or 'fighter' not in fighters_df.columns:
+        return None
+    
+    frame_version = _frame_version(fighters_df)
+    if frame_version is not None:
+        position = _build_fighter_index(fighters_df, frame_version).get(fighter_name)
+        if position is None:
+            return None
+        if fighters_df['fighter'].iat[position] == fighter_name:
+            return _with_store_stats(fighters_df.iloc[position], fighters_df)
+        # The index was built from a reordered frame of the same version: scan instead
+    
+    fighter_rows = fighters_df[fighters_df['fighter'] == fighter_name]
+    return _with_store_stats(fighter_rows.iloc[0], fighters_df) if len(fighter_rows) > 0 else None
+
+
+def _with_store_stats(fighter_row, fighters_df):
+    """Fighter row with the stats columns its frame was loaded without, read from the store."""
+    store = get_fighter_store(fighters_df)
+    if store is None or all(column in fighter_row.index for column in store['columns']):
+        return fighter_row
+    stats = fighter_store.stats_for_name(store, fighter_row.get('fighter'))
+    if stats is None:
+        return fighter_row
+    missing = [column for column in stats.index if column not in fighter_row.index]
+    row = pd.concat([fighter_row, stats[missing].astype(object)])
+    row.name = fighter_row.name
+    row.attrs = dict(fighter_row.attrs)
+    return row
+
+
+@st.cache_resource(show_spinner=False)
+def _open_fighter_store(_fighters_df, frame_version):
+    # Memory-mapped, so cache_resource (not cache_data): workers share the file's pages
+    data_version, row_count = frame_version
+    store = fighter_store.open_fighter_store(data_version, row_count)
+    if store is None:
+        source_df = _fighters_df
+        if 'lore' not in source_df.columns:
+            # Frame was loaded without lore and stats and the store has since been removed:
+            # rebuild it from the data file if that is still the same version
+            source_df = schema.compact_fighters(_read_fighter_file())
+            if _data_version(config.FIGHTERS_WITH_LORE_FILE) != data_version or len(source_df) != row_count:
+                source_df = None
+        if source_df is not None and fighter_store.build_fighter_store(source_df, data_version):
+            store = fighter_store.open_fighter_store(data_version, row_count)
+    if store is not None:
+        # Serves lore to tagging for frames loaded without it
+        fighter_store.register_store(store, data_version, row_count)
+    return store
+
+
+def get_fighter_store(fighters_df):
+    """
+    Get the on-disk fighter store (memory-mapped stats matrix + lore sidecar)
+    for a frame returned by load_fighter_data. Exported once per data version.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Store dictionary (see fighter_store.open_fighter_store), or None if the frame
+        was not produced by load_fighter_data or the store could not be written
+    """
+    frame_version = _frame_version(fighters_df)
+    if frame_version is None or len(fighters_df) == 0:
+        return None
+    return _open_fighter_store(fighters_df, frame_version)
+
+
+def get_fighter_lore(fighter_name, fighters_df):
+    """
+    Get a fighter's lore, reading it from the fighter store by byte offset when the
+    frame was loaded without its lore column.
+    
+    Args:
+        fighter_name: Name of the fighter
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Lore string (NaN if the fighter has no lore), or '' if the fighter is not found
+    """
+    fighter_row = get_fighter_row(fighter_name, fighters_df)
+    if fighter_row is None:
+        return ''
+    if 'lore' in fighter_row.index:
+        return fighter_row.get('lore', '')
+    
+    store = get_fighter_store(fighters_df)
+    if store is None:
+        return ''
+    return fighter_store.read_lore(store, fighter_name)
+
+
 @st.cache_data
 def load_content_fighter_mapping():
     """
     Load content-fighter similarity mapping.
+    Titles, names and labels load as categoricals and scores as float32 (see utils.schema).
     
     Returns:
         DataFrame with content_title, fighter_name, similarity_score, etc.
     """
     try:
-        df = pd.read_csv(config.CONTENT_FIGHTER_MAPPING_FILE)
+        # Prefer a fresh Parquet snapshot over parsing the CSV
+        df = snapshots.load_snapshot(config.CONTENT_FIGHTER_MAPPING_FILE)
+        if df is None:
+            df = pd.read_csv(config.CONTENT_FIGHTER_MAPPING_FILE)
+        df = schema.compact_mapping(df, report=True)
+        df.attrs['data_version'] = _data_version(config.CONTENT_FIGHTER_MAPPING_FILE)
         return df
     except Exception as e:
+        logger.exception("Error loading content-fighter mapping")
         st.error(f"Error loading content-fighter mapping: {e}")
         return pd.DataFrame()
 
 
+@st.cache_resource(show_spinner=False)
+def _load_mapping_matrix(_mapping_df, frame_version):
+    # _mapping_df is not hashed by Streamlit; frame_version identifies it.
+    # Warm starts read the persisted .npz; cold starts build and persist it
+    key = disk_cache.cache_key(*frame_version, mapping_matrix.MATRIX_VERSION)
+    path = disk_cache.cache_path('mapping_matrix', key, 'npz')
+    matrix = mapping_matrix.load_mapping_matrix(path)
+    if matrix is None:
+        matrix = mapping_matrix.build_mapping_matrix(_mapping_df)
+        mapping_matrix.save_mapping_matrix(matrix, path)
+    return matrix
+
+
+def get_mapping_matrix(mapping_df):
+    """
+    Get the sparse content x fighter similarity matrix for a mapping returned by
+    load_content_fighter_mapping. Built once per data version, persisted under
+    config.CACHE_DIR and shared across reruns and sessions.
+    
+    Args:
+        mapping_df: Content-fighter mapping DataFrame
+    
+    Returns:
+        Matrix dictionary (see mapping_matrix.build_mapping_matrix), or None if the
+        mapping was not produced by load_content_fighter_mapping
+    """
+    frame_version = _frame_version(mapping_df)
+    if frame_version is None:
+        return None
+    return _load_mapping_matrix(mapping_df, frame_version)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_fighter_tag_table(_fighters_df, _mapping_df, fighters_version, mapping_version):
+    # Warm starts read the persisted table; cold starts build and persist it
+    key = disk_cache.cache_key(fighters_version, mapping_version, themes.TAG_TABLE_VERSION)
+    path = disk_cache.cache_path('fighter_tags', key)
+    table = disk_cache.read_json(path)
+    if table is None:
+        table = themes.build_fighter_tag_table(_fighters_df, _mapping_df)
+        disk_cache.write_json(path, table)
+    return table
+
+
+def prepare_fighter_tags(fighters_df, mapping_df=None):
+    """
+    Load the fighter tag table for the loaded data and register it with themes.tag_fighter.
+    The table is computed once per data version and persisted under config.CACHE_DIR,
+    so warm starts skip tagging entirely.
+    
+    Args:
+        fighters_df: Fighters DataFrame from load_fighter_data
+        mapping_df: Optional content-fighter mapping DataFrame from load_content_fighter_mapping
+    
+    Returns:
+        True if a tag table was registered
+    """
+    fighters_version = _frame_version(fighters_df)
+    if fighters_version is None or len(fighters_df) == 0:
+        return False
+    
+    mapping_version = _frame_version(mapping_df)
+    if mapping_version is None:
+        # Only loader frames can be matched to a table later; ignore anything else
+        mapping_df = None
+    
+    table = _load_fighter_tag_table(fighters_df, mapping_df, fighters_version, mapping_version)
+    themes.set_fighter_tag_table(table, fighters_df.attrs['data_version'], mapping_version)
+    return True
+
+
+@st.cache_resource(show_spinner=False)
+def _build_fighter_tag_index(_fighters_df, frame_version):
+    return tag_index.build_fighter_tag_index(_fighters_df)
+
+
+def get_fighter_tag_index(fighters_df):
+    """
+    Get the per-fighter tag bitsets used by the direct filter matching.
+    Built once per data version for frames returned by load_fighter_data, and on the
+    fly for any other frame.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Index dictionary (see tag_index.build_fighter_tag_index)
+    """
+    frame_version = _frame_version(fighters_df)
+    if frame_version is None:
+        return tag_index.build_fighter_tag_index(fighters_df)
+    return _build_fighter_tag_index(fighters_df, frame_version)
+
+
+@st.cache_resource(show_spinner=False)
+def _build_content_tag_index(_content_df, frame_version):
+    return tag_index.build_content_tag_index(_content_df)
+
+
+def get_content_tag_index(content_df):
+    """
+    Get per-content tag bitsets for a content catalog.
+    Built once per data version for frames returned by load_content_catalog, and on
+    the fly for any other frame.
+    
+    Args:
+        content_df: Content catalog DataFrame
+    
+    Returns:
+        Index dictionary (see tag_index.build_content_tag_index)
+    """
+    frame_version = _frame_version(content_df)
+    if frame_version is None:
+        return tag_index.build_content_tag_index(content_df)
+    return _build_content_tag_index(content_df, frame_version)
+
+
+@st.cache_resource(show_spinner=False)
+def _build_vector_index(_content_df, _fighters_df, content_version, fighters_version):
+    return vector_index.build_vector_index(_content_df, _fighters_df)
+
+
+def get_vector_index(content_df, fighters_df):
+    """
+    Get the theme vectors of a content catalog and fighters frame.
+    Built once per pair of data versions for frames returned by the loaders, and on the
+    fly for any other frames.
+    
+    Args:
+        content_df: Content catalog DataFrame
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Index dictionary (see vector_index.build_vector_index)
+    """
+    content_version = _frame_version(content_df)
+    fighters_version = _frame_version(fighters_df)
+    if content_version is None or fighters_version is None:
+        return vector_index.build_vector_index(content_df, fighters_df)
+    return _build_vector_index(content_df, fighters_df, content_version, fighters_version)
+
+
 @st.cache_data(ttl=3600, show_spinner=False)
 def load_fight_data():
     """
@@ -85,13 +453,44 @@ def load_fight_data():
         return pd.DataFrame()
     
     try:
-        df = pd.read_csv(fight_file)
+        # Only the columns fight_finder uses, from the columnar store when it is fresh
+        df = fight_store.load_fights(config.FIGHT_DATA_FILE)
+        df.attrs['data_version'] = _data_version(config.FIGHT_DATA_FILE)
+        
+        # Build the fighter -> fights index with the data, not on the first lookup
+        get_fight_index(df)
         return df
     except Exception:
         # Silently return empty DataFrame - fight data is optional
         return pd.DataFrame()
 
 
+@st.cache_resource(show_spinner=False)
+def _build_fight_index(_fight_data, frame_version):
+    index = fight_finder.build_fight_index(_fight_data)
+    fight_finder.register_fight_index(index, *frame_version)
+    return index
+
+
+def get_fight_index(fight_data):
+    """
+    Get the fighter name -> fight rows index for fight data returned by load_fight_data.
+    Built once per data version and registered with fight_finder, whose lookups use it
+    for frames of that version.
+    
+    Args:
+        fight_data: UFC fight DataFrame
+    
+    Returns:
+        Index dictionary (see fight_finder.build_fight_index), or None if the frame was
+        not produced by load_fight_data
+    """
+    frame_version = _frame_version(fight_data)
+    if frame_version is None or len(fight_data) == 0:
+        return None
+    return _build_fight_index(fight_data, frame_version)
+
+
 @st.cache_data
 def load_all_data():
     """
@@ -0,0 +1,122 @@
+"""
+On-disk cache helpers for derived data (tag tables, vocabularies, indexes).
+Files live under config.CACHE_DIR and are keyed by the data version they were built from.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+import config
+
+
+def file_version(file_path):
+    """
+    Identify the on-disk version of a data file.
+    
+    Args:
+        file_path: Path to the data file
+    
+    Returns:
+        String built from file name, modification time and size
+    """
+    stat = Path(file_path).stat()
+    return f"{Path(file_path).name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def cache_key(*parts):
+    """
+    Build a short, stable key from data versions and format versions.
+    
+    Args:
+        *parts: Values identifying the inputs (converted with str())
+    
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def cache_path(name, key, extension='json'):
+    """
+    Get the cache file path for a named artifact and key.
+    
+    Args:
+        name: Artifact name, e.g. 'fighter_tags'
+        key: Key from cache_key()
+        extension: File extension without the dot
+    
+    Returns:
+        Path inside config.CACHE_DIR
+    """
+    return Path(config.CACHE_DIR) / f"{name}_{key}.{extension}"
+
+
+def read_json(path):
+    """
+    Read a cached JSON artifact.
+    
+    Args:
+        path: Cache file path
+    
+    Returns:
+        Parsed JSON data, or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """
+    Write a JSON artifact atomically (temp file + rename), so concurrent
+    workers never read a half-written file. Failures are ignored: the cache is optional.
+    
+    Args:
+        path: Cache file path
+        data: JSON-serializable data
+    
+    Returns:
+        True if the file was written
+    """
+    path = Path(path)
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def replace_atomically(path, write):
+    """
+    Write a binary file through a temp file + rename, so readers never see a partial file.
+    
+    Args:
+        path: Destination path
+        write: Function called with the open binary temp file
+    
+    Raises:
+        OSError: If the file cannot be written (the temp file is removed)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
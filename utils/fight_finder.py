@@ -8,91 +8,392 @@ import numpy as np
 from datetime import datetime
 
 
-def find_fights_for_fighters(fighter_names, fight_data, limit=10):
+# Date format of the fight data's event_date column
+EVENT_DATE_FORMAT = '%d/%m/%Y'
+
+# datetime64 column parsed from event_date once at load (see add_event_datetimes)
+EVENT_DATETIME_COLUMN = 'event_datetime'
+
+# Boolean column flagging title bouts, computed from bout_type once at load (see add_title_bout_flags)
+TITLE_BOUT_COLUMN = 'is_title_bout'
+
+# Index registered by data_loader for fight data of one data version (see register_fight_index)
+_registered_index = None
+
+
+def normalize_fighter_name(name):
     """
-    Find fights involving one or more fighters.
+    Normalize a fighter name for matching (uppercase, like the fight data's names).
+    
+    Args:
+        name: Fighter name
+    
+    Returns:
+        Normalized name string
+    """
+    return str(name).upper()
+
+
+def event_datetimes(fight_data):
+    """
+    Get the event dates of fight rows as datetime64 values.
     
     Args:
-        fighter_names: List of fighter names or single fighter name string
         fight_data: UFC fight DataFrame
-        limit: Maximum number of fights to return
     
     Returns:
-        DataFrame with fight records
+        datetime64 Series aligned with fight_data (NaT where the date is missing or unparseable)
     """
-    if fight_data is None or len(fight_data) == 0:
-        return pd.DataFrame()
+    if EVENT_DATETIME_COLUMN in fight_data.columns:
+        return fight_data[EVENT_DATETIME_COLUMN]
+    if 'event_date' not in fight_data.columns:
+        return pd.Series(pd.NaT, index=fight_data.index, dtype='datetime64[ns]')
+    return pd.to_datetime(fight_data['event_date'], errors='coerce', format=EVENT_DATE_FORMAT)
+
+
+def add_event_datetimes(fight_data):
+    """
+    Parse event_date once into the EVENT_DATETIME_COLUMN datetime64 column.
     
-    if isinstance(fighter_names, str):
-        fighter_names = [fighter_names]
+    Args:
+        fight_data: UFC fight DataFrame
     
-    if len(fighter_names) == 0:
-        return pd.DataFrame()
+    Returns:
+        DataFrame with the parsed date column (attrs are kept)
+    """
+    attrs = dict(fight_data.attrs)
+    fight_data = fight_data.assign(**{EVENT_DATETIME_COLUMN: event_datetimes(fight_data)})
+    fight_data.attrs = attrs
+    return fight_data
+
+
+def title_bout_flags(fight_data):
+    """
+    Flag the title bouts among fight rows (bout_type containing 'Title', any case).
+    
+    Args:
+        fight_data: UFC fight DataFrame
+    
+    Returns:
+        Boolean Series aligned with fight_data (False where bout_type is missing)
+    """
+    if TITLE_BOUT_COLUMN in fight_data.columns:
+        return fight_data[TITLE_BOUT_COLUMN]
+    if 'bout_type' not in fight_data.columns:
+        return pd.Series(False, index=fight_data.index, dtype=bool)
+    return fight_data['bout_type'].astype(object).str.contains('Title', case=False, na=False).astype(bool)
+
+
+def add_title_bout_flags(fight_data):
+    """
+    Compute the TITLE_BOUT_COLUMN flag column once.
+    
+    Args:
+        fight_data: UFC fight DataFrame
+    
+    Returns:
+        DataFrame with the flag column (attrs are kept)
+    """
+    attrs = dict(fight_data.attrs)
+    fight_data = fight_data.assign(**{TITLE_BOUT_COLUMN: title_bout_flags(fight_data)})
+    fight_data.attrs = attrs
+    return fight_data
+
+
+def pair_key(fighter_a, fighter_b):
+    """
+    Key of a pairing of two fighters in the fight index, independent of corner order.
+    
+    Args:
+        fighter_a: Name of one fighter
+        fighter_b: Name of the other fighter
+    
+    Returns:
+        Tuple of the two normalized names, sorted
+    """
+    return tuple(sorted((normalize_fighter_name(fighter_a), normalize_fighter_name(fighter_b))))
+
+
+def _recency_keys(dates):
+    """Sort keys for newest-first order with undated fights last: (undated, -date ns)."""
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce')
+    undated = dates.isna().to_numpy()
+    values = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    return undated, np.where(undated, 0, -values)
+
+
+def build_fight_index(fight_data):
+    """
+    Index fight rows by fighter, over both corners, newest fight first.
+    
+    Args:
+        fight_data: UFC fight DataFrame
+    
+    Returns:
+        Dictionary with 'rows': normalized fighter name -> int64 array of row positions
+        (each bout once, newest first, undated last, ties in file order), 'pairs':
+        pair_key -> int64 array of the pair's bouts in the same order, 'title': boolean
+        array of title bouts, and the per-row 'undated' / 'recency' sort keys
+    """
+    undated, recency = _recency_keys(event_datetimes(fight_data))
+    positions = np.arange(len(fight_data), dtype=np.int64)
+    corners = []
+    corner_names = {}
+    for column in ('red_fighter_name', 'blue_fighter_name'):
+        if column in fight_data.columns:
+            # Non-string names never match, as with .str.upper() in the scan
+            names = fight_data[column].astype(object).str.upper()
+            valid = names.notna().to_numpy()
+            corners.append(pd.DataFrame({'name': names[valid].to_numpy(), 'row': positions[valid]}))
+            corner_names[column] = names
+    
+    rows = {}
+    if corners:
+        pairs = pd.concat(corners, ignore_index=True).drop_duplicates()
+        pairs = pairs.assign(undated=undated[pairs['row']], recency=recency[pairs['row']])
+        pairs = pairs.sort_values(['name', 'undated', 'recency', 'row'])
+        for name, group in pairs.groupby('name', sort=False)['row']:
+            rows[name] = group.to_numpy(dtype=np.int64)
+    
+    # Bouts of each pairing, keyed by the sorted pair of names
+    matchups = {}
+    if len(corner_names) == 2:
+        red = corner_names['red_fighter_name']
+        blue = corner_names['blue_fighter_name']
+        valid = (red.notna() & blue.notna() & (red != blue)).to_numpy()
+        red = red.to_numpy()[valid]
+        blue = blue.to_numpy()[valid]
+        rows_valid = positions[valid]
+        bouts = pd.DataFrame({
+            'low': np.where(red < blue, red, blue),
+            'high': np.where(red < blue, blue, red),
+            'undated': undated[rows_valid],
+            'recency': recency[rows_valid],
+            'row': rows_valid
+        }).sort_values(['low', 'high', 'undated', 'recency', 'row'])
+        for key, group in bouts.groupby(['low', 'high'], sort=False)['row']:
+            matchups[key] = group.to_numpy(dtype=np.int64)
+    
+    return {
+        'rows': rows,
+        'pairs': matchups,
+        'title': title_bout_flags(fight_data).to_numpy(dtype=bool),
+        'undated': undated,
+        'recency': recency
+    }
+
+
+def register_fight_index(index, data_version, row_count):
+    """
+    Register the fight index that serves lookups on fight data of one data version.
+    
+    Args:
+        index: Index dictionary from build_fight_index (None to unregister)
+        data_version: Data version of the fight data the index was built from
+        row_count: Number of rows in that frame
+    """
+    global _registered_index
+    if index is None:
+        _registered_index = None
+        return
+    _registered_index = {
+        'index': index,
+        'version': (data_version, row_count)
+    }
+
+
+def _index_for(fight_data):
+    """
+    Registered index if it was built from this frame's data version, else None.
+    A reordered frame of that version (attrs survive sort_values) also matches, so
+    callers check the rows they gather with _indexed_rows.
+    """
+    registered = _registered_index
+    if registered is None:
+        return None
+    if (fight_data.attrs.get('data_version'), len(fight_data)) != registered['version']:
+        return None
+    return registered['index']
+
+
+def _indexed_rows(fight_data, positions, names, both_corners=False):
+    """
+    Rows of fight_data at index positions, or None if any of them does not involve the
+    normalized names (the frame is not in the index's row order, so callers scan).
+    With both_corners, each row must have one of the names in each corner.
+    """
+    rows = fight_data.iloc[positions]
+    if len(rows) == 0:
+        return rows
+    if 'red_fighter_name' not in rows.columns or 'blue_fighter_name' not in rows.columns:
+        return None
+    red = rows['red_fighter_name'].astype(object).str.upper().isin(names).to_numpy(dtype=bool)
+    blue = rows['blue_fighter_name'].astype(object).str.upper().isin(names).to_numpy(dtype=bool)
+    involved = (red & blue) if both_corners else (red | blue)
+    return rows if involved.all() else None
+
+
+def _recent_positions(index, fighter_names, limit):
+    """
+    Row positions of the fighters' most recent fights (newest first), from the index.
+    Each fighter's list is already in that order, so one fighter is a slice and several
+    merge only their first `limit` fights.
+    """
+    names = dict.fromkeys(normalize_fighter_name(name) for name in fighter_names)
+    lists = [index['rows'][name] for name in names if name in index['rows']]
+    if not lists:
+        return np.array([], dtype=np.int64)
+    if len(lists) == 1:
+        return lists[0][:limit]
+    
+    candidates = np.unique(np.concatenate([rows[:limit] for rows in lists]))
+    order = np.lexsort((candidates, index['recency'][candidates], index['undated'][candidates]))
+    return candidates[order][:limit]
+
+
+def _fighter_fights(fighter_names, fight_data):
+    """
+    Rows of fights involving any of the fighters (either corner), in file order.
+    Gathers the rows from the registered index when it matches fight_data, and scans
+    both name columns otherwise.
+    """
+    fighter_names_upper = [normalize_fighter_name(name) for name in fighter_names]
     
-    # Normalize fighter names (uppercase for matching)
-    fighter_names_upper = [name.upper() for name in fighter_names]
+    index = _index_for(fight_data)
+    if index is not None:
+        matches = [index['rows'][name] for name in set(fighter_names_upper) if name in index['rows']]
+        positions = np.unique(np.concatenate(matches)) if matches else np.array([], dtype=np.int64)
+        rows = _indexed_rows(fight_data, positions, fighter_names_upper)
+        if rows is not None:
+            return rows.copy()
     
     # Find fights where any of the fighters participated (red or blue corner)
     mask = (
         fight_data['red_fighter_name'].str.upper().isin(fighter_names_upper) |
         fight_data['blue_fighter_name'].str.upper().isin(fighter_names_upper)
     )
+    return fight_data[mask].copy()
+
+
+def _fight_record_columns(fights):
+    """
+    Output columns of formatted fight records, computed column-wise over the fight rows.
+    Missing source columns take the same defaults as a per-row .get() would.
+    """
+    def column(name, default):
+        if name in fights.columns:
+            return fights[name].to_numpy(dtype=object)
+        return np.full(len(fights), default, dtype=object)
     
-    fighter_fights = fight_data[mask].copy()
+    red_fighter = column('red_fighter_name', 'Unknown')
+    blue_fighter = column('blue_fighter_name', 'Unknown')
+    red_result = column('red_fighter_result', '')
+    blue_result = column('blue_fighter_result', '')
     
-    if len(fighter_fights) == 0:
+    # Red corner's name if red won, else blue's if blue won, else None
+    winner = np.where(red_result == 'W', red_fighter, np.where(blue_result == 'W', blue_fighter, None))
+    
+    return {
+        'event_name': column('event_name', 'Unknown Event'),
+        'event_date': column('event_date', ''),
+        'fighter_1': red_fighter,
+        'fighter_2': blue_fighter,
+        'winner': winner,
+        'method': column('method', ''),
+        'round': column('round', ''),
+        'red_result': red_result,
+        'blue_result': blue_result
+    }
+
+
+def format_fights(fights):
+    """
+    Format fight rows into fight records.
+    
+    Args:
+        fights: Fight rows (UFC fight DataFrame slice)
+    
+    Returns:
+        DataFrame with columns: event_name, event_date, fighter_1, fighter_2, winner,
+        method, round, red_result, blue_result
+    """
+    if len(fights) == 0:
         return pd.DataFrame()
+    formatted = pd.DataFrame(_fight_record_columns(fights))
+    return formatted.infer_objects()
+
+
+def fight_records(fights):
+    """
+    Format fight rows into a list of fight record dictionaries, without building a
+    DataFrame. Same records as format_fights(fights).to_dict('records'), except that
+    fights without a winner keep winner=None.
+    
+    Args:
+        fights: Fight rows (UFC fight DataFrame slice)
+    
+    Returns:
+        List of dictionaries
+    """
+    columns = _fight_record_columns(fights)
+    names = list(columns)
+    values = [array.tolist() for array in columns.values()]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def find_fights_for_fighters(fighter_names, fight_data, limit=10, as_records=False):
+    """
+    Find fights involving one or more fighters.
+    
+    Args:
+        fighter_names: List of fighter names or single fighter name string
+        fight_data: UFC fight DataFrame
+        limit: Maximum number of fights to return
+        as_records: Return a list of record dictionaries instead of a DataFrame
+    
+    Returns:
+        DataFrame with fight records (see format_fights), or the list of records
+    """
+    empty = [] if as_records else pd.DataFrame()
+    if fight_data is None or len(fight_data) == 0:
+        return empty
+    
+    if isinstance(fighter_names, str):
+        fighter_names = [fighter_names]
+    
+    if len(fighter_names) == 0:
+        return empty
     
-    # Sort by date (most recent first) if date column exists
-    if 'event_date' in fighter_fights.columns:
-        try:
-            # Try to parse dates
-            fighter_fights['date_parsed'] = pd.to_datetime(
-                fighter_fights['event_date'], 
-                errors='coerce',
-                format='%d/%m/%Y'
-            )
-            fighter_fights = fighter_fights.sort_values('date_parsed', ascending=False, na_position='last')
-            fighter_fights = fighter_fights.drop('date_parsed', axis=1)
-        except:
-            # If date parsing fails, keep original order
-            pass
-    
-    # Limit results
-    fighter_fights = fighter_fights.head(limit)
-    
-    # Format fight information
-    formatted_fights = []
-    for idx, fight in fighter_fights.iterrows():
-        red_fighter = fight.get('red_fighter_name', 'Unknown')
-        blue_fighter = fight.get('blue_fighter_name', 'Unknown')
-        red_result = fight.get('red_fighter_result', '')
-        blue_result = fight.get('blue_fighter_result', '')
-        method = fight.get('method', '')
-        round_num = fight.get('round', '')
-        event_name = fight.get('event_name', 'Unknown Event')
-        event_date = fight.get('event_date', '')
+    fighter_fights = None
+    index = _index_for(fight_data)
+    if index is not None:
+        # Most recent fights straight from the index's newest-first lists
+        fighter_fights = _indexed_rows(
+            fight_data,
+            _recent_positions(index, fighter_names, limit),
+            [normalize_fighter_name(name) for name in fighter_names]
+        )
+    if fighter_fights is None:
+        fighter_fights = _fighter_fights(fighter_names, fight_data)
         
-        # Determine which fighter won
-        winner = None
-        if red_result == 'W':
-            winner = red_fighter
-        elif blue_result == 'W':
-            winner = blue_fighter
+        # Sort by date (most recent first, ties in file order) if date column exists
+        if 'event_date' in fighter_fights.columns:
+            try:
+                undated, recency = _recency_keys(event_datetimes(fighter_fights))
+                fighter_fights = fighter_fights.iloc[np.lexsort((np.arange(len(fighter_fights)), recency, undated))]
+            except (ValueError, TypeError):
+                # If date parsing fails, keep original order
+                pass
         
-        formatted_fights.append({
-            'event_name': event_name,
-            'event_date': event_date,
-            'fighter_1': red_fighter,
-            'fighter_2': blue_fighter,
-            'winner': winner,
-            'method': method,
-            'round': round_num,
-            'red_result': red_result,
-            'blue_result': blue_result
-        })
+        # Limit results
+        fighter_fights = fighter_fights.head(limit)
     
-    return pd.DataFrame(formatted_fights)
+    if len(fighter_fights) == 0:
+        return empty
+    
+    if as_records:
+        return fight_records(fighter_fights)
+    return format_fights(fighter_fights)
 
 
 def get_recent_fights(fighter_name, fight_data, n=5):
@@ -124,21 +425,137 @@ def get_title_fights(fighter_name, fight_data):
     if fight_data is None or len(fight_data) == 0:
         return pd.DataFrame()
     
-    fighter_name_upper = fighter_name.upper()
+    index = _index_for(fight_data)
+    if index is not None:
+        # The fighter's bouts in file order, kept where the precomputed title flag is set
+        name = normalize_fighter_name(fighter_name)
+        positions = np.sort(index['rows'].get(name, np.array([], dtype=np.int64)))
+        # Check all of the fighter's rows, so the positional title flags are known to apply
+        rows = _indexed_rows(fight_data, positions, [name])
+        if rows is not None:
+            return rows[index['title'][positions]].copy()
     
     # Find fights involving this fighter
-    mask = (
-        (fight_data['red_fighter_name'].str.upper() == fighter_name_upper) |
-        (fight_data['blue_fighter_name'].str.upper() == fighter_name_upper)
-    )
-    
-    fighter_fights = fight_data[mask].copy()
+    fighter_fights = _fighter_fights([fighter_name], fight_data)
     
     # Filter for title fights
     if 'bout_type' in fighter_fights.columns:
-        title_mask = fighter_fights['bout_type'].str.contains('Title', case=False, na=False)
-        title_fights = fighter_fights[title_mask]
+        title_fights = fighter_fights[title_bout_flags(fighter_fights).to_numpy(dtype=bool)]
         return title_fights
     
     return pd.DataFrame()
 
+
+def _pair_fights(key, fight_data):
+    """
+    Rows of the bouts between the two fighters of a pair_key, newest first (undated last,
+    ties in file order). Uses the registered pair index when it matches fight_data.
+    """
+    index = _index_for(fight_data)
+    if index is not None:
+        positions = index['pairs'].get(key, np.array([], dtype=np.int64))
+        fights = _indexed_rows(fight_data, positions, list(key), both_corners=True)
+        if fights is not None:
+            return fights
+    
+    if 'red_fighter_name' not in fight_data.columns or 'blue_fighter_name' not in fight_data.columns:
+        return fight_data.iloc[0:0]
+    red = fight_data['red_fighter_name'].astype(object).str.upper()
+    blue = fight_data['blue_fighter_name'].astype(object).str.upper()
+    mask = ((red == key[0]) & (blue == key[1])) | ((red == key[1]) & (blue == key[0]))
+    fights = fight_data[mask.to_numpy(dtype=bool)]
+    undated, recency = _recency_keys(event_datetimes(fights))
+    return fights.iloc[np.lexsort((np.arange(len(fights)), recency, undated))]
+
+
+def get_head_to_head(fighter_a, fighter_b, fight_data, as_records=False):
+    """
+    Get the fights between two fighters (either corner), most recent first.
+    
+    Args:
+        fighter_a: Name of one fighter
+        fighter_b: Name of the other fighter
+        fight_data: UFC fight DataFrame
+        as_records: Return a list of record dictionaries instead of a DataFrame
+    
+    Returns:
+        DataFrame with fight records (see format_fights), or the list of records
+    """
+    empty = [] if as_records else pd.DataFrame()
+    if fight_data is None or len(fight_data) == 0:
+        return empty
+    
+    key = pair_key(fighter_a, fighter_b)
+    if key[0] == key[1]:
+        return empty
+    
+    fights = _pair_fights(key, fight_data)
+    if len(fights) == 0:
+        return empty
+    if as_records:
+        return fight_records(fights)
+    return format_fights(fights)
+
+
+def get_shared_opponents(fighter_a, fighter_b, fight_data):
+    """
+    Get the opponents both fighters have fought, excluding each other.
+    
+    Args:
+        fighter_a: Name of one fighter
+        fighter_b: Name of the other fighter
+        fight_data: UFC fight DataFrame
+    
+    Returns:
+        Sorted list of normalized opponent names
+    """
+    if fight_data is None or len(fight_data) == 0:
+        return []
+    
+    key = pair_key(fighter_a, fighter_b)
+    opponents = []
+    for name in key:
+        fights = _fighter_fights([name], fight_data)
+        if 'red_fighter_name' not in fights.columns or 'blue_fighter_name' not in fights.columns:
+            return []
+        red = fights['red_fighter_name'].astype(object).str.upper()
+        blue = fights['blue_fighter_name'].astype(object).str.upper()
+        other = pd.Series(np.where(red == name, blue, red)).dropna()
+        opponents.append(set(other) - set(key))
+    return sorted(opponents[0] & opponents[1])
+
+
+def get_shared_opponent_fights(fighter_a, fighter_b, fight_data, limit=10, as_records=False):
+    """
+    Get both fighters' fights against the opponents they have in common, most recent
+    first. Each bout comes from the pair index, without rescanning fight history.
+    
+    Args:
+        fighter_a: Name of one fighter
+        fighter_b: Name of the other fighter
+        fight_data: UFC fight DataFrame
+        limit: Maximum number of fights to return
+        as_records: Return a list of record dictionaries instead of a DataFrame
+    
+    Returns:
+        DataFrame with fight records (see format_fights), or the list of records
+    """
+    empty = [] if as_records else pd.DataFrame()
+    opponents = get_shared_opponents(fighter_a, fighter_b, fight_data)
+    if not opponents:
+        return empty
+    
+    key = pair_key(fighter_a, fighter_b)
+    fights = pd.concat([
+        _pair_fights(pair_key(fighter, opponent), fight_data)
+        for opponent in opponents
+        for fighter in key
+    ])
+    if len(fights) == 0:
+        return empty
+    
+    undated, recency = _recency_keys(event_datetimes(fights))
+    fights = fights.iloc[np.lexsort((np.arange(len(fights)), recency, undated))].head(limit)
+    if as_records:
+        return fight_records(fights)
+    return format_fights(fights)
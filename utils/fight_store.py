@@ -0,0 +1,266 @@
+"""
+Columnar fight store: the fight data file persisted as a Parquet snapshot of only the
+columns fight_finder reads, with the event dates and title-bout flags already derived.
+Loads read just the projected columns, and scans by fighter, event date range or bout
+type push their predicates down to the Parquet reader, so the full frame is never
+materialized. The store is optional: without pyarrow, or when the store is absent or
+stale, loads and scans stream the CSV in chunks instead.
+
+Build (or refresh) the store with:
+    python -m utils.fight_store
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+import numpy as np
+import config
+from . import disk_cache
+from . import fight_finder
+from . import snapshots
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # pyarrow not installed - loads and scans read the CSV
+    pc = None
+    pq = None
+
+
+# Bump when the store layout changes so old stores are treated as stale
+STORE_VERSION = 1
+
+# Columns of the fight data file that fight_finder uses
+FIGHT_COLUMNS = [
+    'event_name', 'event_date', 'bout_type', 'method', 'round',
+    'red_fighter_name', 'blue_fighter_name', 'red_fighter_result', 'blue_fighter_result'
+]
+
+# Columns derived once when the store is built (see fight_finder.add_event_datetimes
+# and fight_finder.add_title_bout_flags)
+DERIVED_COLUMNS = [fight_finder.EVENT_DATETIME_COLUMN, fight_finder.TITLE_BOUT_COLUMN]
+
+# Normalized fighter names, stored only for fighter predicates (not loaded by default)
+NAME_KEY_COLUMNS = {'red_fighter_name': 'red_fighter_key', 'blue_fighter_name': 'blue_fighter_key'}
+
+# Rows per Parquet row group; row group statistics let date predicates skip whole groups
+ROW_GROUP_SIZE = 8192
+
+# Rows per chunk when streaming the CSV without a store
+CSV_CHUNK_SIZE = 50000
+
+
+def store_path(file_path):
+    """
+    Get the store path for a fight data file.
+    
+    Args:
+        file_path: Path to the fight data CSV
+    
+    Returns:
+        Path inside config.SNAPSHOT_DIR
+    """
+    return snapshots.snapshot_path(file_path).with_suffix('.fights.parquet')
+
+
+def _prepare(df):
+    """Derive the date, title-bout and name key columns of projected fight rows."""
+    df = fight_finder.add_title_bout_flags(fight_finder.add_event_datetimes(df))
+    for column, key_column in NAME_KEY_COLUMNS.items():
+        if column in df.columns:
+            df[key_column] = df[column].astype(object).str.upper()
+    return df
+
+
+def _read_csv_chunks(file_path):
+    """Stream the projected columns of the fight data CSV in prepared chunks."""
+    wanted = set(FIGHT_COLUMNS)
+    for chunk in pd.read_csv(file_path, usecols=lambda column: column in wanted, chunksize=CSV_CHUNK_SIZE):
+        yield _prepare(chunk)
+
+
+def build_fight_store(file_path):
+    """
+    Write the columnar store of a fight data CSV, tagged with the CSV's file version.
+    
+    Args:
+        file_path: Path to the fight data CSV
+    
+    Returns:
+        Path of the written store
+    """
+    if pa is None:
+        raise ImportError("pyarrow package not installed. Run: pip install pyarrow")
+    
+    source_version = disk_cache.file_version(file_path)
+    df = pd.concat(list(_read_csv_chunks(file_path)), ignore_index=True)
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'source_version'] = source_version.encode('utf-8')
+    metadata[b'store_version'] = str(STORE_VERSION).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    
+    # Write to a temp file and rename, so readers never see a half-written store
+    path = store_path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+    tmp_path.replace(path)
+    return path
+
+
+def _fresh_store_schema(file_path):
+    """Schema of the store if pyarrow is installed and the store is fresh, else None."""
+    if pa is None:
+        return None
+    try:
+        schema = pq.read_schema(store_path(file_path))
+        metadata = schema.metadata or {}
+        if metadata.get(b'store_version') != str(STORE_VERSION).encode('utf-8'):
+            return None
+        if metadata.get(b'source_version') != disk_cache.file_version(file_path).encode('utf-8'):
+            return None
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    return schema
+
+
+def default_columns():
+    """Columns returned by loads and scans unless others are requested."""
+    return FIGHT_COLUMNS + DERIVED_COLUMNS
+
+
+def _to_pandas(table):
+    """Convert a store table like the CSV reader would give it (NaN for missing objects)."""
+    df = table.to_pandas()
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+
+def _store_filter(fighters, start_date, end_date, bout_type):
+    """Arrow filter expression for the scan predicates (None when there are none)."""
+    conditions = []
+    if fighters is not None:
+        names = pa.array(sorted({fight_finder.normalize_fighter_name(name) for name in fighters}), type=pa.string())
+        conditions.append(
+            pc.field(NAME_KEY_COLUMNS['red_fighter_name']).isin(names) |
+            pc.field(NAME_KEY_COLUMNS['blue_fighter_name']).isin(names)
+        )
+    if start_date is not None:
+        conditions.append(pc.field(fight_finder.EVENT_DATETIME_COLUMN) >= pd.Timestamp(start_date))
+    if end_date is not None:
+        conditions.append(pc.field(fight_finder.EVENT_DATETIME_COLUMN) <= pd.Timestamp(end_date))
+    if bout_type is not None:
+        conditions.append(pc.match_substring(pc.field('bout_type'), bout_type, ignore_case=True))
+    
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _chunk_mask(chunk, fighters, start_date, end_date, bout_type):
+    """Boolean mask of the rows of a prepared CSV chunk matching the scan predicates."""
+    mask = np.ones(len(chunk), dtype=bool)
+    if fighters is not None:
+        names = {fight_finder.normalize_fighter_name(name) for name in fighters}
+        in_fight = np.zeros(len(chunk), dtype=bool)
+        for key_column in NAME_KEY_COLUMNS.values():
+            if key_column in chunk.columns:
+                in_fight |= chunk[key_column].isin(names).to_numpy()
+        mask &= in_fight
+    dates = fight_finder.event_datetimes(chunk)
+    if start_date is not None:
+        mask &= (dates >= pd.Timestamp(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (dates <= pd.Timestamp(end_date)).to_numpy()
+    if bout_type is not None:
+        if 'bout_type' in chunk.columns:
+            bout_types = chunk['bout_type'].astype(object).str.contains(bout_type, case=False, na=False, regex=False)
+            mask &= bout_types.to_numpy(dtype=bool)
+        else:
+            mask[:] = False
+    return mask
+
+
+def scan_fights(file_path=None, fighters=None, start_date=None, end_date=None, bout_type=None, columns=None):
+    """
+    Read the fight rows matching all given predicates, in file order.
+    With a fresh store the predicates are pushed down to the Parquet reader; otherwise
+    the CSV is streamed in chunks and each chunk is filtered before it is kept.
+    
+    Args:
+        file_path: Path to the fight data CSV (defaults to config.FIGHT_DATA_FILE)
+        fighters: Fighter names, either corner (None for any fighter)
+        start_date: Earliest event date, inclusive (None for no lower bound)
+        end_date: Latest event date, inclusive (None for no upper bound)
+        bout_type: Case-insensitive substring of bout_type, e.g. 'Title' (None for any)
+        columns: Columns to return (defaults to default_columns())
+    
+    Returns:
+        DataFrame of the matching fights (empty if the file doesn't exist)
+    """
+    file_path = config.FIGHT_DATA_FILE if file_path is None else file_path
+    columns = default_columns() if columns is None else list(columns)
+    if not Path(file_path).exists():
+        return pd.DataFrame()
+    
+    schema = _fresh_store_schema(file_path)
+    if schema is not None:
+        expression = _store_filter(fighters, start_date, end_date, bout_type)
+        available = [column for column in columns if column in schema.names]
+        try:
+            table = pq.read_table(store_path(file_path), columns=available, filters=expression)
+            return _to_pandas(table)
+        except (OSError, ValueError, pa.ArrowException):
+            pass  # Unreadable store - fall back to the CSV
+    
+    matches = []
+    for chunk in _read_csv_chunks(file_path):
+        chunk = chunk[_chunk_mask(chunk, fighters, start_date, end_date, bout_type)]
+        matches.append(chunk[[column for column in columns if column in chunk.columns]])
+    if not matches:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(matches, ignore_index=True)
+
+
+def load_fights(file_path=None, columns=None):
+    """
+    Load every fight row with only the projected columns.
+    
+    Args:
+        file_path: Path to the fight data CSV (defaults to config.FIGHT_DATA_FILE)
+        columns: Columns to load (defaults to default_columns())
+    
+    Returns:
+        DataFrame of all fights (empty if the file doesn't exist)
+    """
+    return scan_fights(file_path, columns=columns)
+
+
+def main(argv=None):
+    """
+    Build the fight store for the configured (or given) fight data file.
+    
+    Args:
+        argv: Optional path to the fight data CSV
+    
+    Returns:
+        Process exit code
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    file_path = argv[0] if argv else config.FIGHT_DATA_FILE
+    if not Path(file_path).exists():
+        print(f"Skipping fights: {file_path} not found")
+        return 1
+    path = build_fight_store(file_path)
+    print(f"Built fight store: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
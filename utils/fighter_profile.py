@@ -9,6 +9,7 @@ import random
 import re
 import os
 from utils import themes
+from utils import data_loader
 
 # Load environment variables from .env file if it exists (local development)
 try:
@@ -54,13 +55,11 @@ def get_fighter_profile(fighter_name, fighters_df):
     Returns:
         Dictionary with fighter profile data, or None if not found
     """
-    fighter_row = fighters_df[fighters_df['fighter'] == fighter_name]
-    if len(fighter_row) == 0:
+    fighter_row = data_loader.get_fighter_row(fighter_name, fighters_df)
+    if fighter_row is None:
         return None
     
-    fighter_row = fighter_row.iloc[0]
-    
-    # Extract key stats
+    # Extract key stats (get_fighter_row restores them from the fighter store)
     stats = {
         'strikes_per_min': fighter_row.get('strikes_landed_per_min_mean', 0) if pd.notna(fighter_row.get('strikes_landed_per_min_mean')) else 0,
         'strike_accuracy': fighter_row.get('strike_accuracy_mean', 0) if pd.notna(fighter_row.get('strike_accuracy_mean')) else 0,
@@ -88,7 +87,7 @@ def get_fighter_profile(fighter_name, fighters_df):
     
     # Other info
     other = {
-        'lore': fighter_row.get('lore', ''),
+        'lore': data_loader.get_fighter_lore(fighter_name, fighters_df),
         'fighting_style': fighter_row.get('fighting_style', None),
         'kmeans_cluster': fighter_row.get('kmeans_cluster', None)
     }
@@ -0,0 +1,361 @@
+"""
+On-disk fighter store: numeric stats as a memory-mapped matrix and lore as a UTF-8
+sidecar read by byte offset.
+Frames returned by data_loader.load_fighter_data leave both out, so every worker process
+on a host maps the same stats file and shares its physical pages instead of each holding
+its own copy. Rows and bulk builders get the columns back by fighter name.
+"""
+
+import numpy as np
+import pandas as pd
+from . import disk_cache
+
+
+# Bump when the store layout changes so old stores are rebuilt
+STORE_VERSION = 2
+
+# Store registered by data_loader for frames loaded without their lore column
+# (see register_store)
+_registered_store = None
+
+
+def stats_columns(fighters_df):
+    """
+    Get the numeric columns that go into the stats matrix (stats, counts, cluster IDs).
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        List of column names
+    """
+    return fighters_df.select_dtypes(include=['number', 'bool']).columns.tolist()
+
+
+def _store_paths(source_version, row_count):
+    """Stats matrix, lore sidecar and manifest paths for a data version."""
+    key = disk_cache.cache_key(source_version, row_count, STORE_VERSION)
+    return {
+        'stats': disk_cache.cache_path('fighter_stats', key, 'npy'),
+        'lore': disk_cache.cache_path('fighter_lore', key, 'txt'),
+        'manifest': disk_cache.cache_path('fighter_store', key)
+    }
+
+
+def build_fighter_store(fighters_df, source_version):
+    """
+    Export a fighters frame to the on-disk store.
+    
+    Writes the numeric columns as one contiguous float64 .npy matrix (rows aligned with
+    fighters_df), the lore strings as a UTF-8 sidecar, and a JSON manifest with the column
+    names and dtypes, fighter names and lore byte offsets. float64 holds every value of
+    the compact stats, count and cluster dtypes exactly, so columns read back unchanged.
+    The manifest is written last, so a store is only visible once complete.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+        source_version: Data version of the fighters frame
+    
+    Returns:
+        True if the store was written
+    """
+    paths = _store_paths(source_version, len(fighters_df))
+    columns = stats_columns(fighters_df)
+    stats = np.ascontiguousarray(fighters_df[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+    
+    # Lore sidecar: offsets and lengths in bytes (-1 length for missing lore)
+    lore_offsets = []
+    lore_lengths = []
+    chunks = []
+    position = 0
+    lore_values = fighters_df['lore'] if 'lore' in fighters_df.columns else pd.Series([np.nan] * len(fighters_df))
+    for lore in lore_values:
+        if isinstance(lore, str):
+            encoded = lore.encode('utf-8')
+            lore_offsets.append(position)
+            lore_lengths.append(len(encoded))
+            chunks.append(encoded)
+            position += len(encoded)
+        else:
+            lore_offsets.append(position)
+            lore_lengths.append(-1)
+    
+    try:
+        disk_cache.replace_atomically(paths['stats'], lambda f: np.save(f, stats))
+        disk_cache.replace_atomically(paths['lore'], lambda f: f.writelines(chunks))
+    except OSError:
+        return False
+    
+    names = fighters_df['fighter'] if 'fighter' in fighters_df.columns else pd.Series([None] * len(fighters_df))
+    manifest = {
+        'store_version': STORE_VERSION,
+        'source_version': source_version,
+        'columns': columns,
+        'dtypes': [str(fighters_df[column].dtype) for column in columns],
+        'fighters': [name if isinstance(name, str) else None for name in names],
+        'lore_offsets': lore_offsets,
+        'lore_lengths': lore_lengths
+    }
+    return disk_cache.write_json(paths['manifest'], manifest)
+
+
+def open_fighter_store(source_version, row_count):
+    """
+    Open the store for a data version, memory-mapping the stats matrix read-only.
+    
+    Args:
+        source_version: Data version of the fighters frame
+        row_count: Number of rows in the fighters frame
+    
+    Returns:
+        Store dictionary, or None if no complete store exists for this version
+    """
+    paths = _store_paths(source_version, row_count)
+    manifest = disk_cache.read_json(paths['manifest'])
+    if manifest is None or manifest.get('store_version') != STORE_VERSION:
+        return None
+    
+    try:
+        stats = np.load(paths['stats'], mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    
+    # First occurrence wins, like data_loader.get_fighter_row
+    rows = {}
+    for row, name in enumerate(manifest['fighters']):
+        if name is not None and name not in rows:
+            rows[name] = row
+    
+    return {
+        'stats': stats,
+        'columns': {column: j for j, column in enumerate(manifest['columns'])},
+        'dtypes': dict(zip(manifest['columns'], manifest['dtypes'])),
+        'rows': rows,
+        'lore_path': paths['lore'],
+        'lore_offsets': np.asarray(manifest['lore_offsets'], dtype=np.int64),
+        'lore_lengths': np.asarray(manifest['lore_lengths'], dtype=np.int64)
+    }
+
+
+def fighter_stats(store, fighter_name):
+    """
+    Read a fighter's numeric stats from the memory-mapped matrix.
+    
+    Args:
+        store: Store dictionary from open_fighter_store
+        fighter_name: Name of the fighter
+    
+    Returns:
+        Dictionary of column -> float (NaN for missing values), or None if not found
+    """
+    row = store['rows'].get(fighter_name)
+    if row is None:
+        return None
+    values = store['stats'][row]
+    return {column: float(values[j]) for column, j in store['columns'].items()}
+
+
+def _stats_frame(store, rows):
+    """
+    Stats columns of store rows as a DataFrame in the frame's original dtypes.
+    Rows of -1 (fighter not in the store) read as missing.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    found = rows >= 0
+    values = np.full((len(rows), len(store['columns'])), np.nan)
+    values[found] = store['stats'][rows[found]]
+    frame = pd.DataFrame(values, columns=list(store['columns']))
+    for column, dtype in store['dtypes'].items():
+        try:
+            frame[column] = frame[column].astype(dtype)
+        except (TypeError, ValueError):
+            pass  # Missing rows in a non-nullable column - keep it as float
+    return frame
+
+
+def stats_for_name(store, fighter_name):
+    """
+    Get a fighter's stats columns as a Series in the frame's original dtypes.
+    
+    Args:
+        store: Store dictionary from open_fighter_store
+        fighter_name: Name of the fighter
+    
+    Returns:
+        Series of column -> value, or None if the fighter is not in the store
+    """
+    row = store['rows'].get(fighter_name)
+    if row is None:
+        return None
+    return _stats_frame(store, [row]).iloc[0]
+
+
+def read_lore(store, fighter_name):
+    """
+    Read a fighter's lore from the sidecar file by byte offset.
+    
+    Args:
+        store: Store dictionary from open_fighter_store
+        fighter_name: Name of the fighter
+    
+    Returns:
+        Lore string, or NaN if the fighter has no lore or is not found
+    """
+    row = store['rows'].get(fighter_name)
+    if row is None or store['lore_lengths'][row] < 0:
+        return np.nan
+    
+    try:
+        with open(store['lore_path'], 'rb') as f:
+            f.seek(int(store['lore_offsets'][row]))
+            return f.read(int(store['lore_lengths'][row])).decode('utf-8')
+    except OSError:
+        return np.nan
+
+
+def read_all_lore(store):
+    """
+    Read every fighter's lore in one sequential pass over the sidecar file.
+    
+    Args:
+        store: Store dictionary from open_fighter_store
+    
+    Returns:
+        List of lore strings (NaN where missing), aligned with the store's rows,
+        or None if the sidecar cannot be read
+    """
+    try:
+        with open(store['lore_path'], 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    
+    return [
+        data[offset:offset + length].decode('utf-8') if length >= 0 else np.nan
+        for offset, length in zip(store['lore_offsets'].tolist(), store['lore_lengths'].tolist())
+    ]
+
+
+def register_store(store, source_version, row_count):
+    """
+    Register the store that serves lore for frames loaded without their lore column.
+    
+    Args:
+        store: Store dictionary from open_fighter_store (None to unregister)
+        source_version: Data version of the fighters frame the store was built from
+        row_count: Number of rows in that frame
+    """
+    global _registered_store
+    if store is None:
+        _registered_store = None
+        return
+    _registered_store = {
+        'store': store,
+        'version': (source_version, row_count)
+    }
+
+
+def _store_for(frame_or_row, row_count=None):
+    """Registered store if it was built from the data version carried in attrs, else None."""
+    registered = _registered_store
+    if registered is None:
+        return None
+    source_version, store_rows = registered['version']
+    if frame_or_row.attrs.get('data_version') != source_version:
+        return None
+    if row_count is not None and row_count != store_rows:
+        return None
+    return registered['store']
+
+
+def lore_for_row(fighter_row):
+    """
+    Get a fighter row's lore, from the row itself or (for rows of a frame loaded without
+    lore) from the registered store.
+    
+    Args:
+        fighter_row: Single row from fighters DataFrame
+    
+    Returns:
+        Lore string, NaN if missing, or '' if no lore source is available
+    """
+    if 'lore' in fighter_row.index:
+        return fighter_row.get('lore', '')
+    
+    store = _store_for(fighter_row)
+    if store is None:
+        return ''
+    return read_lore(store, fighter_row.get('fighter', ''))
+
+
+def with_stats(fighters_df):
+    """
+    Get a fighters frame with its numeric stats columns, re-attaching them by fighter
+    name from the registered store if the frame was loaded without them.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        DataFrame with the store's stats columns when available (fighters_df itself otherwise)
+    """
+    store = _store_for(fighters_df, len(fighters_df))
+    if store is None or 'fighter' not in fighters_df.columns:
+        return fighters_df
+    missing = [column for column in store['columns'] if column not in fighters_df.columns]
+    if not missing:
+        return fighters_df
+    
+    # Align by name, like with_lore; first occurrence wins
+    rows = fighters_df['fighter'].astype(object).map(store['rows']).fillna(-1).to_numpy(dtype=np.int64)
+    stats = _stats_frame(store, rows)[missing]
+    stats.index = fighters_df.index
+    attrs = dict(fighters_df.attrs)
+    fighters_df = pd.concat([fighters_df, stats], axis=1)
+    fighters_df.attrs = attrs
+    return fighters_df
+
+
+def with_store_columns(fighters_df):
+    """
+    Get a fighters frame with both its lore and stats columns (see with_lore and
+    with_stats). Used by the bulk tag, theme and vector builders.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        DataFrame with the store's columns re-attached where they were left out
+    """
+    return with_stats(with_lore(fighters_df))
+
+
+def with_lore(fighters_df):
+    """
+    Get a fighters frame with its lore column, re-attaching it by fighter name from the
+    registered store if the frame was loaded without it. Used by bulk tagging on cold builds.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        DataFrame with a lore column when one is available (fighters_df itself otherwise)
+    """
+    if 'lore' in fighters_df.columns:
+        return fighters_df
+    
+    store = _store_for(fighters_df, len(fighters_df))
+    if store is None:
+        return fighters_df
+    lore = read_all_lore(store)
+    if lore is None or 'fighter' not in fighters_df.columns:
+        return fighters_df
+    
+    # Align by name, not position: a reordered frame of the same version carries the same
+    # attrs. First occurrence wins, like read_lore
+    lore_by_name = pd.Series(
+        [lore[row] for row in store['rows'].values()],
+        index=list(store['rows']),
+        dtype=object
+    )
+    return fighters_df.assign(lore=fighters_df['fighter'].astype(object).map(lore_by_name).to_numpy())
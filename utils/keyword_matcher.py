@@ -0,0 +1,128 @@
+"""
+Compiled multi-keyword matcher for theme extraction.
+Scans a text once for a whole keyword vocabulary instead of running one substring test per keyword.
+"""
+
+import re
+
+
+def _trie_pattern(keywords):
+    """
+    Build a regex alternation shaped like a trie of the keywords.
+    Greedy optional groups make the regex prefer the longest keyword at each position.
+    
+    Args:
+        keywords: Iterable of non-empty keyword strings
+    
+    Returns:
+        Regex source string
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True  # End-of-keyword marker
+    
+    def to_pattern(node):
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here; longer keywords through this node are optional
+            return '(?:' + body + ')?'
+        return body
+    
+    return to_pattern(trie)
+
+
+def build_matcher(keywords):
+    """
+    Compile a keyword vocabulary into a single-pass matcher.
+    
+    The regex finds the longest keyword starting at every text position (a zero-width
+    lookahead, so overlapping matches are kept). Every shorter keyword starting at the
+    same position is a prefix of that match, so each match expands to its keyword
+    prefixes. The result is exactly {k for k in keywords if k in text}.
+    
+    Args:
+        keywords: Iterable of keyword strings (matching is case-sensitive, like `in`)
+    
+    Returns:
+        Dictionary with the compiled pattern and match -> contained keywords expansions
+    """
+    vocabulary = set(keywords)
+    always = tuple(k for k in vocabulary if k == '')  # '' in text is always True
+    vocabulary.discard('')
+    
+    expansions = {}
+    for keyword in vocabulary:
+        expansions[keyword] = tuple(keyword[:end] for end in range(1, len(keyword) + 1) if keyword[:end] in vocabulary)
+    
+    pattern = None
+    if vocabulary:
+        pattern = re.compile('(?=(' + _trie_pattern(vocabulary) + '))', re.DOTALL)
+    
+    return {
+        'pattern': pattern,
+        'expansions': expansions,
+        'always': always
+    }
+
+
+def find_keywords(matcher, text):
+    """
+    Find every vocabulary keyword that occurs in a text.
+    
+    Args:
+        matcher: Matcher dictionary from build_matcher
+        text: Text to scan (lowercase it first for case-insensitive matching)
+    
+    Returns:
+        Set of keywords contained in text
+    """
+    found = set(matcher['always'])
+    if matcher['pattern'] is None or not text:
+        return found
+    
+    expansions = matcher['expansions']
+    for match in set(matcher['pattern'].findall(text)):
+        found.update(expansions[match])
+    return found
+
+
+def build_rule_index(rules):
+    """
+    Invert a label -> keywords mapping so keyword hits resolve straight to labels.
+    
+    Args:
+        rules: Dictionary of label -> list of keywords
+    
+    Returns:
+        Dictionary of keyword -> tuple of labels
+    """
+    index = {}
+    for label, keywords in rules.items():
+        for keyword in keywords:
+            labels = index.setdefault(keyword, [])
+            if label not in labels:
+                labels.append(label)
+    return {keyword: tuple(labels) for keyword, labels in index.items()}
+
+
+def labels_for_hits(rule_index, hits):
+    """
+    Resolve matched keywords to the labels whose keyword lists they belong to.
+    
+    Args:
+        rule_index: Dictionary from build_rule_index
+        hits: Set of matched keywords (from find_keywords)
+    
+    Returns:
+        Set of labels with at least one matched keyword
+    """
+    labels = set()
+    for keyword in hits:
+        labels.update(rule_index.get(keyword, ()))
+    return labels
@@ -0,0 +1,482 @@
+"""
+Content-fighter mapping builder (ufc_fighter_analysis.ipynb section 9.3).
+Scores every content x fighter pair with the weighted theme (50%) / genre (30%) /
+narrative (20%) overlap, computing all pair overlaps at once as sparse indicator-matrix
+products instead of one Python comparison per pair.
+
+Rebuild content_fighter_mapping.csv from the content catalog and fighter data with:
+    python -m utils.mapping_builder [output.csv]
+"""
+
+import sys
+import json
+import time
+import zlib
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scipy import sparse
+import config
+from . import disk_cache
+from . import snapshots
+from . import themes
+from . import vocabulary
+
+
+# Component weights of the similarity score
+THEME_WEIGHT = 0.5
+GENRE_WEIGHT = 0.3
+NARRATIVE_WEIGHT = 0.2
+
+# Score multipliers when more than one theme / genre is shared (capped at 1.0)
+MULTI_THEME_BONUS = 1.2
+MULTI_GENRE_BONUS = 1.15
+
+# Component score when neither side has any labels of that kind
+NEUTRAL_SCORE = 0.3
+
+# Upper bound of the deterministic per-pair tie-break added to the total score
+TIE_BREAK_JITTER = 0.03
+
+# Fighter theme priority; fighters keep their first MAX_FIGHTER_THEMES themes in this order
+FIGHTER_THEME_PRIORITY = [
+    'precision', 'strategy', 'aggression', 'rivalry', 'leadership', 'triumph',
+    'underdog', 'redemption', 'legacy', 'brotherhood', 'struggle', 'survival'
+]
+MAX_FIGHTER_THEMES = 4
+
+# Lore phrases marking a redemption arc
+REDEMPTION_PHRASES = ['second chance', 'redemption', 'bounced back', 'returned']
+
+# Output columns, in the order the notebook writes them
+MAPPING_COLUMNS = [
+    'content_title', 'fighter_name', 'similarity_score', 'theme_score', 'genre_score',
+    'narrative_score', 'common_themes', 'common_genres', 'common_narratives',
+    'fighting_style', 'fighter_cluster'
+]
+
+
+def _stat(fighter_row, column):
+    """Numeric stat of a fighter row (missing -> 0)."""
+    value = fighter_row.get(column, 0)
+    return value if pd.notna(value) else 0
+
+
+def _record_parts(fighter_row):
+    """(wins, losses) parsed from a 'W-L-D' record string, or None."""
+    record = fighter_row.get('record')
+    if not pd.notna(record):
+        return None
+    parts = str(record).strip().split('-')
+    if len(parts) < 2:
+        return None
+    try:
+        return int(parts[0]), int(parts[1])
+    except ValueError:
+        return None
+
+
+def fighter_themes(fighter_row):
+    """
+    Get a fighter's mapping themes from stats, record, age and lore.
+    
+    Args:
+        fighter_row: Single row from fighters DataFrame (with lore)
+    
+    Returns:
+        List of up to MAX_FIGHTER_THEMES themes in FIGHTER_THEME_PRIORITY order
+    """
+    strikes_per_min = _stat(fighter_row, 'strikes_landed_per_min_mean')
+    strike_accuracy = _stat(fighter_row, 'strike_accuracy_mean')
+    takedown_accuracy = _stat(fighter_row, 'takedown_accuracy_mean')
+    control_time_ratio = _stat(fighter_row, 'control_time_ratio_mean')
+    head_strike_ratio = _stat(fighter_row, 'head_strike_ratio_mean')
+    body_strike_ratio = _stat(fighter_row, 'body_strike_ratio_mean')
+    
+    found = set()
+    if strike_accuracy > 0.55 and strikes_per_min < 3.5:
+        found.add('precision')
+    if strikes_per_min > 4.5:
+        found.add('aggression')
+    elif strikes_per_min > 3.0:
+        found.add('rivalry')
+    if takedown_accuracy > 0.5 and control_time_ratio > 0.25:
+        found.add('strategy')
+    if control_time_ratio > 0.35:
+        found.add('leadership')
+    if strike_accuracy > 0.5 and head_strike_ratio > 0.6:
+        found.add('precision')
+    if body_strike_ratio > 0.4:
+        found.add('struggle')
+    if takedown_accuracy > 0.4:
+        found.add('brotherhood')
+    
+    # Narrative themes only for fighters with lore
+    lore = fighter_row.get('lore', '')
+    if pd.notna(lore) and lore:
+        lore_lower = str(lore).lower()
+        record = _record_parts(fighter_row)
+        age = fighter_row.get('age')
+        
+        if record is not None and record[1] > record[0] * 1.2:
+            found.add('underdog')
+        if pd.notna(age) and age and age > 35:
+            found.add('legacy')
+        if any(phrase in lore_lower for phrase in REDEMPTION_PHRASES):
+            found.add('redemption')
+        if record is not None and record[0] > record[1] * 2:
+            found.add('triumph')
+        if control_time_ratio < 0.15 and strikes_per_min > 2.5:
+            found.add('survival')
+    
+    ordered = sorted(found, key=lambda t: FIGHTER_THEME_PRIORITY.index(t) if t in FIGHTER_THEME_PRIORITY else len(FIGHTER_THEME_PRIORITY))
+    return ordered[:MAX_FIGHTER_THEMES]
+
+
+def fighter_genres(fighter_row):
+    """
+    Map a fighter's style (from stats) to content genre preferences.
+    
+    Args:
+        fighter_row: Single row from fighters DataFrame
+    
+    Returns:
+        Sorted list of genres
+    """
+    strikes_per_min = _stat(fighter_row, 'strikes_landed_per_min_mean')
+    takedown_accuracy = _stat(fighter_row, 'takedown_accuracy_mean')
+    control_time_ratio = _stat(fighter_row, 'control_time_ratio_mean')
+    strike_accuracy = _stat(fighter_row, 'strike_accuracy_mean')
+    
+    genres = set()
+    if strikes_per_min > 4.0:
+        genres.update(['action', 'thriller'])
+    if takedown_accuracy > 0.4 or control_time_ratio > 0.3:
+        genres.update(['drama', 'sports'])
+    if strikes_per_min > 2.5 and takedown_accuracy > 0.3:
+        genres.update(['drama', 'action'])
+    if strike_accuracy > 0.55:
+        genres.update(['drama', 'biography'])
+    
+    # Defaults by primary skill
+    if not genres:
+        if strikes_per_min > takedown_accuracy * 10:
+            genres = {'action', 'thriller'}
+        elif takedown_accuracy > 0.3:
+            genres = {'drama', 'sports'}
+        else:
+            genres = {'drama', 'action'}
+    
+    return sorted(genres)
+
+
+def fighter_narratives(fighter_row):
+    """
+    Get a fighter's narrative patterns from record, age and lore.
+    
+    Args:
+        fighter_row: Single row from fighters DataFrame
+    
+    Returns:
+        List of narrative patterns (may repeat a pattern, like the notebook's list)
+    """
+    narratives = []
+    
+    if 'wins' in fighter_row and 'losses' in fighter_row:
+        wins = fighter_row.get('wins', 0) or 0
+        losses = fighter_row.get('losses', 0) or 0
+        if losses > wins * 1.5:
+            narratives.append('underdog_victory')
+        elif wins > losses * 2:
+            narratives.append('rise_to_glory')
+    
+    age = fighter_row.get('age')
+    if pd.notna(age):
+        if age > 35:
+            narratives.append('legacy_continuation')
+        elif age < 25:
+            narratives.append('rise_to_glory')
+    
+    lore = str(fighter_row.get('lore', '')).lower()
+    if 'comeback' in lore or 'returned' in lore:
+        narratives.append('comeback_story')
+    
+    return narratives
+
+
+def fighting_style(fighter_row, cluster_styles=None):
+    """
+    Get a fighter's style from their K-Means cluster, inferring it from stats otherwise.
+    
+    Args:
+        fighter_row: Single row from fighters DataFrame
+        cluster_styles: Dictionary of cluster ID -> style name
+    
+    Returns:
+        Fighting style string
+    """
+    cluster_id = fighter_row.get('kmeans_cluster', None)
+    if pd.notna(cluster_id) and cluster_styles:
+        style = cluster_styles.get(int(cluster_id))
+        if style:
+            return style
+    
+    strikes_per_min = _stat(fighter_row, 'strikes_landed_per_min_mean')
+    takedown_accuracy = _stat(fighter_row, 'takedown_accuracy_mean')
+    if strikes_per_min > 4.0:
+        return "Aggressive Striker"
+    if takedown_accuracy > 0.4:
+        return "Grappler"
+    if strikes_per_min > 2.5 and takedown_accuracy > 0.3:
+        return "Balanced Fighter"
+    return "Versatile Fighter"
+
+
+def load_cluster_styles(file_path=None):
+    """
+    Load the cluster ID -> fighting style names saved by the notebook.
+    
+    Args:
+        file_path: Path to cluster_styles.json (defaults to config.CLUSTER_STYLES_FILE)
+    
+    Returns:
+        Dictionary of int cluster ID -> style name (empty if the file is missing)
+    """
+    try:
+        with open(file_path or config.CLUSTER_STYLES_FILE, 'r', encoding='utf-8') as f:
+            styles = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {int(cluster_id): info.get('style') for cluster_id, info in styles.items() if isinstance(info, dict)}
+
+
+def content_features(content_df):
+    """
+    Get the per-title labels the mapping is scored on.
+    
+    Args:
+        content_df: Content catalog DataFrame (list columns parsed)
+    
+    Returns:
+        Dictionary with titles and per-title theme / genre / narrative lists
+    """
+    def column(name):
+        if name not in content_df.columns:
+            return [[] for _ in range(len(content_df))]
+        return [list(themes.parse_list_column(value)) for value in content_df[name]]
+    
+    return {
+        'keys': content_df['title'].tolist(),
+        'theme': column('themes'),
+        'genre': column('genres'),
+        'narrative': column('narrative_patterns')
+    }
+
+
+def fighter_features(fighters_df, cluster_styles=None):
+    """
+    Get the per-fighter labels the mapping is scored on (one entry per fighter name,
+    first row wins).
+    
+    Args:
+        fighters_df: Fighters DataFrame with lore
+        cluster_styles: Dictionary of cluster ID -> style name
+    
+    Returns:
+        Dictionary with fighter names, per-fighter theme / genre / narrative lists,
+        fighting styles and K-Means clusters
+    """
+    unique_fighters = fighters_df.drop_duplicates(subset=['fighter'], keep='first')
+    features = {'keys': [], 'theme': [], 'genre': [], 'narrative': [], 'fighting_style': [], 'fighter_cluster': []}
+    for _, fighter_row in unique_fighters.iterrows():
+        features['keys'].append(fighter_row['fighter'])
+        features['theme'].append(fighter_themes(fighter_row))
+        features['genre'].append(fighter_genres(fighter_row))
+        features['narrative'].append(fighter_narratives(fighter_row))
+        features['fighting_style'].append(fighting_style(fighter_row, cluster_styles))
+        features['fighter_cluster'].append(fighter_row.get('kmeans_cluster', None))
+    return features
+
+
+def _indicator_matrix(kind, rows):
+    """Sparse 0/1 matrix of shape (len(rows), vocabulary size) from label lists."""
+    row_ids = [vocabulary.register(kind, set(labels)) for labels in rows]
+    indptr = np.r_[0, np.cumsum([len(ids) for ids in row_ids])]
+    indices = np.concatenate(row_ids) if row_ids else np.array([], dtype=np.int64)
+    return sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr), shape=(len(rows), vocabulary.size(kind)))
+
+
+def _component_score(content_lists, fighter_lists, common, bonus=None):
+    """
+    Overlap score of one label kind for every pair.
+    
+    Shared labels over the longer list (raw list lengths, duplicates included), times
+    the bonus when more than one label is shared; NEUTRAL_SCORE when both lists are empty.
+    """
+    content_lengths = np.array([len(labels) for labels in content_lists], dtype=np.float64)[:, None]
+    fighter_lengths = np.array([len(labels) for labels in fighter_lists], dtype=np.float64)[None, :]
+    longest = np.maximum(content_lengths, fighter_lengths)
+    
+    score = np.divide(common, longest, out=np.zeros(common.shape), where=longest > 0)
+    if bonus is not None:
+        score = np.where(common > 1, np.minimum(1.0, score * bonus), score)
+    
+    both_empty = (content_lengths == 0) & (fighter_lengths == 0)
+    return np.where(both_empty, NEUTRAL_SCORE, np.where((content_lengths > 0) & (fighter_lengths > 0), score, 0.0))
+
+
+def _tie_break(content_keys, fighter_keys):
+    """Deterministic per-pair jitter in [0, TIE_BREAK_JITTER) from a crc32 of fighter + title."""
+    fighter_crcs = [zlib.crc32(str(name).encode('utf-8')) for name in fighter_keys]
+    jitter = np.empty((len(content_keys), len(fighter_keys)))
+    for i, title in enumerate(content_keys):
+        title_bytes = str(title).encode('utf-8')
+        # crc32(fighter + title), continuing each fighter's crc over the title bytes
+        jitter[i] = [zlib.crc32(title_bytes, crc) % 10000 for crc in fighter_crcs]
+    return jitter / 10000 * TIE_BREAK_JITTER
+
+
+def _common_labels(content_lists, fighter_lists):
+    """
+    Shared labels of every pair, joined in content order.
+    Fighters with identical label lists share one computation per title.
+    """
+    groups = {}
+    fighter_groups = np.array([groups.setdefault(tuple(sorted(set(labels))), len(groups)) for labels in fighter_lists], dtype=np.int64)
+    group_labels = [set(labels) for labels in groups]
+    
+    joined = np.empty((len(content_lists), len(fighter_lists)), dtype=object)
+    for i, labels in enumerate(content_lists):
+        ordered = list(dict.fromkeys(labels))
+        per_group = np.array([', '.join(label for label in ordered if label in group) for group in group_labels] or [''], dtype=object)
+        joined[i] = per_group[fighter_groups] if len(group_labels) > 0 else ''
+    return joined
+
+
+def score_pairs(content, fighters):
+    """
+    Score every content x fighter pair.
+    
+    Shared label counts for all pairs come from one sparse product per label kind
+    (content indicators x fighter indicators transposed).
+    
+    Args:
+        content: Features from content_features
+        fighters: Features from fighter_features
+    
+    Returns:
+        Dictionary of (n_content, n_fighters) arrays: similarity_score, theme_score,
+        genre_score, narrative_score and the joined common_* label strings
+    """
+    result = {}
+    bonuses = {'theme': MULTI_THEME_BONUS, 'genre': MULTI_GENRE_BONUS, 'narrative': None}
+    for kind, bonus in bonuses.items():
+        # Register both sides first, so both matrices have the full vocabulary width
+        content_matrix = _indicator_matrix(kind, content[kind])
+        fighter_matrix = _indicator_matrix(kind, fighters[kind])
+        width = vocabulary.size(kind)
+        content_matrix.resize((content_matrix.shape[0], width))
+        fighter_matrix.resize((fighter_matrix.shape[0], width))
+        
+        common = (content_matrix @ fighter_matrix.T).toarray().astype(np.float64)
+        result[f'{kind}_score'] = _component_score(content[kind], fighters[kind], common, bonus)
+        result[f'common_{kind}s'] = _common_labels(content[kind], fighters[kind])
+    
+    total = (
+        result['theme_score'] * THEME_WEIGHT
+        + result['genre_score'] * GENRE_WEIGHT
+        + result['narrative_score'] * NARRATIVE_WEIGHT
+        + _tie_break(content['keys'], fighters['keys'])
+    )
+    result['similarity_score'] = np.minimum(1.0, total)
+    return result
+
+
+def mapping_frame(content, fighters, scores):
+    """
+    Lay out pair scores as the long-format mapping (title-major, fighters in order).
+    
+    Args:
+        content: Features from content_features
+        fighters: Features from fighter_features
+        scores: Arrays from score_pairs
+    
+    Returns:
+        Mapping DataFrame with MAPPING_COLUMNS
+    """
+    n_content, n_fighters = len(content['keys']), len(fighters['keys'])
+    frame = pd.DataFrame({
+        'content_title': np.repeat(np.array(content['keys'], dtype=object), n_fighters),
+        'fighter_name': np.tile(np.array(fighters['keys'], dtype=object), n_content),
+        'similarity_score': scores['similarity_score'].ravel(),
+        'theme_score': scores['theme_score'].ravel(),
+        'genre_score': scores['genre_score'].ravel(),
+        'narrative_score': scores['narrative_score'].ravel(),
+        'common_themes': scores['common_themes'].ravel(),
+        'common_genres': scores['common_genres'].ravel(),
+        'common_narratives': scores['common_narratives'].ravel(),
+        'fighting_style': np.tile(np.array(fighters['fighting_style'], dtype=object), n_content),
+        'fighter_cluster': np.tile(np.array(fighters['fighter_cluster'], dtype=object), n_content)
+    })
+    frame['fighter_cluster'] = pd.to_numeric(frame['fighter_cluster'])
+    return frame[MAPPING_COLUMNS]
+
+
+def build_mapping(content_df, fighters_df, cluster_styles=None):
+    """
+    Build the full content-fighter mapping.
+    
+    Args:
+        content_df: Content catalog DataFrame (list columns parsed)
+        fighters_df: Fighters DataFrame with lore
+        cluster_styles: Dictionary of cluster ID -> style name
+    
+    Returns:
+        Mapping DataFrame
+    """
+    content = content_features(content_df)
+    fighters = fighter_features(fighters_df, cluster_styles)
+    return mapping_frame(content, fighters, score_pairs(content, fighters))
+
+
+def write_mapping(mapping_df, file_path):
+    """
+    Write a mapping CSV atomically, so the app never reads a half-written file.
+    
+    Args:
+        mapping_df: Mapping DataFrame
+        file_path: Output CSV path
+    """
+    disk_cache.replace_atomically(file_path, lambda f: mapping_df.to_csv(f, index=False))
+
+
+def main(argv=None):
+    """
+    Rebuild the content-fighter mapping CSV.
+    
+    Args:
+        argv: Optional output path (defaults to config.CONTENT_FIGHTER_MAPPING_FILE)
+    
+    Returns:
+        Process exit code
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    output = argv[0] if argv else config.CONTENT_FIGHTER_MAPPING_FILE
+    
+    for file_path in (config.CONTENT_FEATURES_FILE, config.FIGHTERS_WITH_LORE_FILE):
+        if not Path(file_path).exists():
+            print(f"Missing input: {file_path}")
+            return 1
+    
+    start = time.perf_counter()
+    content_df = snapshots.read_content_catalog_csv(config.CONTENT_FEATURES_FILE)
+    fighters_df = snapshots.read_plain_csv(config.FIGHTERS_WITH_LORE_FILE)
+    mapping_df = build_mapping(content_df, fighters_df, load_cluster_styles())
+    write_mapping(mapping_df, output)
+    
+    print(f"Wrote {len(mapping_df):,} pairs to {output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
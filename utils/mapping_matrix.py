@@ -0,0 +1,429 @@
+"""
+Sparse content x fighter similarity matrix used as the mapping backend.
+Scores are stored as CSR (one row per content title) and CSC (one column per fighter)
+float32 arrays, and each pair's explanation columns sit in a small deduplicated side table.
+A title's fighters and a fighter's content are then a row or column slice, and every
+fighter's best titles are precomputed (the reverse index behind get_content_for_fighter).
+Matrices are persisted as .npz files under config.CACHE_DIR, keyed by the mapping version.
+"""
+
+import json
+import itertools
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from . import disk_cache
+
+
+# Bump when the matrix layout changes so old .npz files are rebuilt
+MATRIX_VERSION = 2
+
+# Pairs scoring at or below this carry no similarity and are not stored
+MIN_SCORE = 0.0
+
+# Titles precomputed per fighter; longer lists are read from the fighter's column
+TOP_CONTENT_PER_FIGHTER = 10
+
+# Title lists scored together by batch_top_fighters
+BATCH_CHUNK_USERS = 4096
+
+# Mapping columns kept per pair, deduplicated into the detail table
+DETAIL_COLUMNS = ['common_themes', 'common_genres', 'common_narratives', 'fighting_style', 'fighter_cluster']
+
+
+def _detail_value(value):
+    """JSON-friendly detail cell (missing -> None, NumPy scalars -> Python values)."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def build_mapping_matrix(mapping_df):
+    """
+    Build the sparse similarity matrix from a long-format mapping frame.
+    
+    Entries keep the mapping's row order within each row and column, so ties between
+    equal scores resolve the same way a stable sort of the mapping would.
+    
+    Args:
+        mapping_df: Content-fighter mapping DataFrame
+    
+    Returns:
+        Matrix dictionary with CSR/CSC score matrices, per-entry detail IDs, content
+        titles, fighter names and the detail table
+    """
+    if mapping_df is None or len(mapping_df) == 0:
+        mapping_df = pd.DataFrame(columns=['content_title', 'fighter_name', 'similarity_score'])
+    
+    scores = pd.to_numeric(mapping_df['similarity_score'], errors='coerce').to_numpy(dtype=np.float64)
+    keep = (scores > MIN_SCORE) & mapping_df['content_title'].notna().to_numpy() & mapping_df['fighter_name'].notna().to_numpy()
+    kept = mapping_df[keep]
+    scores = scores[keep].astype(np.float32)
+    
+    content_ids, titles = pd.factorize(kept['content_title'].to_numpy(dtype=object))
+    fighter_ids, names = pd.factorize(kept['fighter_name'].to_numpy(dtype=object))
+    
+    # Deduplicate the explanation columns into a side table keyed by detail ID
+    detail_ids = np.zeros(len(kept), dtype=np.int32)
+    details = []
+    detail_index = {}
+    if len(kept) > 0:
+        columns = [kept[column].to_numpy(dtype=object) if column in kept.columns else np.full(len(kept), None, dtype=object) for column in DETAIL_COLUMNS]
+        for i, values in enumerate(zip(*columns)):
+            key = tuple(_detail_value(value) for value in values)
+            detail_id = detail_index.get(key)
+            if detail_id is None:
+                detail_id = detail_index[key] = len(details)
+                details.append(list(key))
+            detail_ids[i] = detail_id
+    
+    matrix = _assemble(content_ids, fighter_ids, scores, detail_ids, list(titles), list(names), details)
+    matrix['fighter_top_content'] = _build_fighter_top_content(matrix['by_fighter'])
+    return matrix
+
+
+def _build_fighter_top_content(by_fighter):
+    """
+    Precompute every fighter's best TOP_CONTENT_PER_FIGHTER entries.
+    
+    Args:
+        by_fighter: CSC score matrix
+    
+    Returns:
+        int64 array of shape (n_fighters, TOP_CONTENT_PER_FIGHTER) with entry positions
+        into by_fighter, best first, padded with -1
+    """
+    n_fighters = by_fighter.shape[1]
+    top = np.full((n_fighters, TOP_CONTENT_PER_FIGHTER), -1, dtype=np.int64)
+    for column in range(n_fighters):
+        positions = _top_entries(by_fighter, column, TOP_CONTENT_PER_FIGHTER)
+        top[column, :len(positions)] = positions
+    return top
+
+
+def _assemble(content_ids, fighter_ids, scores, detail_ids, titles, names, details):
+    """Lay out entries as CSR (by content) and CSC (by fighter), each in original order."""
+    shape = (len(titles), len(names))
+    
+    by_content = np.argsort(content_ids, kind='stable')
+    content_indptr = np.r_[0, np.cumsum(np.bincount(content_ids, minlength=shape[0]))].astype(np.int64)
+    by_fighter = np.argsort(fighter_ids, kind='stable')
+    fighter_indptr = np.r_[0, np.cumsum(np.bincount(fighter_ids, minlength=shape[1]))].astype(np.int64)
+    
+    return {
+        'by_content': sparse.csr_matrix((scores[by_content], fighter_ids[by_content], content_indptr), shape=shape),
+        'content_details': detail_ids[by_content],
+        'by_fighter': sparse.csc_matrix((scores[by_fighter], content_ids[by_fighter], fighter_indptr), shape=shape),
+        'fighter_details': detail_ids[by_fighter],
+        'titles': titles,
+        'title_ids': {title: i for i, title in enumerate(titles)},
+        'fighter_names': names,
+        'fighter_ids': {name: j for j, name in enumerate(names)},
+        'details': details
+    }
+
+
+def save_mapping_matrix(matrix, path):
+    """
+    Persist a matrix as a compressed .npz file (no pickled objects).
+    
+    Args:
+        matrix: Matrix dictionary from build_mapping_matrix
+        path: Destination .npz path
+    
+    Returns:
+        True if the file was written
+    """
+    by_content = matrix['by_content']
+    arrays = {
+        'version': np.array(MATRIX_VERSION),
+        'indptr': by_content.indptr,
+        'fighter_ids': by_content.indices,
+        'scores': by_content.data,
+        'detail_ids': matrix['content_details'],
+        'fighter_top_content': matrix['fighter_top_content'],
+        'titles': np.array(matrix['titles'], dtype=str),
+        'fighter_names': np.array(matrix['fighter_names'], dtype=str),
+        'details': np.array(json.dumps(matrix['details']))
+    }
+    try:
+        disk_cache.replace_atomically(path, lambda f: np.savez_compressed(f, **arrays))
+        return True
+    except OSError:
+        return False
+
+
+def load_mapping_matrix(path):
+    """
+    Load a matrix persisted by save_mapping_matrix.
+    
+    Args:
+        path: .npz path
+    
+    Returns:
+        Matrix dictionary, or None if the file is missing, unreadable or from another layout
+    """
+    try:
+        with np.load(path, allow_pickle=False) as arrays:
+            if int(arrays['version']) != MATRIX_VERSION:
+                return None
+            indptr = arrays['indptr']
+            fighter_ids = arrays['fighter_ids'].astype(np.int64)
+            scores = arrays['scores']
+            detail_ids = arrays['detail_ids']
+            titles = arrays['titles'].tolist()
+            names = arrays['fighter_names'].tolist()
+            details = json.loads(str(arrays['details']))
+            fighter_top_content = arrays['fighter_top_content']
+    except (OSError, ValueError, KeyError):
+        return None
+    
+    content_ids = np.repeat(np.arange(len(titles)), np.diff(indptr))
+    matrix = _assemble(content_ids, fighter_ids, scores, detail_ids, titles, names, details)
+    matrix['fighter_top_content'] = fighter_top_content
+    return matrix
+
+
+def _top_entries(matrix, row, k):
+    """
+    Positions of the K best entries of a CSR row / CSC column, best first.
+    Ties keep entry order.
+    """
+    start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+    scores = matrix.data[start:stop]
+    k = min(max(int(k), 0), len(scores))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    
+    candidates = np.arange(len(scores))
+    if k < len(scores):
+        # Keep every entry tied with the K-th score so ties resolve by entry order below
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= cutoff)
+    order = candidates[np.lexsort((candidates, -scores[candidates]))[:k]]
+    return start + order
+
+
+def _detail_fields(matrix, detail_id):
+    """Detail table row as a column -> value dictionary (missing -> NaN, like the mapping)."""
+    return {
+        column: np.nan if value is None else value
+        for column, value in zip(DETAIL_COLUMNS, matrix['details'][detail_id])
+    }
+
+
+def top_content_for_fighter(matrix, fighter_name, n):
+    """
+    Get a fighter's best-matching content titles from the precomputed reverse index
+    (or, for more than TOP_CONTENT_PER_FIGHTER titles, a column slice of the matrix).
+    
+    Args:
+        matrix: Matrix dictionary from build_mapping_matrix
+        fighter_name: Name of the fighter
+        n: Number of titles to return
+    
+    Returns:
+        DataFrame with content_title, similarity_score and the detail columns, highest
+        similarity first (empty if the fighter has no scored content)
+    """
+    column = matrix['fighter_ids'].get(fighter_name)
+    if column is None:
+        return pd.DataFrame()
+    
+    by_fighter = matrix['by_fighter']
+    if n <= TOP_CONTENT_PER_FIGHTER:
+        positions = matrix['fighter_top_content'][column, :max(int(n), 0)]
+        positions = positions[positions >= 0]
+    else:
+        positions = _top_entries(by_fighter, column, n)
+    rows = []
+    for position in positions:
+        row = {
+            'content_title': matrix['titles'][by_fighter.indices[position]],
+            'fighter_name': fighter_name,
+            'similarity_score': float(by_fighter.data[position])
+        }
+        row.update(_detail_fields(matrix, matrix['fighter_details'][position]))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _join_unique(values):
+    """Join distinct non-empty values in first-seen order."""
+    seen = dict.fromkeys(str(v) for v in values if pd.notna(v) and str(v).strip())
+    return ', '.join(seen)
+
+
+def _first_valid(values):
+    """First non-missing value, mirroring groupby 'first'."""
+    for value in values:
+        if pd.notna(value):
+            return value
+    return None
+
+
+def aggregate_top_fighters(matrix, content_titles, k_per_title, n_recommendations):
+    """
+    Aggregate the top fighters across several content titles.
+    
+    Takes the top k_per_title fighters of every title (a row slice each), keeps each
+    fighter's maximum score (a NumPy max-reduce over fighter IDs) and selects the best
+    n_recommendations. Explanation strings are only built for those final fighters.
+    
+    Args:
+        matrix: Matrix dictionary from build_mapping_matrix
+        content_titles: List of content titles
+        k_per_title: Number of candidate fighters taken from each title
+        n_recommendations: Number of fighters to return
+    
+    Returns:
+        DataFrame with one row per fighter: fighter_name, similarity_score, fighting_style,
+        fighter_cluster, common_themes, common_genres, common_narratives, source_content
+    """
+    by_content = matrix['by_content']
+    
+    # Gather candidate entries title by title
+    blocks = []
+    block_titles = []
+    for content_title in content_titles:
+        row = matrix['title_ids'].get(content_title)
+        if row is None:
+            continue
+        positions = _top_entries(by_content, row, k_per_title)
+        if len(positions) > 0:
+            blocks.append(positions)
+            block_titles.append(content_title)
+    
+    if len(blocks) == 0:
+        return pd.DataFrame()
+    
+    positions = np.concatenate(blocks)
+    ids = by_content.indices[positions]
+    scores = by_content.data[positions].astype(np.float64)
+    
+    # Max-reduce scores onto fighter IDs
+    candidate_ids = np.unique(ids)
+    best = np.full(len(matrix['fighter_names']), -np.inf)
+    np.maximum.at(best, ids, scores)
+    candidate_scores = best[candidate_ids]
+    
+    # Partial top-N selection, then an exact ordering of the winners (ties by name)
+    n = min(max(int(n_recommendations), 0), len(candidate_ids))
+    if n == 0:
+        return pd.DataFrame()
+    if n < len(candidate_ids):
+        # Keep every candidate tied with the N-th score so ties resolve by name below
+        cutoff = candidate_scores[np.argpartition(-candidate_scores, n - 1)[n - 1]]
+        keep = candidate_scores >= cutoff
+        candidate_ids = candidate_ids[keep]
+        candidate_scores = candidate_scores[keep]
+    winner_names = np.array(matrix['fighter_names'], dtype=object)[candidate_ids]
+    order = np.lexsort((winner_names.astype(str), -candidate_scores))[:n]
+    winner_ids = candidate_ids[order]
+    
+    # Build explanation strings for the winners only
+    source_titles = np.repeat(np.array(block_titles, dtype=object), [len(block) for block in blocks])
+    detail_ids = matrix['content_details'][positions]
+    
+    fighter_recs = []
+    for fighter_id in winner_ids:
+        entries = np.flatnonzero(ids == fighter_id)
+        entry_details = [_detail_fields(matrix, detail_ids[e]) for e in entries]
+        fighter_recs.append({
+            'fighter_name': matrix['fighter_names'][fighter_id],
+            'similarity_score': best[fighter_id],
+            'fighting_style': _first_valid(d['fighting_style'] for d in entry_details),
+            'fighter_cluster': _first_valid(d['fighter_cluster'] for d in entry_details),
+            'common_themes': _join_unique(d['common_themes'] for d in entry_details),
+            'common_genres': _join_unique(d['common_genres'] for d in entry_details),
+            'common_narratives': _join_unique(d['common_narratives'] for d in entry_details),
+            'source_content': ', '.join(list(dict.fromkeys(source_titles[entries]))[:3])  # Show up to 3 source content
+        })
+    
+    return pd.DataFrame(fighter_recs)
+
+
+def _top_rows(by_content, k):
+    """CSR arrays (indptr, fighter IDs, float64 scores) keeping each title's top-k entries."""
+    blocks = [_top_entries(by_content, row, k) for row in range(by_content.shape[0])]
+    indptr = np.r_[0, np.cumsum([len(block) for block in blocks])].astype(np.int64)
+    positions = np.concatenate(blocks) if blocks else np.array([], dtype=np.int64)
+    return indptr, by_content.indices[positions].astype(np.int64), by_content.data[positions].astype(np.float64)
+
+
+def batch_top_fighters(matrix, title_lists, k_per_title, n_recommendations, chunk_size=BATCH_CHUNK_USERS):
+    """
+    Top fighters for many title lists (e.g. users' watch histories), chunk by chunk.
+    
+    Same scores and order as aggregate_top_fighters for each list: every title contributes
+    its top k_per_title fighters, a fighter scores its maximum over the list, and ties
+    resolve by name. Each chunk expands its (user, title) pairs into the titles' top-K
+    entries and max-reduces them into one dense users x fighters block, whose top N per
+    row come from a partial selection. Only one chunk's arrays are held at a time.
+    
+    Args:
+        matrix: Matrix dictionary from build_mapping_matrix
+        title_lists: Iterable of content title lists (consumed lazily)
+        k_per_title: Number of candidate fighters taken from each title
+        n_recommendations: Number of fighters per list
+        chunk_size: Number of lists scored per chunk
+    
+    Returns:
+        Generator of (first list index, fighter IDs, scores) per chunk; IDs and scores have
+        shape (lists in chunk, N), with -1 / NaN where a list has fewer than N fighters
+    """
+    indptr, fighter_ids, scores = _top_rows(matrix['by_content'], k_per_title)
+    n_fighters = len(matrix['fighter_names'])
+    n = min(max(int(n_recommendations), 0), n_fighters)
+    
+    # Fighters are laid out by name rank within a chunk, so column order is the tie order
+    by_name = np.argsort(np.array(matrix['fighter_names'], dtype=object).astype(str), kind='stable')
+    name_rank = np.empty(n_fighters, dtype=np.int64)
+    name_rank[by_name] = np.arange(n_fighters)
+    ranked_ids = name_rank[fighter_ids]
+    
+    title_lists = iter(title_lists)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(title_lists, max(int(chunk_size), 1)))
+        if not chunk:
+            return
+        
+        # (list, title row) pairs of the chunk
+        pair_lists = []
+        pair_rows = []
+        for i, content_titles in enumerate(chunk):
+            if isinstance(content_titles, str):
+                content_titles = [content_titles]
+            for content_title in content_titles:
+                row = matrix['title_ids'].get(content_title)
+                if row is not None:
+                    pair_lists.append(i)
+                    pair_rows.append(row)
+        pair_rows = np.array(pair_rows, dtype=np.int64)
+        
+        # Expand every pair into its title's top-K entries and max-reduce per list and fighter
+        starts = indptr[pair_rows]
+        lengths = indptr[pair_rows + 1] - starts
+        entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        best = np.full((len(chunk), n_fighters), -np.inf)
+        np.maximum.at(best, (np.repeat(np.array(pair_lists, dtype=np.int64), lengths), ranked_ids[entries]), scores[entries])
+        
+        chunk_ids = np.full((len(chunk), n), -1, dtype=np.int64)
+        chunk_scores = np.full((len(chunk), n), np.nan)
+        if n > 0:
+            # Every fighter tied with a list's N-th score, ordered by score then name rank
+            cutoff = -np.partition(-best, n - 1, axis=1)[:, n - 1]
+            rows, columns = np.nonzero((best >= cutoff[:, None]) & (best > -np.inf))
+            values = best[rows, columns]
+            order = np.lexsort((columns, -values, rows))
+            rows, columns, values = rows[order], columns[order], values[order]
+            rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+            keep = rank < n
+            chunk_ids[rows[keep], rank[keep]] = by_name[columns[keep]]
+            chunk_scores[rows[keep], rank[keep]] = values[keep]
+        
+        yield start, chunk_ids, chunk_scores
+        start += len(chunk)
@@ -0,0 +1,195 @@
+"""
+Incremental content-fighter mapping updates.
+Keeps a fingerprint of every content title's and fighter's scoring features next to the
+mapping, and on update rescores only the titles (matrix rows) and fighters (matrix columns)
+whose features changed, patching the rest of the mapping from the existing file.
+
+Update content_fighter_mapping.csv after a catalog or lore change with:
+    python -m utils.mapping_updater [--full] [output.csv]
+"""
+
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import config
+from . import disk_cache
+from . import mapping_builder
+from . import snapshots
+
+
+# Bump when the scoring in mapping_builder changes, so stored fingerprints force a full rebuild
+SCORING_VERSION = 1
+
+# Mapping columns that depend on the (content, fighter) pair
+PAIR_COLUMNS = [
+    'similarity_score', 'theme_score', 'genre_score', 'narrative_score',
+    'common_themes', 'common_genres', 'common_narratives'
+]
+
+# Pair columns holding joined label strings (empty strings read back from the CSV as NaN)
+LABEL_COLUMNS = ['common_themes', 'common_genres', 'common_narratives']
+
+# Feature kinds that go into each side's fingerprint
+CONTENT_KINDS = ['theme', 'genre', 'narrative']
+FIGHTER_KINDS = ['theme', 'genre', 'narrative', 'fighting_style', 'fighter_cluster']
+
+
+def _state_path(file_path):
+    """Fingerprint file for a mapping CSV."""
+    return disk_cache.cache_path('mapping_fingerprints', disk_cache.cache_key(Path(file_path).resolve()))
+
+
+def fingerprints(features, kinds):
+    """
+    Fingerprint every row of a feature set.
+    
+    Args:
+        features: Features from mapping_builder.content_features / fighter_features
+        kinds: Feature keys that affect scoring (besides the row key)
+    
+    Returns:
+        Dictionary of row key -> fingerprint string
+    """
+    return {
+        key: disk_cache.cache_key(key, *(features[kind][i] for kind in kinds))
+        for i, key in enumerate(features['keys'])
+    }
+
+
+def _subset(features, positions):
+    """Feature set restricted to some rows."""
+    return {kind: [values[i] for i in positions] for kind, values in features.items()}
+
+
+def _changed_positions(features, new_prints, old_prints):
+    """Positions of rows that are new or whose fingerprint changed."""
+    return [i for i, key in enumerate(features['keys']) if old_prints.get(key) != new_prints[key]]
+
+
+def _read_pair_scores(file_path, content, fighters):
+    """
+    Read an existing mapping's pair columns as (n_content, n_fighters) grids in the
+    new row / column order (pairs missing from the file are NaN).
+    """
+    old = pd.read_csv(file_path)
+    if old.duplicated(['content_title', 'fighter_name']).any():
+        return None
+    for column in LABEL_COLUMNS:
+        old[column] = old[column].fillna('').astype(object)
+    
+    grid = pd.MultiIndex.from_product([content['keys'], fighters['keys']], names=['content_title', 'fighter_name'])
+    old = old.set_index(['content_title', 'fighter_name']).reindex(grid)
+    shape = (len(content['keys']), len(fighters['keys']))
+    return {
+        column: old[column].to_numpy(dtype=object if column in LABEL_COLUMNS else np.float64, copy=True).reshape(shape)
+        for column in PAIR_COLUMNS
+    }
+
+
+def update_mapping(content_df, fighters_df, file_path, cluster_styles=None, full=False):
+    """
+    Bring a mapping CSV up to date with the content catalog and fighter data.
+    
+    Titles and fighters whose scoring features are unchanged since the last update keep
+    their stored pair scores; only changed rows and columns of the similarity matrix are
+    rescored. Falls back to a full rebuild when there is no usable previous state (no
+    fingerprints, scoring version changed, or the file was modified elsewhere).
+    
+    Args:
+        content_df: Content catalog DataFrame (list columns parsed)
+        fighters_df: Fighters DataFrame with lore
+        file_path: Mapping CSV to update
+        cluster_styles: Dictionary of cluster ID -> style name
+        full: Rebuild every pair regardless of stored fingerprints
+    
+    Returns:
+        Dictionary with 'full' (bool), 'content_rescored' and 'fighters_rescored' counts
+    """
+    content = mapping_builder.content_features(content_df)
+    fighters = mapping_builder.fighter_features(fighters_df, cluster_styles)
+    content_prints = fingerprints(content, CONTENT_KINDS)
+    fighter_prints = fingerprints(fighters, FIGHTER_KINDS)
+    
+    # Titles and fighter names key the stored pairs, so they must be unique
+    unique_keys = len(content_prints) == len(content['keys']) and len(fighter_prints) == len(fighters['keys'])
+    state = None if full or not unique_keys else disk_cache.read_json(_state_path(file_path))
+    scores = None
+    if state is not None and state.get('scoring_version') == SCORING_VERSION and Path(file_path).exists() \
+            and state.get('mapping_version') == disk_cache.file_version(file_path):
+        scores = _read_pair_scores(file_path, content, fighters)
+    
+    full_rebuild = scores is None
+    if full_rebuild:
+        changed_rows = list(range(len(content['keys'])))
+        changed_columns = list(range(len(fighters['keys'])))
+        scores = mapping_builder.score_pairs(content, fighters)
+    else:
+        changed_rows = _changed_positions(content, content_prints, state['content'])
+        changed_columns = _changed_positions(fighters, fighter_prints, state['fighters'])
+        
+        # Changed titles: rescore their rows against every fighter
+        if changed_rows:
+            row_scores = mapping_builder.score_pairs(_subset(content, changed_rows), fighters)
+            for column in PAIR_COLUMNS:
+                scores[column][changed_rows] = row_scores[column]
+        
+        # Changed fighters: rescore their columns against every title
+        if changed_columns:
+            column_scores = mapping_builder.score_pairs(content, _subset(fighters, changed_columns))
+            for column in PAIR_COLUMNS:
+                scores[column][:, changed_columns] = column_scores[column]
+    
+    mapping_df = mapping_builder.mapping_frame(content, fighters, scores)
+    mapping_builder.write_mapping(mapping_df, file_path)
+    disk_cache.write_json(_state_path(file_path), {
+        'scoring_version': SCORING_VERSION,
+        'mapping_version': disk_cache.file_version(file_path),
+        'content': content_prints,
+        'fighters': fighter_prints
+    })
+    
+    return {
+        'full': full_rebuild,
+        'content_rescored': len(changed_rows),
+        'fighters_rescored': len(changed_columns)
+    }
+
+
+def main(argv=None):
+    """
+    Update (or, with --full, rebuild) the content-fighter mapping CSV.
+    
+    Args:
+        argv: Optional --full flag and output path (defaults to config.CONTENT_FIGHTER_MAPPING_FILE)
+    
+    Returns:
+        Process exit code
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    full = '--full' in argv
+    paths = [arg for arg in argv if arg != '--full']
+    output = paths[0] if paths else config.CONTENT_FIGHTER_MAPPING_FILE
+    
+    for file_path in (config.CONTENT_FEATURES_FILE, config.FIGHTERS_WITH_LORE_FILE):
+        if not Path(file_path).exists():
+            print(f"Missing input: {file_path}")
+            return 1
+    
+    start = time.perf_counter()
+    content_df = snapshots.read_content_catalog_csv(config.CONTENT_FEATURES_FILE)
+    fighters_df = snapshots.read_plain_csv(config.FIGHTERS_WITH_LORE_FILE)
+    result = update_mapping(content_df, fighters_df, output, mapping_builder.load_cluster_styles(), full=full)
+    
+    elapsed = time.perf_counter() - start
+    if result['full']:
+        print(f"Rebuilt {output} in {elapsed:.1f}s")
+    else:
+        print(f"Updated {output} in {elapsed:.1f}s: rescored {result['content_rescored']} title(s) "
+              f"and {result['fighters_rescored']} fighter(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
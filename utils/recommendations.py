@@ -5,7 +5,12 @@ Extracted and adapted from ufc_fighter_analysis.ipynb sections 9.3-9.5
 
 import pandas as pd
 import numpy as np
+import config
 from . import themes
+from . import data_loader
+from . import mapping_matrix
+from . import tag_index
+from . import vector_index
 
 
 def get_fighters_for_content(content_titles, mapping_df, fighters_df, n_recommendations=10):
@@ -31,47 +36,109 @@ def get_fighters_for_content(content_titles, mapping_df, fighters_df, n_recommen
     if len(content_titles) == 0:
         return pd.DataFrame()
     
-    # Get matches for all selected content
-    all_matches = []
-    for content_title in content_titles:
-        content_matches = mapping_df[
-            mapping_df['content_title'] == content_title
-        ].nlargest(n_recommendations * 2, 'similarity_score')  # Get more to account for aggregation
+    # Precomputed similarity matrix (None if mapping_df was not loaded by data_loader)
+    matrix = data_loader.get_mapping_matrix(mapping_df)
+    
+    if matrix is not None:
+        # Vectorized path: max-reduce per-title top-K row slices, explain only the final N
+        fighter_recs = mapping_matrix.aggregate_top_fighters(
+            matrix,
+            content_titles,
+            n_recommendations * 2,  # Get more to account for aggregation
+            n_recommendations
+        )
+        if len(fighter_recs) == 0:
+            return pd.DataFrame()
+    else:
+        # Get matches for all selected content
+        all_matches = []
+        for content_title in content_titles:
+            content_matches = mapping_df[
+                mapping_df['content_title'] == content_title
+            ].nlargest(n_recommendations * 2, 'similarity_score')  # Get more to account for aggregation
+            
+            if len(content_matches) > 0:
+                content_matches['source_content'] = content_title
+                all_matches.append(content_matches)
+        
+        if len(all_matches) == 0:
+            return pd.DataFrame()
         
-        if len(content_matches) > 0:
-            content_matches['source_content'] = content_title
-            all_matches.append(content_matches)
+        # Combine all matches
+        combined_matches = pd.concat(all_matches, ignore_index=True)
+        
+        # Aggregate by fighter (take max similarity score, combine explanations)
+        fighter_recs = combined_matches.groupby('fighter_name', observed=True).agg({
+            'similarity_score': 'max',
+            'fighting_style': 'first',
+            'fighter_cluster': 'first',
+            'common_themes': lambda x: ', '.join(set([str(t) for t in x if pd.notna(t) and str(t).strip()])),
+            'common_genres': lambda x: ', '.join(set([str(t) for t in x if pd.notna(t) and str(t).strip()])),
+            'common_narratives': lambda x: ', '.join(set([str(t) for t in x if pd.notna(t) and str(t).strip()])),
+            'source_content': lambda x: ', '.join(x.unique()[:3])  # Show up to 3 source content
+        }).reset_index()
+        
+        # Sort by similarity score and take top N
+        fighter_recs = fighter_recs.sort_values('similarity_score', ascending=False).head(n_recommendations)
     
-    if len(all_matches) == 0:
-        return pd.DataFrame()
+    return _format_recommendations(fighter_recs, fighters_df)
+
+
+def recommend_batch(title_lists, n_recommendations, mapping_df, chunk_size=mapping_matrix.BATCH_CHUNK_USERS):
+    """
+    Get the top fighters for many title lists at once (e.g. users' watch histories), for
+    offline campaigns.
+    Scores and order match get_fighters_for_content for each list; results are streamed
+    per chunk of lists as arrays, without explanations or per-list DataFrames.
     
-    # Combine all matches
-    combined_matches = pd.concat(all_matches, ignore_index=True)
+    Args:
+        title_lists: Iterable of content title lists (consumed lazily)
+        n_recommendations: Number of fighters per list
+        mapping_df: Content-fighter mapping DataFrame
+        chunk_size: Number of lists scored per chunk
     
-    # Aggregate by fighter (take max similarity score, combine explanations)
-    fighter_recs = combined_matches.groupby('fighter_name').agg({
-        'similarity_score': 'max',
-        'fighting_style': 'first',
-        'fighter_cluster': 'first',
-        'common_themes': lambda x: ', '.join(set([str(t) for t in x if pd.notna(t) and str(t).strip()])),
-        'common_genres': lambda x: ', '.join(set([str(t) for t in x if pd.notna(t) and str(t).strip()])),
-        'common_narratives': lambda x: ', '.join(set([str(t) for t in x if pd.notna(t) and str(t).strip()])),
-        'source_content': lambda x: ', '.join(x.unique()[:3])  # Show up to 3 source content
-    }).reset_index()
+    Returns:
+        Generator of (first list index, fighter names, similarity scores) per chunk; names
+        and scores have shape (lists in chunk, n_recommendations), with None / NaN where a
+        list has fewer matched fighters
+    """
+    if mapping_df is None or len(mapping_df) == 0:
+        return
+    
+    matrix = data_loader.get_mapping_matrix(mapping_df)
+    if matrix is None:
+        matrix = mapping_matrix.build_mapping_matrix(mapping_df)
+    
+    # Fighter ID -1 (empty slot) picks the trailing None
+    names = np.array(list(matrix['fighter_names']) + [None], dtype=object)
+    for start, fighter_ids, scores in mapping_matrix.batch_top_fighters(
+        matrix,
+        title_lists,
+        n_recommendations * 2,  # Same candidates per title as get_fighters_for_content
+        n_recommendations,
+        chunk_size
+    ):
+        yield start, names[fighter_ids], scores
+
+
+def _format_recommendations(fighter_recs, fighters_df):
+    """
+    Add lore and explanations to aggregated fighter matches.
     
-    # Sort by similarity score and take top N
-    fighter_recs = fighter_recs.sort_values('similarity_score', ascending=False).head(n_recommendations)
+    Args:
+        fighter_recs: DataFrame with fighter_name, fighting_style, similarity_score,
+            common_themes/genres/narratives, source_content and fighter_cluster
+        fighters_df: Fighters DataFrame with lore
     
-    # Add fighter lore
+    Returns:
+        DataFrame with recommended fighters, similarity scores, and explanations
+    """
     recommendations = []
     for idx, match in fighter_recs.iterrows():
         fighter_name = match['fighter_name']
         
-        # Get fighter data
-        fighter_row = fighters_df[fighters_df['fighter'] == fighter_name]
-        fighter_lore = ""
-        if len(fighter_row) > 0:
-            fighter_lore = fighter_row.iloc[0].get('lore', '')
+        # Lore is read for the final top N only
+        fighter_lore = data_loader.get_fighter_lore(fighter_name, fighters_df)
         
         # Create explanation
         explanation_parts = []
@@ -99,9 +166,65 @@ def get_fighters_for_content(content_titles, mapping_df, fighters_df, n_recommen
     return pd.DataFrame(recommendations)
 
 
+def get_fighters_for_vectors(content_titles, content_df, fighters_df, n_recommendations=10, labels=None):
+    """
+    Get fighter recommendations from theme vectors, without the mapping table.
+    Scores every fighter against the centroid of the titles' vectors (plus any explicit
+    labels) and explains matches by the labels shared with the titles.
+    
+    Args:
+        content_titles: List of content titles or single title string
+        content_df: Content catalog DataFrame
+        fighters_df: Fighters DataFrame with lore
+        n_recommendations: Number of fighters to return
+        labels: Optional dictionary of kind ('theme', 'genre', 'narrative') -> labels
+            to add to the query
+    
+    Returns:
+        DataFrame with recommended fighters, similarity scores, and explanations
+    """
+    if content_df is None or fighters_df is None or len(fighters_df) == 0:
+        return pd.DataFrame()
+    
+    if isinstance(content_titles, str):
+        content_titles = [content_titles]
+    content_titles = list(content_titles or [])
+    
+    index = data_loader.get_vector_index(content_df, fighters_df)
+    query = vector_index.query_vector(index, content_titles, labels)
+    if query is None:
+        return pd.DataFrame()
+    
+    rows, scores = vector_index.top_fighters(index, query, n_recommendations)
+    query_labels = vector_index.title_labels(index, content_titles)
+    for kind, kind_labels in (labels or {}).items():
+        query_labels[kind] = list(kind_labels or []) + query_labels.get(kind, [])
+    
+    source_content = ', '.join([title for title in content_titles if title in index['title_rows']][:3])
+    matches = []
+    for position, score in zip(rows[0], scores[0]):
+        if score <= 0:
+            continue
+        shared = vector_index.shared_labels(index, position, query_labels)
+        matches.append({
+            'fighter_name': index['fighter_names'][position],
+            'fighting_style': index['fighting_styles'][position],
+            'similarity_score': float(score),
+            'common_themes': ', '.join(shared['theme']),
+            'common_genres': ', '.join(shared['genre']),
+            'common_narratives': ', '.join(shared['narrative']),
+            'source_content': source_content,
+            'fighter_cluster': index['fighter_clusters'][position]
+        })
+    
+    if len(matches) == 0:
+        return pd.DataFrame()
+    return _format_recommendations(pd.DataFrame(matches), fighters_df)
+
+
 def get_fighters_for_filters(selected_genres=None, selected_themes=None, selected_types=None,
                               selected_characters=None, selected_content=None, mapping_df=None, 
-                              fighters_df=None, content_df=None, n_recommendations=10):
+                              fighters_df=None, content_df=None, n_recommendations=10, mode=None):
     """
     Get fighter recommendations based on filters (genre, theme, type) and optionally selected content.
     
@@ -114,11 +237,15 @@ def get_fighters_for_filters(selected_genres=None, selected_themes=None, selecte
         fighters_df: Fighters DataFrame
         content_df: Content catalog DataFrame
         n_recommendations: Number of fighters to return
+        mode: 'mapping' or 'vector' (defaults to config.RECOMMENDATION_MODE); vector mode
+            scores fighters from theme vectors and does not need mapping_df
     
     Returns:
         DataFrame with recommended fighters
     """
-    if mapping_df is None or len(mapping_df) == 0:
+    use_vectors = (mode or config.RECOMMENDATION_MODE) == 'vector'
+    
+    if not use_vectors and (mapping_df is None or len(mapping_df) == 0):
         return pd.DataFrame()
     
     if content_df is None or len(content_df) == 0:
@@ -164,6 +291,17 @@ def get_fighters_for_filters(selected_genres=None, selected_themes=None, selecte
     if selected_content:
         filtered_content = filtered_content[filtered_content['title'].isin(selected_content)]
     
+    if use_vectors:
+        # Matching titles and the selected themes / genres form one query vector, so any
+        # filter combination is scored even when no title matches it
+        labels = {
+            'theme': list(selected_themes or []),
+            'genre': [genre.lower() for genre in selected_genres or []]
+        }
+        return get_fighters_for_vectors(
+            filtered_content['title'].tolist(), content_df, fighters_df, n_recommendations, labels
+        )
+    
     # If no filters and no content selected, return empty
     if len(filtered_content) == 0:
         return pd.DataFrame()
@@ -204,71 +342,19 @@ def match_fighters_by_filters(selected_genres=None, selected_themes=None, select
     if fighters_df is None or len(fighters_df) == 0:
         return pd.DataFrame()
     
-    fighter_scores = []
-    
-    for idx, fighter_row in fighters_df.iterrows():
-        fighter_name = fighter_row.get('fighter', '')
-        if not fighter_name:
-            continue
-        
-        # Get fighter tags
-        fighter_tags = themes.tag_fighter(fighter_row)
-        fighter_themes = fighter_tags.get('themes', [])
-        fighter_archetypes = fighter_tags.get('character_archetypes', [])
-        
-        # Calculate match score
-        score = 0.0
-        match_details = []
-        
-        # Match themes (narratives)
-        if selected_themes:
-            theme_matches = [t for t in selected_themes if t in fighter_themes]
-            if theme_matches:
-                score += len(theme_matches) * 0.5
-                match_details.append(f"themes: {', '.join(theme_matches[:3])}")
-        
-        # Match character archetypes
-        if selected_characters:
-            char_matches = [c for c in selected_characters if c in fighter_archetypes]
-            if char_matches:
-                score += len(char_matches) * 0.3
-                match_details.append(f"characters: {', '.join(char_matches[:3])}")
-        
-        # Match genres (check if fighter themes align with genre themes)
-        if selected_genres:
-            # Get themes associated with selected genres from content
-            genre_themes = set()
-            for _, content_row in content_df.iterrows():
-                content_tags = themes.tag_content(content_row)
-                content_genres = [g.lower() for g in content_tags.get('genres', [])]
-                if any(g in selected_genres for g in content_genres):
-                    genre_themes.update(content_tags.get('themes', []))
-            
-            # Check if fighter themes match genre themes
-            genre_theme_matches = [t for t in fighter_themes if t in genre_themes]
-            if genre_theme_matches:
-                score += len(genre_theme_matches) * 0.2
-                match_details.append(f"genre themes: {', '.join(genre_theme_matches[:3])}")
-        
-        # Only include fighters with some match
-        if score > 0:
-            fighter_scores.append({
-                'fighter_name': fighter_name,
-                'fighting_style': fighter_tags.get('fighting_style', 'Fighter'),
-                'similarity_score': min(1.0, score),  # Cap at 1.0
-                'explanation': ' | '.join(match_details) if match_details else 'general match',
-                'fighter_themes': ', '.join(fighter_themes[:5]),
-                'fighter_archetypes': ', '.join(fighter_archetypes[:3])
-            })
-    
-    if len(fighter_scores) == 0:
-        return pd.DataFrame()
+    # Fighter theme/archetype bitsets, built once per data version
+    fighter_tag_index = data_loader.get_fighter_tag_index(fighters_df)
     
-    # Sort by score and return top N
-    fighter_recs_df = pd.DataFrame(fighter_scores)
-    fighter_recs_df = fighter_recs_df.sort_values('similarity_score', ascending=False).head(n_recommendations)
+    # Themes associated with the selected genres (from tagged content)
+    genre_themes = None
+    if selected_genres and content_df is not None and len(content_df) > 0:
+        content_tag_index = data_loader.get_content_tag_index(content_df)
+        genre_themes = tag_index.genre_theme_bits(content_tag_index, selected_genres)
     
-    return fighter_recs_df
+    # Score all fighters at once and keep the top N
+    return tag_index.score_fighters(
+        fighter_tag_index, selected_themes, selected_characters, genre_themes, n_recommendations
+    )
 
 
 def get_content_for_fighter(fighter_name, mapping_df, content_df, n_recommendations=5):
@@ -287,10 +373,14 @@ def get_content_for_fighter(fighter_name, mapping_df, content_df, n_recommendati
     if mapping_df is None or len(mapping_df) == 0:
         return pd.DataFrame()
     
-    # Get top matches for this fighter
-    fighter_matches = mapping_df[
-        mapping_df['fighter_name'] == fighter_name
-    ].nlargest(n_recommendations, 'similarity_score')
+    # Get top matches for this fighter (a column slice of the similarity matrix if available)
+    matrix = data_loader.get_mapping_matrix(mapping_df)
+    if matrix is not None:
+        fighter_matches = mapping_matrix.top_content_for_fighter(matrix, fighter_name, n_recommendations)
+    else:
+        fighter_matches = mapping_df[
+            mapping_df['fighter_name'] == fighter_name
+        ].nlargest(n_recommendations, 'similarity_score')
     
     if len(fighter_matches) == 0:
         return pd.DataFrame()
@@ -301,12 +391,12 @@ def get_content_for_fighter(fighter_name, mapping_df, content_df, n_recommendati
         content_title = match['content_title']
         
         # Get content details
-        content_row = content_df[content_df['title'] == content_title]
+        content_row = data_loader.get_content_row(content_title, content_df)
         content_desc = ""
         content_type = ""
-        if len(content_row) > 0:
-            content_desc = content_row.iloc[0].get('description', '')
-            content_type = content_row.iloc[0].get('type', '')
+        if content_row is not None:
+            content_desc = content_row.get('description', '')
+            content_type = content_row.get('type', '')
         
         # Create explanation
         explanation_parts = []
@@ -344,11 +434,10 @@ def get_fighter_themes(fighter_name, fighters_df, mapping_df=None):
     Returns:
         List of theme strings
     """
-    fighter_row = fighters_df[fighters_df['fighter'] == fighter_name]
-    if len(fighter_row) == 0:
+    fighter_row = data_loader.get_fighter_row(fighter_name, fighters_df)
+    if fighter_row is None:
         return []
     
-    fighter_row = fighter_row.iloc[0]
     tags = themes.tag_fighter(fighter_row, mapping_df)
     return tags.get('themes', [])
 
@@ -364,11 +453,10 @@ def get_content_themes(content_title, content_df):
     Returns:
         List of theme strings
     """
-    content_row = content_df[content_df['title'] == content_title]
-    if len(content_row) == 0:
+    content_row = data_loader.get_content_row(content_title, content_df)
+    if content_row is None:
         return []
     
-    content_row = content_row.iloc[0]
     tags = themes.tag_content(content_row)
     return tags.get('themes', [])
 
@@ -0,0 +1,203 @@
+"""
+Compact dtype schemas for the fighters and content-fighter mapping frames.
+Repeated labels load as categoricals, scores as float32 and counts / cluster IDs as small
+integers, which shrinks the frames every worker keeps resident.
+
+Print the memory saved on the current data files with:
+    python -m utils.schema
+"""
+
+import sys
+import logging
+import numpy as np
+import pandas as pd
+from . import snapshots
+
+logger = logging.getLogger(__name__)
+
+
+# Fighters: stat means/stds stay float64 because the theme rules compare them against
+# decimal thresholds (e.g. > 0.55) that float32 rounding would flip. Names are unique per
+# row, so a categorical would not save anything.
+FIGHTER_SCHEMA = {
+    'aggregation_window': 'category',
+    'weight': 'category',
+    'weight_class': 'category',
+    'nationality': 'category',
+    'birthplace': 'category',
+    'kmeans_cluster': 'int16',
+    'hdbscan_cluster': 'int16',
+    'gmm_cluster': 'int16',
+    'wins': 'int16',
+    'losses': 'int16',
+    'draws': 'int16',
+    'record': 'float32'
+}
+
+# Per-stat sample counts (strikes_landed_per_min_count, ...)
+FIGHTER_COUNT_SUFFIX = '_count'
+FIGHTER_COUNT_DTYPE = 'int16'
+
+MAPPING_SCHEMA = {
+    'content_title': 'category',
+    'fighter_name': 'category',
+    'fighting_style': 'category',
+    'common_themes': 'category',
+    'common_genres': 'category',
+    'common_narratives': 'category',
+    'similarity_score': 'float32',
+    'theme_score': 'float32',
+    'genre_score': 'float32',
+    'narrative_score': 'float32',
+    'fighter_cluster': 'int8'
+}
+
+
+def fighter_schema(columns):
+    """
+    Get the fighters schema for a set of columns (adds the per-stat count columns).
+    
+    Args:
+        columns: Column names of the fighters frame
+    
+    Returns:
+        Dictionary of column -> dtype
+    """
+    schema = dict(FIGHTER_SCHEMA)
+    for column in columns:
+        if column.endswith(FIGHTER_COUNT_SUFFIX):
+            schema[column] = FIGHTER_COUNT_DTYPE
+    return schema
+
+
+def _compact_column(values, dtype):
+    """Cast one column, or return None if it already has the dtype or cannot take it."""
+    if dtype == 'category':
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return None
+        return values.astype('category')
+    
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return None
+    
+    if pd.api.types.is_integer_dtype(dtype):
+        # Missing, fractional or out-of-range values cannot be small ints: keep them as floats
+        limits = np.iinfo(dtype)
+        whole = values.notna().all() and (values % 1 == 0).all()
+        if not (whole and (len(values) == 0 or (values.min() >= limits.min and values.max() <= limits.max))):
+            dtype = 'float32'
+    
+    if values.dtype == dtype:
+        return None
+    return values.astype(dtype)
+
+
+def apply_schema(df, schema):
+    """
+    Cast a frame's columns to a compact schema. Columns missing from the frame and
+    non-numeric columns with a numeric target keep their dtype; integer targets fall back
+    to float32 for columns with missing, fractional or out-of-range values.
+    
+    Args:
+        df: DataFrame
+        schema: Dictionary of column -> dtype
+    
+    Returns:
+        New DataFrame with compact dtypes (attrs are kept)
+    """
+    casts = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        compact = _compact_column(df[column], dtype)
+        if compact is not None:
+            casts[column] = compact
+    
+    if not casts:
+        return df
+    result = df.assign(**casts)
+    result.attrs = dict(df.attrs)
+    return result
+
+
+def memory_report(name, before, after):
+    """
+    Log and return the resident size of a frame before and after compaction.
+    
+    Args:
+        name: Label for the frame
+        before: DataFrame with the loader's default dtypes
+        after: Compacted DataFrame
+    
+    Returns:
+        Dictionary with before/after bytes (deep, including strings)
+    """
+    before_bytes = int(before.memory_usage(deep=True).sum())
+    after_bytes = int(after.memory_usage(deep=True).sum())
+    logger.info(
+        "%s frame: %.1f MB -> %.1f MB (%.0f%% smaller)",
+        name,
+        before_bytes / 1e6,
+        after_bytes / 1e6,
+        100 * (1 - after_bytes / before_bytes) if before_bytes else 0
+    )
+    return {'name': name, 'before_bytes': before_bytes, 'after_bytes': after_bytes}
+
+
+def compact_fighters(df, report=False):
+    """
+    Cast a fighters frame to the compact fighters schema.
+    
+    Args:
+        df: Fighters DataFrame
+        report: Log the memory before and after (see memory_report)
+    
+    Returns:
+        Compacted DataFrame
+    """
+    compact = apply_schema(df, fighter_schema(df.columns))
+    if report:
+        memory_report('fighters', df, compact)
+    return compact
+
+
+def compact_mapping(df, report=False):
+    """
+    Cast a content-fighter mapping frame to the compact mapping schema.
+    
+    Args:
+        df: Content-fighter mapping DataFrame
+        report: Log the memory before and after (see memory_report)
+    
+    Returns:
+        Compacted DataFrame
+    """
+    compact = apply_schema(df, MAPPING_SCHEMA)
+    if report:
+        memory_report('mapping', df, compact)
+    return compact
+
+
+def main():
+    """
+    Print the memory saved by the compact schemas on the current data files.
+    
+    Returns:
+        Process exit code
+    """
+    sources = snapshots.snapshot_sources()
+    compactors = {'fighters': compact_fighters, 'mapping': compact_mapping}
+    for name, compact in compactors.items():
+        file_path, reader = sources[name]
+        try:
+            df = reader(file_path)
+        except OSError:
+            print(f"Skipping {name}: {file_path} not found")
+            continue
+        report = memory_report(name, df, compact(df))
+        print(f"{name}: {report['before_bytes'] / 1e6:.1f} MB -> {report['after_bytes'] / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Binary Parquet snapshots of the CSV data files.
+Snapshots keep list columns as native lists and numeric columns typed, so cold starts skip
+CSV and literal_eval parsing. They are optional: loaders fall back to the CSVs when pyarrow
+is missing or a snapshot is absent or stale.
+
+Build (or refresh) snapshots with:
+    python -m utils.snapshots
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+import numpy as np
+import ast
+import config
+from . import disk_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # pyarrow not installed - loaders read the CSVs
+    pq = None
+
+
+# Bump when the snapshot layout changes so old snapshots are treated as stale
+SNAPSHOT_VERSION = 1
+
+# Content catalog columns stored as string representations of lists in the CSV
+CONTENT_LIST_COLUMNS = ['themes', 'character_archetypes', 'narrative_patterns', 'genres']
+
+
+def read_content_catalog_csv(file_path):
+    """
+    Read the content catalog CSV and parse its list columns.
+    
+    Args:
+        file_path: Path to the content catalog CSV
+    
+    Returns:
+        DataFrame with list columns as Python lists
+    """
+    df = pd.read_csv(file_path)
+    
+    # Parse string representations of lists
+    for column in CONTENT_LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+    
+    return df
+
+
+def read_plain_csv(file_path):
+    """Read a CSV file with no post-processing."""
+    return pd.read_csv(file_path)
+
+
+def snapshot_sources():
+    """
+    Get the data files that can be snapshotted.
+    
+    Returns:
+        Dictionary of source name -> (CSV path, CSV reader function)
+    """
+    return {
+        'content': (config.CONTENT_FEATURES_FILE, read_content_catalog_csv),
+        'fighters': (config.FIGHTERS_WITH_LORE_FILE, read_plain_csv),
+        'mapping': (config.CONTENT_FIGHTER_MAPPING_FILE, read_plain_csv)
+    }
+
+
+def snapshot_path(file_path):
+    """
+    Get the snapshot path for a CSV data file.
+    
+    Args:
+        file_path: Path to the CSV file
+    
+    Returns:
+        Path inside config.SNAPSHOT_DIR
+    """
+    return Path(config.SNAPSHOT_DIR) / f"{Path(file_path).stem}.parquet"
+
+
+def build_snapshot(file_path, reader):
+    """
+    Write a Parquet snapshot of a CSV file, tagged with the CSV's file version.
+    
+    Args:
+        file_path: Path to the CSV file
+        reader: Function reading the CSV into the DataFrame the loader returns
+    
+    Returns:
+        Path of the written snapshot
+    """
+    if pa is None:
+        raise ImportError("pyarrow package not installed. Run: pip install pyarrow")
+    
+    source_version = disk_cache.file_version(file_path)
+    df = reader(file_path)
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'source_version'] = source_version.encode('utf-8')
+    metadata[b'snapshot_version'] = str(SNAPSHOT_VERSION).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    
+    # Write to a temp file and rename, so loaders never see a half-written snapshot
+    path = snapshot_path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    pq.write_table(table, tmp_path)
+    tmp_path.replace(path)
+    return path
+
+
+def load_snapshot(file_path):
+    """
+    Load the snapshot of a CSV file if it is fresh.
+    
+    Args:
+        file_path: Path to the CSV file
+    
+    Returns:
+        DataFrame equal to what the CSV reader returns, or None if pyarrow is missing or
+        the snapshot is absent, stale (CSV changed since it was built) or unreadable
+    """
+    if pa is None:
+        return None
+    
+    path = snapshot_path(file_path)
+    try:
+        schema = pq.read_schema(path)
+        metadata = schema.metadata or {}
+        if metadata.get(b'snapshot_version') != str(SNAPSHOT_VERSION).encode('utf-8'):
+            return None
+        if metadata.get(b'source_version') != disk_cache.file_version(file_path).encode('utf-8'):
+            return None
+        table = pq.read_table(path)
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    
+    # List columns come back as Python lists (not NumPy arrays), like the CSV reader produces
+    list_columns = [field.name for field in table.schema if pa.types.is_list(field.type)]
+    df = table.drop_columns(list_columns).to_pandas()
+    for name in list_columns:
+        df[name] = pd.Series(table.column(name).to_pylist(), index=df.index, dtype=object)
+    df = df[table.column_names]
+    
+    # Missing values in object columns read back as None; the CSV reader gives NaN
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    
+    return df
+
+
+def main(argv=None):
+    """
+    Build snapshots for all (or the named) data files.
+    
+    Args:
+        argv: Source names to build (content, fighters, mapping); all if empty
+    
+    Returns:
+        Process exit code
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    sources = snapshot_sources()
+    names = argv or list(sources)
+    
+    unknown = [name for name in names if name not in sources]
+    if unknown:
+        print(f"Unknown source(s): {', '.join(unknown)}. Choose from: {', '.join(sources)}")
+        return 2
+    
+    for name in names:
+        file_path, reader = sources[name]
+        if not Path(file_path).exists():
+            print(f"Skipping {name}: {file_path} not found")
+            continue
+        path = build_snapshot(file_path, reader)
+        print(f"Built {name} snapshot: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
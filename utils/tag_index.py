@@ -0,0 +1,179 @@
+"""
+Precomputed fighter and content tag bitsets for direct theme/genre/archetype matching.
+Built once per data version so each request scores every fighter with popcount(AND) over
+packed bitsets (see utils.vocabulary).
+"""
+
+from collections import Counter
+import pandas as pd
+import numpy as np
+from . import themes
+from . import vocabulary
+
+
+# Score weights per matched theme, character archetype and genre theme
+THEME_MATCH_WEIGHT = 0.5
+CHARACTER_MATCH_WEIGHT = 0.3
+GENRE_THEME_MATCH_WEIGHT = 0.2
+
+
+def build_fighter_tag_index(fighters_df):
+    """
+    Build per-fighter theme and archetype bitsets from fighter tags.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Dictionary with theme/archetype bitset matrices (one row per fighter, aligned
+        with fighters_df), fighter names and tags
+    """
+    fighter_tags = themes.tag_fighters(fighters_df)
+    
+    fighter_names = fighters_df['fighter'].to_numpy(dtype=object) if 'fighter' in fighters_df.columns else np.full(len(fighters_df), '', dtype=object)
+    
+    return {
+        'theme_bits': vocabulary.encode_rows('theme', [tags['themes'] for tags in fighter_tags]),
+        'archetype_bits': vocabulary.encode_rows('archetype', [tags['character_archetypes'] for tags in fighter_tags]),
+        'fighter_names': fighter_names,
+        'valid': np.array([bool(name) for name in fighter_names], dtype=bool),
+        'tags': fighter_tags
+    }
+
+
+def build_content_tag_index(content_df):
+    """
+    Build per-content theme, genre, archetype and narrative bitsets (each row is tagged once).
+    
+    Args:
+        content_df: Content catalog DataFrame
+    
+    Returns:
+        Dictionary with bitset matrices (one row per content item, aligned with content_df)
+        and content titles
+    """
+    content_tags = [themes.tag_content(content_row) for _, content_row in content_df.iterrows()]
+    
+    return {
+        'theme_bits': vocabulary.encode_rows('theme', [tags['themes'] for tags in content_tags]),
+        'genre_bits': vocabulary.encode_rows('genre', [[genre.lower() for genre in tags['genres']] for tags in content_tags]),
+        'archetype_bits': vocabulary.encode_rows('archetype', [tags['character_archetypes'] for tags in content_tags]),
+        'narrative_bits': vocabulary.encode_rows('narrative', [tags['narrative_patterns'] for tags in content_tags]),
+        'titles': content_df['title'].tolist() if 'title' in content_df.columns else [None] * len(content_df)
+    }
+
+
+def genre_theme_bits(content_tag_index, selected_genres):
+    """
+    Get the themes of all content tagged with any of the selected genres.
+    
+    Args:
+        content_tag_index: Index dictionary from build_content_tag_index
+        selected_genres: List of selected genres (matched against lowercase content genres)
+    
+    Returns:
+        Theme bitset
+    """
+    genre_bits = content_tag_index['genre_bits']
+    query = vocabulary.pack(vocabulary.lookup('genre', selected_genres or []), vocabulary.n_words('genre'))
+    matching = vocabulary.overlap_counts(genre_bits, query) > 0
+    return vocabulary.union(content_tag_index['theme_bits'][matching])
+
+
+def _selection_counts(kind, row_bits, selected):
+    """
+    Count, per row, how many selected tags the row carries (repeated selections count repeatedly).
+    
+    Args:
+        kind: Tag kind of the bitsets
+        row_bits: Bitset matrix
+        selected: List of selected tag names
+    
+    Returns:
+        int64 array of counts, one per row
+    """
+    counts = np.zeros(len(row_bits), dtype=np.int64)
+    by_multiplicity = {}
+    for name, multiplicity in Counter(selected or []).items():
+        by_multiplicity.setdefault(multiplicity, []).append(name)
+    for multiplicity, names in by_multiplicity.items():
+        query = vocabulary.pack(vocabulary.lookup(kind, names), vocabulary.n_words(kind))
+        counts += multiplicity * vocabulary.overlap_counts(row_bits, query)
+    return counts
+
+
+def score_fighters(fighter_tag_index, selected_themes=None, selected_characters=None, genre_themes=None,
+                   n_recommendations=10):
+    """
+    Score every fighter against the selected filters and return the best matches.
+    
+    Match counts for themes, character archetypes and genre themes are popcount(AND) of
+    the fighters' bitsets with each selection bitset. The top N are picked with a partial
+    selection; ties keep fighters in their original row order.
+    
+    Args:
+        fighter_tag_index: Index dictionary from build_fighter_tag_index
+        selected_themes: List of selected themes (narratives)
+        selected_characters: List of selected character archetypes
+        genre_themes: Theme bitset for the selected genres (from genre_theme_bits), or None
+        n_recommendations: Number of fighters to return
+    
+    Returns:
+        DataFrame with recommended fighters
+    """
+    theme_bits = fighter_tag_index['theme_bits']
+    
+    theme_counts = _selection_counts('theme', theme_bits, selected_themes)
+    char_counts = _selection_counts('archetype', fighter_tag_index['archetype_bits'], selected_characters)
+    genre_counts = np.zeros(len(theme_bits), dtype=np.int64)
+    genre_theme_names = set()
+    if genre_themes is not None:
+        genre_counts = vocabulary.overlap_counts(theme_bits, genre_themes)
+        genre_theme_names = set(vocabulary.decode('theme', genre_themes))
+    
+    scores = theme_counts * THEME_MATCH_WEIGHT + char_counts * CHARACTER_MATCH_WEIGHT + genre_counts * GENRE_THEME_MATCH_WEIGHT
+    scores = np.minimum(scores, 1.0)  # Cap at 1.0
+    
+    # Only fighters with some match
+    candidates = np.flatnonzero(fighter_tag_index['valid'] & (scores > 0))
+    n = min(max(int(n_recommendations), 0), len(candidates))
+    if n == 0:
+        return pd.DataFrame()
+    
+    candidate_scores = scores[candidates]
+    if n < len(candidates):
+        # Keep every candidate tied with the N-th score so ties resolve by row order below
+        cutoff = -np.partition(-candidate_scores, n - 1)[n - 1]
+        keep = candidate_scores >= cutoff
+        candidates = candidates[keep]
+        candidate_scores = candidate_scores[keep]
+    winners = candidates[np.lexsort((candidates, -candidate_scores))[:n]]
+    
+    # Explanations for the winners only
+    fighter_recs = []
+    for i in winners:
+        fighter_tags = fighter_tag_index['tags'][i]
+        fighter_themes = fighter_tags.get('themes', [])
+        fighter_archetypes = fighter_tags.get('character_archetypes', [])
+        
+        match_details = []
+        theme_matches = [t for t in selected_themes or [] if t in fighter_themes]
+        if theme_matches:
+            match_details.append(f"themes: {', '.join(theme_matches[:3])}")
+        char_matches = [c for c in selected_characters or [] if c in fighter_archetypes]
+        if char_matches:
+            match_details.append(f"characters: {', '.join(char_matches[:3])}")
+        genre_theme_matches = [t for t in fighter_themes if t in genre_theme_names]
+        if genre_theme_matches:
+            match_details.append(f"genre themes: {', '.join(genre_theme_matches[:3])}")
+        
+        fighter_recs.append({
+            'fighter_name': fighter_tag_index['fighter_names'][i],
+            'fighting_style': fighter_tags.get('fighting_style', 'Fighter'),
+            'similarity_score': scores[i],
+            'explanation': ' | '.join(match_details) if match_details else 'general match',
+            'fighter_themes': ', '.join(fighter_themes[:5]),
+            'fighter_archetypes': ', '.join(fighter_archetypes[:3])
+        })
+    
+    return pd.DataFrame(fighter_recs)
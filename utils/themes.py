@@ -5,9 +5,30 @@ Enhanced with wider theme vocabulary and nuanced tagging logic.
 
 import pandas as pd
 import numpy as np
+from scipy import sparse
 import ast
 import re
+import zlib
+import threading
+from collections import OrderedDict
 import config
+from . import disk_cache
+from . import keyword_matcher
+from . import fighter_store
+
+
+# Bump when tagging rules change so persisted fighter tag tables are rebuilt
+TAG_TABLE_VERSION = 1
+
+# Fighter tag table registered by data_loader (see set_fighter_tag_table)
+_fighter_tag_table = None
+
+# get_all_themes results per dataset fingerprint (per process), least recently used first
+_all_themes_cache = OrderedDict()
+_all_themes_lock = threading.Lock()
+
+# Most get_all_themes results kept in _all_themes_cache
+ALL_THEMES_CACHE_SIZE = 8
 
 
 def format_theme_for_display(theme: str) -> str:
@@ -325,10 +346,127 @@ SHARED_THEME_KEYWORDS = {
 # Alias for backward compatibility
 THEME_KEYWORDS = SHARED_THEME_KEYWORDS
 
+# Content description keyword rules: (keywords, themes added if any keyword is in the description)
+CONTENT_DESCRIPTION_THEME_RULES = [
+    (['family', 'parent', 'child', 'sibling', 'brother', 'sister'], ['family', 'family_support', 'brotherhood', 'loyalty']),
+    (['young', 'teen', 'teenager', 'youth', 'adolescent'], ['youth_focused', 'coming_of_age', 'rookie_rise']),
+    (['old', 'veteran', 'experienced', 'seasoned', 'elder'], ['veteran_wisdom', 'legacy', 'mature']),
+    (['fight', 'battle', 'war', 'combat', 'conflict'], ['conflict', 'aggression', 'competition', 'rivalry']),
+    (['journey', 'quest', 'adventure', 'travel', 'road'], ['journey', 'adventure', 'road_trip']),
+    (['mystery', 'secret', 'hidden', 'unknown'], ['mystery', 'unfinished_business']),
+    (['love', 'romance', 'relationship', 'dating'], ['romance', 'friendship']),
+    (['comedy', 'funny', 'humor', 'laugh'], ['comedy', 'lighthearted', 'uplifting']),
+    (['dark', 'grim', 'bleak', 'serious', 'intense'], ['dark', 'gritty', 'intense', 'challenging']),
+    (['hero', 'heroic', 'save', 'protect', 'defend'], ['courage', 'heroic', 'protector', 'justice']),
+    (['revenge', 'vengeance', 'avenge', 'payback'], ['revenge', 'revenge_tale', 'rivalry']),
+    (['redemption', 'forgive', 'second chance', 'return'], ['redemption', 'redemption_through_struggle', 'comeback_story']),
+    (['underdog', 'unlikely', 'against odds', 'surprise'], ['underdog', 'proving_grounds']),
+    (['champion', 'victory', 'win', 'triumph', 'success'], ['triumph', 'championship_quest', 'peak_performance']),
+    (['survive', 'endure', 'persevere', 'overcome'], ['survival', 'survival_story', 'resilience', 'determination']),
+    (['transform', 'change', 'evolve', 'grow'], ['transformation', 'rise_to_glory', 'journey']),
+    (['betray', 'treachery', 'deception', 'backstab'], ['betrayal', 'corruption']),
+    (['team', 'together', 'united', 'group'], ['brotherhood', 'friendship', 'found_family']),
+    (['alone', 'isolated', 'lonely', 'solitary'], ['isolation', 'loner']),
+    (['future', 'futuristic', 'sci-fi', 'space', 'technology'], ['sci_fi', 'futuristic', 'space_opera', 'future']),
+    (['past', 'historical', 'period', 'era', 'ancient'], ['historical', 'period_drama', 'past']),
+    (['fantasy', 'magic', 'magical', 'supernatural'], ['fantasy', 'fantastical', 'escapist']),
+    (['thriller', 'suspense', 'tense', 'edge'], ['thriller', 'intense', 'challenging']),
+    (['horror', 'scary', 'frightening', 'terrifying'], ['horror', 'dark', 'gritty'])
+]
+
+# Content description signals used by the fighter-specific theme rules in tag_content
+CONTENT_DESCRIPTION_SIGNALS = {
+    'pressure': ['intense', 'fast', 'rapid', 'relentless', 'non-stop', 'constant'],
+    'power': ['power', 'dominant', 'overpowering', 'force'],
+    'precision': ['precise', 'methodical', 'crafted', 'polished', 'refined', 'technical', 'surgical', 'calculated'],
+    'volume': ['constant', 'relentless', 'non-stop', 'barrage', 'overwhelming', 'fast-paced', 'rapid-fire'],
+    'strategy': ['strategic', 'control', 'dominate', 'tactical', 'methodical', 'manipulate', 'orchestrate'],
+    'family': ['family', 'parent', 'child', 'sibling'],
+    'discipline': ['military', 'soldier', 'training', 'discipline', 'regiment', 'drill'],
+    'finish': ['finish', 'end', 'conclude', 'decisive', 'final'],
+    'past': ['past', 'history', 'historical', 'era', 'period', 'ancient'],
+    'conflict': ['war', 'battle', 'conflict', 'fight', 'combat'],
+    'calm': ['calm', 'composed', 'steady', 'unflappable', 'cool under pressure'],
+    'toughness': ['tough', 'grit', 'fortitude', 'resilience', 'mental strength'],
+    'mature': ['mature', 'serious', 'adult', 'sophisticated'],
+    'present': ['modern', 'current', 'today', 'present', 'now'],
+    'specialist': ['specialist', 'expert', 'master', 'focused', 'specialized']
+}
+
+# Character archetype keywords in content descriptions
+CONTENT_ARCHETYPE_KEYWORDS = {
+    'warrior': ['warrior', 'fighter', 'soldier', 'champion'],
+    'protector': ['protector', 'guardian', 'defender'],
+    'survivor': ['survivor', 'endures', 'survived'],
+    'leader': ['leader', 'captain', 'commands'],
+    'underdog': ['underdog', 'unlikely', 'against odds'],
+    'veteran': ['veteran', 'experienced', 'seasoned'],
+    'prodigy': ['prodigy', 'talented', 'gifted'],
+    'rebel': ['rebel', 'rebellious', 'defiant'],
+    'mentor': ['mentor', 'teacher', 'coach'],
+    'loner': ['alone', 'solitary', 'independent']
+}
+
+# Fighter lore narrative rules: (keywords that must all appear, keywords of which any must appear, themes)
+LORE_NARRATIVE_RULES = [
+    ([], ['overwhelms', 'barrage', 'relentless'], ['aggression', 'pressure_fighting']),
+    ([], ['surgical', 'precision', 'accurate'], ['precision', 'technical_mastery']),
+    ([], ['ground', 'takedown', 'grappling'], ['grappler_narrative', 'strategy']),
+    (['head'], ['hunt', 'target'], ['knockout_artist', 'courage']),
+    ([], ['veteran', 'experienced', 'years old'], ['veteran_wisdom', 'legacy']),
+    ([], ['young'], ['rookie_rise', 'rise_to_glory']),
+    (['just', 'years old'], [], ['rookie_rise', 'rise_to_glory']),
+    ([], ['comeback', 'returned', 'bounced back'], ['comeback_story', 'resilience']),
+    ([], ['champion', 'championship'], ['championship_quest', 'triumph'])
+]
+
+# Character archetype keywords in fighter lore
+FIGHTER_ARCHETYPE_KEYWORDS = {
+    'warrior': ['warrior', 'fighter', 'combatant', 'soldier', 'champion', 'warrior', 'gladiator'],
+    'protector': ['protector', 'guardian', 'defender', 'shield', 'safeguard', 'protects', 'defending'],
+    'survivor': ['survivor', 'endures', 'perseveres', 'endured', 'survived', 'survives', 'endurance'],
+    'leader': ['leader', 'captain', 'guides', 'commands', 'leads', 'leading', 'leadership'],
+    'underdog': ['underdog', 'against odds', 'unlikely', 'underestimated', 'overcame', 'defied'],
+    'veteran': ['veteran', 'experienced', 'seasoned', 'old guard', 'veteran savvy', 'been there'],
+    'prodigy': ['prodigy', 'talented', 'gifted', 'natural', 'phenomenon', 'rising star', 'young talent'],
+    'rebel': ['rebel', 'rebellious', 'defiant', 'nonconformist', 'maverick', 'rebellion'],
+    'mentor': ['mentor', 'teacher', 'coach', 'instructor', 'guide', 'teaching', 'coaching'],
+    'loner': ['alone', 'solitary', 'independent', 'lone', 'isolated', 'self-reliant', 'lone wolf'],
+    'hunter': ['hunter', 'hunts', 'seeks', 'pursues', 'targets', 'hunting', 'head-hunting'],
+    'guardian': ['guardian', 'protects', 'defends', 'safeguards', 'shields', 'guards'],
+    'challenger': ['challenger', 'challenges', 'tests', 'proves', 'demonstrates', 'challenging'],
+    'phoenix': ['phoenix', 'rises', 'rebirth', 'reborn', 'resurrected', 'renewed'],
+    'tactician': ['tactical', 'strategic', 'calculating', 'planner', 'strategist', 'tactician', 'game plan'],
+    'berserker': ['berserker', 'furious', 'rage', 'fury', 'uncontrolled', 'wild', 'savage', 'relentless'],
+    'samurai': ['samurai', 'honor', 'code', 'discipline', 'bushido', 'honorable'],
+    'gladiator': ['gladiator', 'arena', 'combat', 'battle', 'warrior', 'fighter'],
+    'outlaw': ['outlaw', 'renegade', 'rogue', 'outcast', 'exile', 'banished'],
+    'noble': ['noble', 'honorable', 'dignified', 'principled', 'upright', 'righteous']
+}
+
+# Compiled keyword matchers: each text is scanned once for its whole keyword vocabulary
+_SHARED_THEME_INDEX = keyword_matcher.build_rule_index(SHARED_THEME_KEYWORDS)
+_SHARED_THEME_MATCHER = keyword_matcher.build_matcher(_SHARED_THEME_INDEX)
+_CONTENT_DESCRIPTION_MATCHER = keyword_matcher.build_matcher(
+    list(_SHARED_THEME_INDEX)
+    + [keyword for keywords, _ in CONTENT_DESCRIPTION_THEME_RULES for keyword in keywords]
+    + [keyword for keywords in CONTENT_DESCRIPTION_SIGNALS.values() for keyword in keywords]
+    + [keyword for keywords in CONTENT_ARCHETYPE_KEYWORDS.values() for keyword in keywords]
+)
+_LORE_MATCHER = keyword_matcher.build_matcher(
+    list(_SHARED_THEME_INDEX)
+    + [keyword for required, any_of, _ in LORE_NARRATIVE_RULES for keyword in required + any_of]
+    + [keyword for keywords in FIGHTER_ARCHETYPE_KEYWORDS.values() for keyword in keywords]
+)
+
+# Matchers for caller-supplied theme keyword dictionaries
+_custom_theme_matchers = {}
+
 
 def extract_themes_from_text(text, theme_keywords=None):
     """
     Extract themes from text using keyword matching.
+    The text is scanned once with a compiled matcher for the whole keyword vocabulary.
     
     Args:
         text: Text to analyze
@@ -341,232 +479,286 @@ def extract_themes_from_text(text, theme_keywords=None):
         return []
     
     text_lower = str(text).lower()
-    themes = []
     
-    if theme_keywords is None:
-        theme_keywords = SHARED_THEME_KEYWORDS
+    if theme_keywords is None or theme_keywords is SHARED_THEME_KEYWORDS:
+        rule_index, matcher = _SHARED_THEME_INDEX, _SHARED_THEME_MATCHER
+    else:
+        rule_index, matcher = _custom_theme_matcher(theme_keywords)
     
-    for theme, keywords in theme_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            themes.append(theme)
+    hits = keyword_matcher.find_keywords(matcher, text_lower)
+    return list(keyword_matcher.labels_for_hits(rule_index, hits))
+
+
+def _custom_theme_matcher(theme_keywords):
+    """
+    Get (and cache) the rule index and matcher for a caller-supplied theme keyword dictionary.
+    
+    Args:
+        theme_keywords: Dictionary of theme -> keywords
     
-    return list(set(themes))  # Remove duplicates
+    Returns:
+        Tuple of (rule index, matcher)
+    """
+    key = tuple((theme, tuple(keywords)) for theme, keywords in theme_keywords.items())
+    if key not in _custom_theme_matchers:
+        rule_index = keyword_matcher.build_rule_index(theme_keywords)
+        _custom_theme_matchers[key] = (rule_index, keyword_matcher.build_matcher(rule_index))
+    return _custom_theme_matchers[key]
 
 
-def extract_fighter_themes_from_stats(fighter_row):
+def _themes_from_hits(hits):
+    """Shared-vocabulary themes for keywords already found by a superset matcher."""
+    return list(keyword_matcher.labels_for_hits(_SHARED_THEME_INDEX, hits))
+
+
+STATS_THEME_COLUMNS = [
+    'strikes_landed_per_min_mean', 'strike_accuracy_mean', 'takedown_accuracy_mean',
+    'control_time_ratio_mean', 'head_strike_ratio_mean', 'body_strike_ratio_mean',
+    'leg_strike_ratio_mean', 'clinch_time_ratio_mean', 'strikes_landed_per_min_count',
+    'wins', 'losses', 'age', 'height_inches', 'reach_inches'
+]
+
+# Every theme the stats rules can assign (column order of the membership matrix)
+STATS_THEMES = [
+    'aggression', 'volume_striker_narrative', 'pressure_fighting', 'brutal_power',
+    'determination', 'patience', 'precision', 'precision_striker_narrative',
+    'technical_mastery', 'counter_striking', 'calm_under_pressure', 'grappler_narrative',
+    'physical_dominance', 'strategy', 'discipline', 'versatility', 'knockout_artist',
+    'courage', 'endurance', 'calculated_risk', 'innovation', 'triumph',
+    'championship_quest', 'peak_performance', 'legacy', 'underdog', 'resilience',
+    'struggle', 'veteran_wisdom', 'decline', 'mature', 'rookie_rise', 'rise_to_glory',
+    'explosive_speed', 'youth_focused', 'speed', 'comeback_story', 'adaptability',
+    'well_rounded', 'competition', 'rivalry', 'family_support', 'family',
+    'reach_advantage', 'strategic', 'size_advantage', 'finisher', 'mental_toughness'
+]
+
+
+def _exclusive(*conditions):
+    """Turn an if/elif chain of boolean masks into mutually exclusive masks."""
+    taken = np.zeros(len(conditions[0]), dtype=bool)
+    masks = []
+    for condition in conditions:
+        masks.append(condition & ~taken)
+        taken = taken | condition
+    return masks
+
+
+def _to_float(value):
+    """Scalar numeric coercion (None, '' and non-numeric strings -> NaN)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _name_hash_parity(names):
+    """Per-fighter family assignment: stable crc32 name hash, even -> True."""
+    return np.array(
+        [zlib.crc32(str(name).encode('utf-8')) % 100 % 2 == 0 for name in names],
+        dtype=bool
+    )
+
+
+def _stats_theme_matrix(columns, names):
     """
-    Extract varied and specific themes from fighter statistics.
-    Creates more nuanced and diverse narrative tags based on actual performance data.
+    Evaluate every stats threshold rule as a boolean mask.
     
     Args:
-        fighter_row: Fighter DataFrame row with stats
+        columns: Dictionary of column name -> float array (NaN for missing values)
+        names: Array of fighter names (used for the family assignment)
     
     Returns:
-        List of specific themes based on fighting statistics and style
+        Boolean array of shape (n_fighters, len(STATS_THEMES))
     """
-    themes = []
+    def stat(col):
+        values = columns[col]
+        return np.where(np.isnan(values), 0.0, values)
+    
+    strikes_per_min = stat('strikes_landed_per_min_mean')
+    strike_accuracy = stat('strike_accuracy_mean')
+    takedown_accuracy = stat('takedown_accuracy_mean')
+    control_time_ratio = stat('control_time_ratio_mean')
+    head_strike_ratio = stat('head_strike_ratio_mean')
+    body_strike_ratio = stat('body_strike_ratio_mean')
+    leg_strike_ratio = stat('leg_strike_ratio_mean')
+    clinch_time_ratio = stat('clinch_time_ratio_mean')
+    
+    # Win rate and record (int(float(x)) truncates; missing -> 0)
+    wins = np.trunc(stat('wins'))
+    losses = np.trunc(stat('losses'))
+    fight_count_from_stats = np.trunc(stat('strikes_landed_per_min_count'))
+    total_fights = np.where((wins > 0) | (losses > 0), wins + losses, fight_count_from_stats)
+    win_rate = np.divide(wins, total_fights, out=np.zeros_like(wins), where=total_fights > 0)
+    
+    # Age/experience: estimate from fight count when missing
+    raw_age = stat('age')
+    age = np.where(raw_age > 0, np.trunc(raw_age), 0)
+    estimated_age = 25 + np.minimum(total_fights // 2, 15)
+    age = np.where((age == 0) & (total_fights > 0), estimated_age, age)
     
-    # Extract key stats
-    strikes_per_min = fighter_row.get('strikes_landed_per_min_mean', 0) if pd.notna(fighter_row.get('strikes_landed_per_min_mean')) else 0
-    strike_accuracy = fighter_row.get('strike_accuracy_mean', 0) if pd.notna(fighter_row.get('strike_accuracy_mean')) else 0
-    takedown_accuracy = fighter_row.get('takedown_accuracy_mean', 0) if pd.notna(fighter_row.get('takedown_accuracy_mean')) else 0
-    control_time_ratio = fighter_row.get('control_time_ratio_mean', 0) if pd.notna(fighter_row.get('control_time_ratio_mean')) else 0
-    head_strike_ratio = fighter_row.get('head_strike_ratio_mean', 0) if pd.notna(fighter_row.get('head_strike_ratio_mean')) else 0
-    body_strike_ratio = fighter_row.get('body_strike_ratio_mean', 0) if pd.notna(fighter_row.get('body_strike_ratio_mean')) else 0
-    leg_strike_ratio = fighter_row.get('leg_strike_ratio_mean', 0) if pd.notna(fighter_row.get('leg_strike_ratio_mean')) else 0
-    clinch_time_ratio = fighter_row.get('clinch_time_ratio_mean', 0) if pd.notna(fighter_row.get('clinch_time_ratio_mean')) else 0
+    # Physical attributes
+    height_inches = stat('height_inches')
+    reach_inches = stat('reach_inches')
+    reach_advantage = np.where((height_inches > 0) & (reach_inches > 0), reach_inches - height_inches, 0)
+    
+    rules = []
+    
+    # STRIKING STYLE THEMES
+    high_volume, mid_volume, low_volume = _exclusive(
+        strikes_per_min > 6.0, strikes_per_min > 4.0, strikes_per_min > 2.0
+    )
+    rules.append((high_volume, ['aggression', 'volume_striker_narrative', 'pressure_fighting']))
+    rules.append((high_volume & (strike_accuracy > 0.5), ['brutal_power']))
+    rules.append((mid_volume, ['determination', 'volume_striker_narrative']))
+    rules.append((low_volume, ['patience']))
+    
+    # PRECISION THEMES
+    very_accurate, accurate = _exclusive(strike_accuracy > 0.65, strike_accuracy > 0.55)
+    rules.append((very_accurate, ['precision', 'precision_striker_narrative', 'technical_mastery']))
+    rules.append((very_accurate & (strikes_per_min < 3.0), ['counter_striking', 'calm_under_pressure']))
+    rules.append((accurate, ['precision', 'precision_striker_narrative']))
+    
+    # GRAPPLING THEMES
+    dominant, takedown_artist, mixed_grappler = _exclusive(
+        control_time_ratio > 0.5,
+        takedown_accuracy > 0.6,
+        (takedown_accuracy > 0.4) | (control_time_ratio > 0.3)
+    )
+    rules.append((dominant, ['grappler_narrative', 'physical_dominance', 'strategy', 'discipline']))
+    rules.append((takedown_artist, ['grappler_narrative', 'strategy', 'technical_mastery']))
+    rules.append((mixed_grappler, ['grappler_narrative', 'versatility']))
+    
+    # STRIKE TARGET THEMES
+    head_hunter, head_focused = _exclusive(head_strike_ratio > 0.7, head_strike_ratio > 0.65)
+    rules.append((head_hunter, ['knockout_artist', 'courage', 'precision']))
+    rules.append((head_focused, ['knockout_artist', 'precision']))
+    
+    body_hunter, body_focused = _exclusive(body_strike_ratio > 0.45, body_strike_ratio > 0.35)
+    rules.append((body_hunter, ['strategy', 'endurance', 'calculated_risk']))
+    rules.append((body_focused, ['strategy']))
+    
+    rules.append((leg_strike_ratio > 0.35, ['technical_mastery', 'strategy', 'innovation']))
     
-    # Win rate and record - handle NaN properly
-    wins_val = fighter_row.get('wins', None)
-    wins = int(float(wins_val)) if pd.notna(wins_val) and wins_val != '' and wins_val != 0 else 0
+    # CLINCH WORK
+    rules.append((clinch_time_ratio > 0.3, ['pressure_fighting', 'physical_dominance']))
+    
+    # CAREER NARRATIVE THEMES
+    elite, winner, big_underdog, underdog = _exclusive(
+        (win_rate > 0.75) & (total_fights > 10),
+        (win_rate > 0.7) & (total_fights > 10),
+        (win_rate < 0.35) & (total_fights > 5),
+        (win_rate < 0.4) & (total_fights > 5)
+    )
+    rules.append((elite, ['triumph', 'championship_quest', 'peak_performance']))
+    rules.append((winner, ['triumph', 'legacy']))
+    rules.append((big_underdog, ['underdog', 'resilience', 'struggle']))
+    rules.append((underdog, ['underdog', 'resilience']))
+    
+    # AGE/EXPERIENCE NARRATIVES
+    old_veteran, veteran, experienced, rookie, young = _exclusive(
+        (age > 38) & (total_fights > 15),
+        (age > 35) & (total_fights > 15),
+        (age > 30) & (total_fights > 10),
+        (age < 24) & (total_fights > 3),
+        (age < 27) & (total_fights > 3)
+    )
+    rules.append((old_veteran, ['veteran_wisdom', 'legacy', 'decline', 'mature']))
+    rules.append((veteran, ['veteran_wisdom', 'legacy', 'mature']))
+    rules.append((experienced, ['legacy', 'veteran_wisdom']))
+    rules.append((rookie, ['rookie_rise', 'rise_to_glory', 'explosive_speed', 'youth_focused']))
+    rules.append((young, ['rise_to_glory', 'speed', 'youth_focused']))
+    
+    # COMEBACK STORY: has losses but a winning record
+    rules.append((
+        (losses > 0) & (wins > losses) & (total_fights > 8) & (win_rate > 0.6),
+        ['comeback_story', 'resilience']
+    ))
+    
+    # VERSATILITY & ADAPTABILITY
+    rules.append((
+        ((strikes_per_min > 2.0) & (takedown_accuracy > 0.3)) | ((strike_accuracy > 0.45) & (control_time_ratio > 0.2)),
+        ['versatility', 'adaptability', 'well_rounded']
+    ))
+    
+    # COMPETITION & RIVALRY: all fighters compete
+    rules.append((np.ones(len(names), dtype=bool), ['competition']))
+    rules.append((total_fights > 3, ['rivalry']))
+    
+    # FAMILY & SUPPORT: ~50% of fighters, by stable name hash
+    rules.append((_name_hash_parity(names), ['family_support', 'family']))
+    
+    # LEGACY based on experience even without exact age
+    long_career, established = _exclusive(total_fights > 15, total_fights > 10)
+    rules.append((long_career, ['legacy', 'veteran_wisdom']))
+    rules.append((established, ['legacy']))
+    
+    # PHYSICAL ATTRIBUTES
+    long_reach, short_reach = _exclusive(reach_advantage > 4, reach_advantage < -3)
+    rules.append((long_reach, ['reach_advantage', 'strategic']))
+    rules.append((short_reach, ['underdog', 'determination']))
+    rules.append((height_inches > 72, ['size_advantage', 'physical_dominance']))
     
-    losses_val = fighter_row.get('losses', None)
-    losses = int(float(losses_val)) if pd.notna(losses_val) and losses_val != '' else 0
+    # FINISHING ABILITY
+    rules.append(((strike_accuracy > 0.6) & (head_strike_ratio > 0.65), ['finisher', 'knockout_artist']))
     
-    # Use fight count from stats if wins/losses not available
-    fight_count_from_stats = fighter_row.get('strikes_landed_per_min_count', 0)
-    if pd.notna(fight_count_from_stats):
-        fight_count_from_stats = int(float(fight_count_from_stats))
-    else:
-        fight_count_from_stats = 0
+    # MENTAL TOUGHNESS INDICATORS
+    rules.append(((strike_accuracy > 0.55) & (strikes_per_min > 4.0), ['mental_toughness', 'calm_under_pressure']))
     
-    total_fights = wins + losses if (wins > 0 or losses > 0) else fight_count_from_stats
-    win_rate = wins / total_fights if total_fights > 0 else 0
+    theme_positions = {theme: j for j, theme in enumerate(STATS_THEMES)}
+    membership = np.zeros((len(names), len(STATS_THEMES)), dtype=bool)
+    for mask, rule_themes in rules:
+        for theme in rule_themes:
+            membership[:, theme_positions[theme]] |= mask
     
-    # Age/experience - handle NaN properly
-    age_val = fighter_row.get('age', None)
-    age = int(float(age_val)) if pd.notna(age_val) and age_val != '' and age_val > 0 else 0
+    return membership
+
+
+def extract_fighter_themes_batch(fighters_df):
+    """
+    Columnar version of extract_fighter_themes_from_stats for a whole fighters DataFrame.
+    Every threshold rule is evaluated once as a NumPy mask over all fighters.
     
-    # If no age but have fights, estimate age based on experience
-    if age == 0 and total_fights > 0:
-        # Rough estimate: fighters typically start around 20-25, add years based on fights
-        age = 25 + min(total_fights // 2, 15)  # Estimate: 2 fights per year, max 15 years
+    Args:
+        fighters_df: Fighters DataFrame with stats
     
-    # Physical attributes
-    height_inches = fighter_row.get('height_inches', 0) if pd.notna(fighter_row.get('height_inches')) else 0
-    reach_inches = fighter_row.get('reach_inches', 0) if pd.notna(fighter_row.get('reach_inches')) else 0
-    reach_advantage = reach_inches - height_inches if (height_inches > 0 and reach_inches > 0) else 0
-    
-    # STRIKING STYLE THEMES (More Specific)
-    if strikes_per_min > 6.0:
-        themes.append('aggression')
-        themes.append('volume_striker_narrative')
-        themes.append('pressure_fighting')
-        if strike_accuracy > 0.5:
-            themes.append('brutal_power')
-    elif strikes_per_min > 4.0:
-        themes.append('determination')
-        themes.append('volume_striker_narrative')
-    elif strikes_per_min > 2.0:
-        themes.append('patience')
-    
-    # PRECISION THEMES (More Nuanced)
-    if strike_accuracy > 0.65:
-        themes.append('precision')
-        themes.append('precision_striker_narrative')
-        themes.append('technical_mastery')
-        if strikes_per_min < 3.0:
-            themes.append('counter_striking')
-            themes.append('calm_under_pressure')
-    elif strike_accuracy > 0.55:
-        themes.append('precision')
-        themes.append('precision_striker_narrative')
-    
-    # GRAPPLING THEMES (More Specific)
-    if control_time_ratio > 0.5:
-        themes.append('grappler_narrative')
-        themes.append('physical_dominance')
-        themes.append('strategy')
-        themes.append('discipline')
-    elif takedown_accuracy > 0.6:
-        themes.append('grappler_narrative')
-        themes.append('strategy')
-        themes.append('technical_mastery')
-    elif takedown_accuracy > 0.4 or control_time_ratio > 0.3:
-        themes.append('grappler_narrative')
-        themes.append('versatility')
-    
-    # STRIKE TARGET THEMES (More Specific)
-    if head_strike_ratio > 0.7:
-        themes.append('knockout_artist')
-        themes.append('courage')
-        themes.append('precision')
-    elif head_strike_ratio > 0.65:
-        themes.append('knockout_artist')
-        themes.append('precision')
-    
-    if body_strike_ratio > 0.45:
-        themes.append('strategy')
-        themes.append('endurance')
-        themes.append('calculated_risk')
-    elif body_strike_ratio > 0.35:
-        themes.append('strategy')
-    
-    if leg_strike_ratio > 0.35:
-        themes.append('technical_mastery')
-        themes.append('strategy')
-        themes.append('innovation')
+    Returns:
+        Tuple of (sparse CSR fighter x theme membership matrix aligned with the rows of
+        fighters_df, list of theme names for the matrix columns)
+    """
+    n_fighters = len(fighters_df)
+    columns = {}
+    for col in STATS_THEME_COLUMNS:
+        if col in fighters_df.columns:
+            columns[col] = pd.to_numeric(fighters_df[col], errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            columns[col] = np.full(n_fighters, np.nan)
     
-    # CLINCH WORK
-    if clinch_time_ratio > 0.3:
-        themes.append('pressure_fighting')
-        themes.append('physical_dominance')
-    
-    # CAREER NARRATIVE THEMES (More Specific)
-    if win_rate > 0.75 and total_fights > 10:
-        themes.append('triumph')
-        themes.append('championship_quest')
-        themes.append('peak_performance')
-    elif win_rate > 0.7 and total_fights > 10:
-        themes.append('triumph')
-        themes.append('legacy')
-    elif win_rate < 0.35 and total_fights > 5:
-        themes.append('underdog')
-        themes.append('resilience')
-        themes.append('struggle')
-    elif win_rate < 0.4 and total_fights > 5:
-        themes.append('underdog')
-        themes.append('resilience')
-    
-    # AGE/EXPERIENCE NARRATIVES (More Specific)
-    if age > 38 and total_fights > 15:
-        themes.append('veteran_wisdom')
-        themes.append('legacy')
-        themes.append('decline')
-        themes.append('mature')
-    elif age > 35 and total_fights > 15:
-        themes.append('veteran_wisdom')
-        themes.append('legacy')
-        themes.append('mature')
-    elif age > 30 and total_fights > 10:
-        themes.append('legacy')
-        themes.append('veteran_wisdom')
-    elif age < 24 and total_fights > 3:
-        themes.append('rookie_rise')
-        themes.append('rise_to_glory')
-        themes.append('explosive_speed')
-        themes.append('youth_focused')
-    elif age < 27 and total_fights > 3:
-        themes.append('rise_to_glory')
-        themes.append('speed')
-        themes.append('youth_focused')
-    
-    # COMEBACK STORY
-    if losses > 0 and wins > losses and total_fights > 8:
-        # Has losses but winning record suggests comeback
-        if win_rate > 0.6:
-            themes.append('comeback_story')
-            themes.append('resilience')
-    
-    # VERSATILITY & ADAPTABILITY (More Specific)
-    if (strikes_per_min > 2.0 and takedown_accuracy > 0.3) or (strike_accuracy > 0.45 and control_time_ratio > 0.2):
-        themes.append('versatility')
-        themes.append('adaptability')
-        themes.append('well_rounded')
-    
-    # COMPETITION & RIVALRY (Universal themes - always add for fighters)
-    # All fighters compete, so always add competition
-    themes.append('competition')
-    if total_fights > 3:
-        themes.append('rivalry')
-    
-    # FAMILY & SUPPORT (Universal theme - many fighters have family support)
-    # Use name hash for consistent assignment
-    name_hash = hash(str(fighter_row.get('fighter', ''))) % 100
-    if name_hash % 2 == 0:  # Add to ~50% of fighters for variety
-        themes.append('family_support')
-        themes.append('family')
-    
-    # LEGACY - add based on experience even without exact age
-    if total_fights > 15:
-        themes.append('legacy')
-        themes.append('veteran_wisdom')
-    elif total_fights > 10:
-        themes.append('legacy')
-    
-    # PHYSICAL ATTRIBUTES (More Specific)
-    if reach_advantage > 4:
-        themes.append('reach_advantage')
-        themes.append('strategic')
-    elif reach_advantage < -3:
-        themes.append('underdog')  # Reach disadvantage
-        themes.append('determination')
-    
-    if height_inches > 72:  # Over 6 feet
-        themes.append('size_advantage')
-        themes.append('physical_dominance')
+    if 'fighter' in fighters_df.columns:
+        names = fighters_df['fighter'].to_numpy(dtype=object)
+    else:
+        names = np.full(n_fighters, '', dtype=object)
     
-    # FINISHING ABILITY
-    if strike_accuracy > 0.6 and head_strike_ratio > 0.65:
-        themes.append('finisher')
-        themes.append('knockout_artist')
+    membership = _stats_theme_matrix(columns, names)
+    return sparse.csr_matrix(membership), list(STATS_THEMES)
+
+
+def extract_fighter_themes_from_stats(fighter_row):
+    """
+    Extract varied and specific themes from fighter statistics.
+    Creates more nuanced and diverse narrative tags based on actual performance data.
+    Thin wrapper over the columnar rules; use extract_fighter_themes_batch for many fighters.
     
-    # MENTAL TOUGHNESS INDICATORS
-    if strike_accuracy > 0.55 and strikes_per_min > 4.0:
-        themes.append('mental_toughness')
-        themes.append('calm_under_pressure')
+    Args:
+        fighter_row: Fighter DataFrame row with stats
     
-    return list(set(themes))  # Remove duplicates
+    Returns:
+        List of specific themes based on fighting statistics and style
+    """
+    columns = {col: np.array([_to_float(fighter_row.get(col))]) for col in STATS_THEME_COLUMNS}
+    names = np.array([fighter_row.get('fighter', '')], dtype=object)
+    
+    membership = _stats_theme_matrix(columns, names)[0]
+    return [theme for theme, present in zip(STATS_THEMES, membership) if present]
 
 
 def get_fighting_style_description(fighter_row):
@@ -622,17 +814,75 @@ def get_fighting_style_description(fighter_row):
     return " / ".join(style_parts) if style_parts else "Fighter"
 
 
-def get_all_themes(content_df, fighters_df):
+def get_all_themes(content_df, fighters_df, use_disk_cache=True):
     """
     Extract all unique themes from content and fighters.
+    The vocabulary is computed once per dataset fingerprint: memoized per process and,
+    with use_disk_cache, persisted under config.CACHE_DIR for later processes.
     
     Args:
         content_df: Content DataFrame
         fighters_df: Fighters DataFrame
+        use_disk_cache: Read/write the persisted vocabulary
+    
+    Returns:
+        Sorted list of all unique themes
+    """
+    fingerprint = (_frame_fingerprint(content_df), _frame_fingerprint(fighters_df))
+    # Sessions (and service handlers) run on separate threads: guard every cache access
+    with _all_themes_lock:
+        entry = _all_themes_cache.get(fingerprint)
+        if entry is not None:
+            _all_themes_cache.move_to_end(fingerprint)
+            return list(entry['themes'])
+    
+    # Frames keyed by identity only make sense within this process
+    persistent = not any(part is not None and part[0] == 'id' for part in fingerprint)
+    
+    path = None
+    all_themes = None
+    if use_disk_cache and persistent:
+        path = disk_cache.cache_path('all_themes', disk_cache.cache_key(fingerprint, TAG_TABLE_VERSION))
+        all_themes = disk_cache.read_json(path)
+    
+    if all_themes is None:
+        all_themes = _compute_all_themes(content_df, fighters_df)
+        if path is not None:
+            disk_cache.write_json(path, all_themes)
+    
+    # Identity-keyed entries hold their frames, so no other frame can reuse the id()
+    # while the entry is cached
+    frames = None if persistent else (content_df, fighters_df)
+    with _all_themes_lock:
+        _all_themes_cache[fingerprint] = {'themes': all_themes, 'frames': frames}
+        _all_themes_cache.move_to_end(fingerprint)
+        while len(_all_themes_cache) > ALL_THEMES_CACHE_SIZE:
+            _all_themes_cache.popitem(last=False)
+    return list(all_themes)
+
+
+def _frame_fingerprint(df):
+    """
+    Identify a DataFrame's contents cheaply.
+    Loader frames carry a data version; other frames are keyed by object identity, so a
+    frame changed in place keeps its cached result.
+    
+    Args:
+        df: DataFrame or None
     
     Returns:
-        Set of all unique themes
+        Hashable fingerprint
     """
+    if df is None:
+        return None
+    data_version = df.attrs.get('data_version')
+    if data_version is not None:
+        return (data_version, len(df))
+    return ('id', id(df), len(df))
+
+
+def _compute_all_themes(content_df, fighters_df):
+    """Full pass over content themes, fighter lore and fighter stats (see get_all_themes)."""
     themes = set()
     
     # Get themes from content
@@ -642,14 +892,15 @@ def get_all_themes(content_df, fighters_df):
     
     # Extract themes from fighter lore
     if fighters_df is not None and len(fighters_df) > 0:
+        fighters_df = fighter_store.with_store_columns(fighters_df)
         if 'lore' in fighters_df.columns:
             for lore in fighters_df['lore']:
                 if pd.notna(lore) and lore:
                     themes.update(extract_themes_from_text(lore))
         
-        # Extract themes from fighter stats
-        for idx, fighter_row in fighters_df.iterrows():
-            themes.update(extract_fighter_themes_from_stats(fighter_row))
+        # Extract themes from fighter stats (columnar rules over all fighters at once)
+        stats_membership, stats_theme_names = extract_fighter_themes_batch(fighters_df)
+        themes.update(stats_theme_names[j] for j in np.unique(stats_membership.indices))
     
     return sorted(list(themes))
 
@@ -697,64 +948,23 @@ def tag_content(content_row):
     themes_list = parse_list_column(content_row.get('themes', []))
     
     # Extract additional themes from description if available (more thorough)
+    # One matcher pass finds every description keyword used by the rules below
     description = content_row.get('description', '')
-    desc_lower = ''
+    desc_hits = set()
     if description and pd.notna(description):
-        additional_themes = extract_themes_from_text(description)
-        themes_list.extend(additional_themes)
+        desc_hits = keyword_matcher.find_keywords(_CONTENT_DESCRIPTION_MATCHER, str(description).lower())
+        themes_list.extend(_themes_from_hits(desc_hits))
         
-        # Also extract themes from description using more aggressive matching
-        desc_lower = str(description).lower()
-        
-        # Add themes based on description patterns
-        if any(word in desc_lower for word in ['family', 'parent', 'child', 'sibling', 'brother', 'sister']):
-            themes_list.extend(['family', 'family_support', 'brotherhood', 'loyalty'])
-        if any(word in desc_lower for word in ['young', 'teen', 'teenager', 'youth', 'adolescent']):
-            themes_list.extend(['youth_focused', 'coming_of_age', 'rookie_rise'])
-        if any(word in desc_lower for word in ['old', 'veteran', 'experienced', 'seasoned', 'elder']):
-            themes_list.extend(['veteran_wisdom', 'legacy', 'mature'])
-        if any(word in desc_lower for word in ['fight', 'battle', 'war', 'combat', 'conflict']):
-            themes_list.extend(['conflict', 'aggression', 'competition', 'rivalry'])
-        if any(word in desc_lower for word in ['journey', 'quest', 'adventure', 'travel', 'road']):
-            themes_list.extend(['journey', 'adventure', 'road_trip'])
-        if any(word in desc_lower for word in ['mystery', 'secret', 'hidden', 'unknown']):
-            themes_list.extend(['mystery', 'unfinished_business'])
-        if any(word in desc_lower for word in ['love', 'romance', 'relationship', 'dating']):
-            themes_list.extend(['romance', 'friendship'])
-        if any(word in desc_lower for word in ['comedy', 'funny', 'humor', 'laugh']):
-            themes_list.extend(['comedy', 'lighthearted', 'uplifting'])
-        if any(word in desc_lower for word in ['dark', 'grim', 'bleak', 'serious', 'intense']):
-            themes_list.extend(['dark', 'gritty', 'intense', 'challenging'])
-        if any(word in desc_lower for word in ['hero', 'heroic', 'save', 'protect', 'defend']):
-            themes_list.extend(['courage', 'heroic', 'protector', 'justice'])
-        if any(word in desc_lower for word in ['revenge', 'vengeance', 'avenge', 'payback']):
-            themes_list.extend(['revenge', 'revenge_tale', 'rivalry'])
-        if any(word in desc_lower for word in ['redemption', 'forgive', 'second chance', 'return']):
-            themes_list.extend(['redemption', 'redemption_through_struggle', 'comeback_story'])
-        if any(word in desc_lower for word in ['underdog', 'unlikely', 'against odds', 'surprise']):
-            themes_list.extend(['underdog', 'proving_grounds'])
-        if any(word in desc_lower for word in ['champion', 'victory', 'win', 'triumph', 'success']):
-            themes_list.extend(['triumph', 'championship_quest', 'peak_performance'])
-        if any(word in desc_lower for word in ['survive', 'endure', 'persevere', 'overcome']):
-            themes_list.extend(['survival', 'survival_story', 'resilience', 'determination'])
-        if any(word in desc_lower for word in ['transform', 'change', 'evolve', 'grow']):
-            themes_list.extend(['transformation', 'rise_to_glory', 'journey'])
-        if any(word in desc_lower for word in ['betray', 'treachery', 'deception', 'backstab']):
-            themes_list.extend(['betrayal', 'corruption'])
-        if any(word in desc_lower for word in ['team', 'together', 'united', 'group']):
-            themes_list.extend(['brotherhood', 'friendship', 'found_family'])
-        if any(word in desc_lower for word in ['alone', 'isolated', 'lonely', 'solitary']):
-            themes_list.extend(['isolation', 'loner'])
-        if any(word in desc_lower for word in ['future', 'futuristic', 'sci-fi', 'space', 'technology']):
-            themes_list.extend(['sci_fi', 'futuristic', 'space_opera', 'future'])
-        if any(word in desc_lower for word in ['past', 'historical', 'period', 'era', 'ancient']):
-            themes_list.extend(['historical', 'period_drama', 'past'])
-        if any(word in desc_lower for word in ['fantasy', 'magic', 'magical', 'supernatural']):
-            themes_list.extend(['fantasy', 'fantastical', 'escapist'])
-        if any(word in desc_lower for word in ['thriller', 'suspense', 'tense', 'edge']):
-            themes_list.extend(['thriller', 'intense', 'challenging'])
-        if any(word in desc_lower for word in ['horror', 'scary', 'frightening', 'terrifying']):
-            themes_list.extend(['horror', 'dark', 'gritty'])
+        # Add themes based on description patterns (more aggressive matching)
+        for keywords, rule_themes in CONTENT_DESCRIPTION_THEME_RULES:
+            if not desc_hits.isdisjoint(keywords):
+                themes_list.extend(rule_themes)
+    
+    # Description signals for the fighter-specific theme rules further down
+    desc_signals = {
+        signal for signal, keywords in CONTENT_DESCRIPTION_SIGNALS.items()
+        if not desc_hits.isdisjoint(keywords)
+    }
     
     # Extract themes from title (often contains narrative hints)
     title = content_row.get('title', '')
@@ -850,25 +1060,11 @@ def tag_content(content_row):
     
     # Get character archetypes - also extract from description
     character_archetypes = parse_list_column(content_row.get('character_archetypes', []))
-    if description and pd.notna(description):
-        desc_lower = str(description).lower()
-        # Check for character archetype keywords in description
-        archetype_keywords = {
-            'warrior': ['warrior', 'fighter', 'soldier', 'champion'],
-            'protector': ['protector', 'guardian', 'defender'],
-            'survivor': ['survivor', 'endures', 'survived'],
-            'leader': ['leader', 'captain', 'commands'],
-            'underdog': ['underdog', 'unlikely', 'against odds'],
-            'veteran': ['veteran', 'experienced', 'seasoned'],
-            'prodigy': ['prodigy', 'talented', 'gifted'],
-            'rebel': ['rebel', 'rebellious', 'defiant'],
-            'mentor': ['mentor', 'teacher', 'coach'],
-            'loner': ['alone', 'solitary', 'independent']
-        }
-        for archetype, keywords in archetype_keywords.items():
-            if any(keyword in desc_lower for keyword in keywords):
-                if archetype not in character_archetypes:
-                    character_archetypes.append(archetype)
+    # Check for character archetype keywords in description
+    for archetype, keywords in CONTENT_ARCHETYPE_KEYWORDS.items():
+        if not desc_hits.isdisjoint(keywords):
+            if archetype not in character_archetypes:
+                character_archetypes.append(archetype)
     
     # Map character archetypes to themes
     archetype_theme_map = {
@@ -896,15 +1092,15 @@ def tag_content(content_row):
         themes_list.extend(['versatility', 'well_rounded', 'adaptability'])
     
     # Pressure Fighting & Intensity (for fast-paced, intense content)
-    if desc_lower and any(word in desc_lower for word in ['intense', 'fast', 'rapid', 'relentless', 'non-stop', 'constant']):
+    if 'pressure' in desc_signals:
         themes_list.extend(['pressure_fighting', 'intense', 'fast_paced'])
     
     # Physical Dominance (for action/power-focused content)
-    if 'action' in genres_list or (desc_lower and any(word in desc_lower for word in ['power', 'dominant', 'overpowering', 'force'])):
+    if 'action' in genres_list or 'power' in desc_signals:
         themes_list.extend(['physical_dominance', 'power', 'brutal_power'])
     
     # Precision & Technical Mastery (for well-crafted, methodical content)
-    if desc_lower and any(word in desc_lower for word in ['precise', 'methodical', 'crafted', 'polished', 'refined', 'technical', 'surgical', 'calculated']):
+    if 'precision' in desc_signals:
         themes_list.extend(['precision', 'technical_mastery', 'precision_striker_narrative'])
     elif 'drama' in genres_list and len(themes_list) > 8:
         # Dramas often have precision in storytelling
@@ -914,61 +1110,61 @@ def tag_content(content_row):
         themes_list.extend(['precision_striker_narrative', 'precision'])
     
     # Volume/High Output (for content with lots of action/events)
-    if desc_lower and any(word in desc_lower for word in ['constant', 'relentless', 'non-stop', 'barrage', 'overwhelming', 'fast-paced', 'rapid-fire']):
+    if 'volume' in desc_signals:
         themes_list.extend(['volume_striker_narrative', 'aggression', 'pressure_fighting'])
     elif 'action' in genres_list:
         # Action content typically has high volume
         themes_list.extend(['volume_striker_narrative', 'pressure_fighting'])
     
     # Grappler Narrative (for strategic, controlling content)
-    if desc_lower and any(word in desc_lower for word in ['strategic', 'control', 'dominate', 'tactical', 'methodical', 'manipulate', 'orchestrate']):
+    if 'strategy' in desc_signals:
         themes_list.extend(['grappler_narrative', 'strategy', 'discipline'])
     elif 'thriller' in genres_list or 'crime' in genres_list:
         # Thrillers and crime shows often involve strategic control
         themes_list.extend(['grappler_narrative', 'strategy'])
     
     # Family Support (for family-themed content)
-    if 'family' in genres_list or (desc_lower and any(word in desc_lower for word in ['family', 'parent', 'child', 'sibling'])):
+    if 'family' in genres_list or 'family' in desc_signals:
         themes_list.extend(['family', 'family_support', 'family_friendly'])
     
     # Discipline (for military, sports, training content)
-    if desc_lower and any(word in desc_lower for word in ['military', 'soldier', 'training', 'discipline', 'regiment', 'drill']):
+    if 'discipline' in desc_signals:
         themes_list.extend(['discipline', 'mental_toughness', 'determination'])
     
     # Knockout Artist & Finisher (for action/thriller with decisive endings)
     if 'action' in genres_list or 'thriller' in genres_list:
-        if desc_lower and any(word in desc_lower for word in ['finish', 'end', 'conclude', 'decisive', 'final']):
+        if 'finish' in desc_signals:
             themes_list.extend(['knockout_artist', 'finisher'])
     
     # Past/Retro/Dated/Historical (for period/historical content)
     content_type = content_row.get('type', '')
     if 'historical' in genres_list or (content_type and 'period' in str(content_type).lower()):
         themes_list.extend(['historical', 'period_drama', 'past', 'retro', 'dated'])
-    elif desc_lower and any(word in desc_lower for word in ['past', 'history', 'historical', 'era', 'period', 'ancient']):
+    elif 'past' in desc_signals:
         themes_list.extend(['historical', 'past', 'retro'])
     
     # Conflict (for war/battle/conflict content)
-    if 'war' in genres_list or (desc_lower and any(word in desc_lower for word in ['war', 'battle', 'conflict', 'fight', 'combat'])):
+    if 'war' in genres_list or 'conflict' in desc_signals:
         themes_list.extend(['conflict', 'war', 'aggression'])
     
     # Calm Under Pressure (for content with composed characters in tense situations)
-    if desc_lower and any(word in desc_lower for word in ['calm', 'composed', 'steady', 'unflappable', 'cool under pressure']):
+    if 'calm' in desc_signals:
         themes_list.extend(['calm_under_pressure', 'mental_toughness'])
     
     # Mental Toughness (for content about resilience, grit, fortitude)
-    if desc_lower and any(word in desc_lower for word in ['tough', 'grit', 'fortitude', 'resilience', 'mental strength']):
+    if 'toughness' in desc_signals:
         themes_list.extend(['mental_toughness', 'resilience', 'determination'])
     
     # Mature (for adult/serious content)
-    if (content_type and 'adult' in str(content_type).lower()) or (desc_lower and any(word in desc_lower for word in ['mature', 'serious', 'adult', 'sophisticated'])):
+    if (content_type and 'adult' in str(content_type).lower()) or 'mature' in desc_signals:
         themes_list.extend(['mature', 'adult'])
     
     # Present Moment (for contemporary/modern content)
-    if 'contemporary' in genres_list or (desc_lower and any(word in desc_lower for word in ['modern', 'current', 'today', 'present', 'now'])):
+    if 'contemporary' in genres_list or 'present' in desc_signals:
         themes_list.extend(['present_moment', 'modern', 'contemporary'])
     
     # Specialist (for content focused on specific expertise)
-    if desc_lower and any(word in desc_lower for word in ['specialist', 'expert', 'master', 'focused', 'specialized']):
+    if 'specialist' in desc_signals:
         themes_list.extend(['specialist', 'technical_mastery'])
     
     # Well Rounded (for content that balances multiple elements)
@@ -990,6 +1186,8 @@ def tag_fighter(fighter_row, mapping_df=None):
     """
     Extract comprehensive thematic metadata from fighter row with enhanced analysis.
     Uses lore, stats, and mapping data for varied and specific tagging.
+    Reads from the registered fighter tag table when the row and mapping match its
+    data versions, and computes the tags from scratch otherwise.
     
     Args:
         fighter_row: Single row from fighters DataFrame
@@ -998,63 +1196,71 @@ def tag_fighter(fighter_row, mapping_df=None):
     Returns:
         Dictionary with themes, fighting_style, character_archetypes
     """
-    fighter_name = fighter_row.get('fighter', '')
+    cached_tags = _lookup_fighter_tags(fighter_row, mapping_df)
+    if cached_tags is not None:
+        return cached_tags
+    
+    tags = _compute_fighter_tags(fighter_row)
+    
+    # Get themes from mapping if available (content connections)
+    if mapping_df is not None and len(mapping_df) > 0:
+        mapping_themes = get_mapping_themes(fighter_row.get('fighter', ''), mapping_df)
+        if mapping_themes:
+            tags['themes'] = list(set(tags['themes'] + mapping_themes))
+    
+    return tags
+
+
+def get_mapping_themes(fighter_name, mapping_df):
+    """
+    Collect the common themes listed for a fighter in the content-fighter mapping.
+    
+    Args:
+        fighter_name: Name of the fighter
+        mapping_df: Content-fighter mapping DataFrame
+    
+    Returns:
+        List of theme strings (may contain duplicates)
+    """
+    themes = []
+    fighter_mappings = mapping_df[mapping_df['fighter_name'] == fighter_name]
+    for common_themes in fighter_mappings['common_themes']:
+        if pd.notna(common_themes) and common_themes:
+            themes.extend([t.strip() for t in str(common_themes).split(',') if t.strip()])
+    return themes
+
+
+def _compute_fighter_tags(fighter_row, stats_themes=None):
+    """
+    Compute a fighter's tags from lore and stats (everything except mapping themes).
+    
+    Args:
+        fighter_row: Single row from fighters DataFrame
+        stats_themes: Precomputed stats themes (from extract_fighter_themes_batch), if available
+    
+    Returns:
+        Dictionary with themes, fighting_style, character_archetypes
+    """
     themes = []
     
     # Extract themes from lore (primary source for narrative themes)
-    lore = fighter_row.get('lore', '')
+    # One matcher pass finds every lore keyword used by the rules below
+    lore = fighter_store.lore_for_row(fighter_row)
+    lore_hits = set()
     if pd.notna(lore) and lore:
-        lore_themes = extract_themes_from_text(lore)
-        themes.extend(lore_themes)
+        lore_hits = keyword_matcher.find_keywords(_LORE_MATCHER, str(lore).lower())
+        themes.extend(_themes_from_hits(lore_hits))
         
         # Extract additional narrative themes from specific lore patterns
-        lore_lower = str(lore).lower()
-        
-        # Check for specific narrative patterns in lore
-        if 'overwhelms' in lore_lower or 'barrage' in lore_lower or 'relentless' in lore_lower:
-            themes.append('aggression')
-            themes.append('pressure_fighting')
-        
-        if 'surgical' in lore_lower or 'precision' in lore_lower or 'accurate' in lore_lower:
-            themes.append('precision')
-            themes.append('technical_mastery')
-        
-        if 'ground' in lore_lower or 'takedown' in lore_lower or 'grappling' in lore_lower:
-            themes.append('grappler_narrative')
-            themes.append('strategy')
-        
-        if 'head' in lore_lower and ('hunt' in lore_lower or 'target' in lore_lower):
-            themes.append('knockout_artist')
-            themes.append('courage')
-        
-        if 'veteran' in lore_lower or 'experienced' in lore_lower or 'years old' in lore_lower:
-            themes.append('veteran_wisdom')
-            themes.append('legacy')
-        
-        if 'young' in lore_lower or 'just' in lore_lower and 'years old' in lore_lower:
-            themes.append('rookie_rise')
-            themes.append('rise_to_glory')
-        
-        if 'comeback' in lore_lower or 'returned' in lore_lower or 'bounced back' in lore_lower:
-            themes.append('comeback_story')
-            themes.append('resilience')
-        
-        if 'champion' in lore_lower or 'championship' in lore_lower:
-            themes.append('championship_quest')
-            themes.append('triumph')
+        for required, any_of, rule_themes in LORE_NARRATIVE_RULES:
+            if lore_hits.issuperset(required) and (not any_of or not lore_hits.isdisjoint(any_of)):
+                themes.extend(rule_themes)
     
     # Extract themes from stats (adds fighting style specific themes)
-    stats_themes = extract_fighter_themes_from_stats(fighter_row)
+    if stats_themes is None:
+        stats_themes = extract_fighter_themes_from_stats(fighter_row)
     themes.extend(stats_themes)
     
-    # Get themes from mapping if available (content connections)
-    if mapping_df is not None and len(mapping_df) > 0:
-        fighter_mappings = mapping_df[mapping_df['fighter_name'] == fighter_name]
-        if len(fighter_mappings) > 0:
-            for common_themes in fighter_mappings['common_themes']:
-                if pd.notna(common_themes) and common_themes:
-                    themes.extend([t.strip() for t in str(common_themes).split(',') if t.strip()])
-    
     # Remove duplicates
     themes = list(set(themes))
     
@@ -1063,35 +1269,9 @@ def tag_fighter(fighter_row, mapping_df=None):
     
     # Extract character archetypes from lore (expanded detection)
     character_archetypes = []
-    if pd.notna(lore) and lore:
-        lore_lower = str(lore).lower()
-        
-        archetype_keywords = {
-            'warrior': ['warrior', 'fighter', 'combatant', 'soldier', 'champion', 'warrior', 'gladiator'],
-            'protector': ['protector', 'guardian', 'defender', 'shield', 'safeguard', 'protects', 'defending'],
-            'survivor': ['survivor', 'endures', 'perseveres', 'endured', 'survived', 'survives', 'endurance'],
-            'leader': ['leader', 'captain', 'guides', 'commands', 'leads', 'leading', 'leadership'],
-            'underdog': ['underdog', 'against odds', 'unlikely', 'underestimated', 'overcame', 'defied'],
-            'veteran': ['veteran', 'experienced', 'seasoned', 'old guard', 'veteran savvy', 'been there'],
-            'prodigy': ['prodigy', 'talented', 'gifted', 'natural', 'phenomenon', 'rising star', 'young talent'],
-            'rebel': ['rebel', 'rebellious', 'defiant', 'nonconformist', 'maverick', 'rebellion'],
-            'mentor': ['mentor', 'teacher', 'coach', 'instructor', 'guide', 'teaching', 'coaching'],
-            'loner': ['alone', 'solitary', 'independent', 'lone', 'isolated', 'self-reliant', 'lone wolf'],
-            'hunter': ['hunter', 'hunts', 'seeks', 'pursues', 'targets', 'hunting', 'head-hunting'],
-            'guardian': ['guardian', 'protects', 'defends', 'safeguards', 'shields', 'guards'],
-            'challenger': ['challenger', 'challenges', 'tests', 'proves', 'demonstrates', 'challenging'],
-            'phoenix': ['phoenix', 'rises', 'rebirth', 'reborn', 'resurrected', 'renewed'],
-            'tactician': ['tactical', 'strategic', 'calculating', 'planner', 'strategist', 'tactician', 'game plan'],
-            'berserker': ['berserker', 'furious', 'rage', 'fury', 'uncontrolled', 'wild', 'savage', 'relentless'],
-            'samurai': ['samurai', 'honor', 'code', 'discipline', 'bushido', 'honorable'],
-            'gladiator': ['gladiator', 'arena', 'combat', 'battle', 'warrior', 'fighter'],
-            'outlaw': ['outlaw', 'renegade', 'rogue', 'outcast', 'exile', 'banished'],
-            'noble': ['noble', 'honorable', 'dignified', 'principled', 'upright', 'righteous']
-        }
-        
-        for archetype, keywords in archetype_keywords.items():
-            if any(keyword in lore_lower for keyword in keywords):
-                character_archetypes.append(archetype)
+    for archetype, keywords in FIGHTER_ARCHETYPE_KEYWORDS.items():
+        if not lore_hits.isdisjoint(keywords):
+            character_archetypes.append(archetype)
     
     # Also infer archetypes from stats if not found in lore
     if not character_archetypes:
@@ -1114,3 +1294,153 @@ def tag_fighter(fighter_row, mapping_df=None):
         'fighting_style': fighting_style,
         'character_archetypes': list(set(character_archetypes))  # Remove duplicates
     }
+
+
+def build_fighter_tag_table(fighters_df, mapping_df=None):
+    """
+    Precompute tags for every fighter.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+        mapping_df: Optional content-fighter mapping DataFrame
+    
+    Returns:
+        Dictionary of fighter name -> {themes, fighting_style, character_archetypes,
+        mapping_themes}. 'themes' excludes mapping themes; tag_fighter merges them
+        when called with a mapping.
+    """
+    mapping_themes = {}
+    if mapping_df is not None and len(mapping_df) > 0:
+        # One pass over the mapping instead of one scan per fighter
+        exploded = mapping_df[['fighter_name', 'common_themes']].dropna()
+        exploded = exploded.assign(theme=exploded['common_themes'].astype(str).str.split(','))
+        exploded = exploded.explode('theme')
+        exploded['theme'] = exploded['theme'].str.strip()
+        exploded = exploded[exploded['theme'] != ''].drop_duplicates(['fighter_name', 'theme'])
+        for fighter_name, fighter_themes in exploded.groupby('fighter_name', sort=False, observed=True)['theme']:
+            mapping_themes[fighter_name] = sorted(fighter_themes)
+    
+    # Frames loaded without lore and stats get them back from the fighter store for this
+    # pass only
+    fighters_df = fighter_store.with_store_columns(fighters_df)
+    
+    # Stats themes for every fighter in one columnar pass
+    stats_membership, stats_theme_names = extract_fighter_themes_batch(fighters_df)
+    
+    table = {}
+    for position, (_, fighter_row) in enumerate(fighters_df.iterrows()):
+        fighter_name = fighter_row.get('fighter', '')
+        if not isinstance(fighter_name, str) or fighter_name in table:
+            continue
+        row_stats = stats_membership.indices[stats_membership.indptr[position]:stats_membership.indptr[position + 1]]
+        tags = _compute_fighter_tags(fighter_row, [stats_theme_names[j] for j in row_stats])
+        table[fighter_name] = {
+            'themes': sorted(tags['themes']),
+            'fighting_style': tags['fighting_style'],
+            'character_archetypes': sorted(tags['character_archetypes']),
+            'mapping_themes': mapping_themes.get(fighter_name, [])
+        }
+    
+    return table
+
+
+def set_fighter_tag_table(table, fighters_version, mapping_version=None):
+    """
+    Register a precomputed fighter tag table for tag_fighter to read from.
+    
+    Args:
+        table: Dictionary from build_fighter_tag_table (None to unregister)
+        fighters_version: Data version of the fighters frame the table was built from
+        mapping_version: (data version, row count) of the mapping frame the table was built from
+    """
+    global _fighter_tag_table
+    if table is None:
+        _fighter_tag_table = None
+        return
+    _fighter_tag_table = {
+        'fighters': table,
+        'fighters_version': fighters_version,
+        'mapping_version': mapping_version
+    }
+
+
+def _lookup_fighter_tags(fighter_row, mapping_df=None):
+    """
+    Read a fighter's tags from the registered tag table.
+    
+    Returns:
+        Tags dictionary (fresh lists, safe to modify), or None if there is no table,
+        the fighter is missing, or the row/mapping come from a different data version
+    """
+    table = _fighter_tag_table
+    if table is None:
+        return None
+    
+    # Rows taken from a loader frame carry its data version in attrs
+    if fighter_row.attrs.get('data_version') != table['fighters_version']:
+        return None
+    
+    use_mapping = mapping_df is not None and len(mapping_df) > 0
+    if use_mapping and (mapping_df.attrs.get('data_version'), len(mapping_df)) != table['mapping_version']:
+        return None
+    
+    entry = table['fighters'].get(fighter_row.get('fighter', ''))
+    if entry is None:
+        return None
+    
+    fighter_themes = list(entry['themes'])
+    if use_mapping and entry['mapping_themes']:
+        fighter_themes = list(set(fighter_themes + entry['mapping_themes']))
+    
+    return {
+        'themes': fighter_themes,
+        'fighting_style': entry['fighting_style'],
+        'character_archetypes': list(entry['character_archetypes'])
+    }
+
+
+def tag_fighters(fighters_df, mapping_df=None):
+    """
+    Tag every fighter in a DataFrame.
+    Uses the registered fighter tag table when it matches fighters_df, and otherwise
+    builds a table on the fly (stats themes via the columnar batch path).
+    
+    Args:
+        fighters_df: Fighters DataFrame
+        mapping_df: Optional content-fighter mapping DataFrame
+    
+    Returns:
+        List of tag dictionaries (themes, fighting_style, character_archetypes),
+        aligned with the rows of fighters_df
+    """
+    table = _fighter_tag_table
+    use_registered = (
+        table is not None
+        and fighters_df.attrs.get('data_version') == table['fighters_version']
+        and (
+            mapping_df is None or len(mapping_df) == 0
+            or (mapping_df.attrs.get('data_version'), len(mapping_df)) == table['mapping_version']
+        )
+    )
+    if use_registered:
+        fighter_table = table['fighters']
+    else:
+        fighter_table = build_fighter_tag_table(fighters_df, mapping_df)
+    
+    use_mapping = mapping_df is not None and len(mapping_df) > 0
+    all_tags = []
+    for fighter_name in fighters_df['fighter']:
+        entry = fighter_table.get(fighter_name) if isinstance(fighter_name, str) else None
+        if entry is None:
+            all_tags.append({'themes': [], 'fighting_style': 'Fighter', 'character_archetypes': []})
+            continue
+        fighter_themes = list(entry['themes'])
+        if use_mapping and entry['mapping_themes']:
+            fighter_themes = list(set(fighter_themes + entry['mapping_themes']))
+        all_tags.append({
+            'themes': fighter_themes,
+            'fighting_style': entry['fighting_style'],
+            'character_archetypes': list(entry['character_archetypes'])
+        })
+    
+    return all_tags
@@ -0,0 +1,305 @@
+"""
+Theme-vector engine for fighter recommendations without a mapping table.
+Every content title and fighter is a weighted theme / genre / narrative vector: one
+L2-normalised block per label kind, scaled by the square root of the kind's weight, so a
+dot product is the weighted sum of per-kind cosine similarities (in [0, 1]).
+
+"Fighters closest to these titles" is answered with an exact blocked top-K over the
+fighter matrix, or with an HNSW index (hnswlib) when it is installed and the fighter
+count makes approximate search worthwhile.
+"""
+
+import numpy as np
+from . import fighter_store
+from . import mapping_builder
+from . import themes
+from . import vocabulary
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None  # hnswlib not installed - exact blocked search only
+
+
+# Label kinds and their weights (same split as the mapping scores)
+BLOCK_WEIGHTS = {
+    'theme': mapping_builder.THEME_WEIGHT,
+    'genre': mapping_builder.GENRE_WEIGHT,
+    'narrative': mapping_builder.NARRATIVE_WEIGHT
+}
+
+# Fighter rows scored per matrix product in exact search (bounds the score buffer)
+SCORE_BLOCK_ROWS = 4096
+
+# Build an HNSW index only above this many fighters; below it exact search is as fast
+ANN_MIN_FIGHTERS = 20000
+
+# HNSW graph parameters
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 100
+
+
+def content_labels(content_df):
+    """
+    Get per-title theme / genre / narrative labels from tag_content.
+    
+    Args:
+        content_df: Content catalog DataFrame
+    
+    Returns:
+        Dictionary of kind -> list of label lists (aligned with content_df)
+    """
+    labels = {kind: [] for kind in BLOCK_WEIGHTS}
+    for _, content_row in content_df.iterrows():
+        tags = themes.tag_content(content_row)
+        labels['theme'].append(tags['themes'])
+        labels['genre'].append([genre.lower() for genre in tags['genres']])
+        labels['narrative'].append(tags['narrative_patterns'])
+    return labels
+
+
+def fighter_labels(fighters_df):
+    """
+    Get per-fighter theme / genre / narrative labels.
+    Themes come from tag_fighter (lore and stats); tag_fighter has no genres or narratives,
+    so those come from the mapping builder's per-fighter rules.
+    
+    Args:
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Tuple of (dictionary of kind -> list of label lists, list of fighting styles),
+        aligned with fighters_df
+    """
+    fighter_tags = themes.tag_fighters(fighters_df)
+    
+    # Narratives read lore and stats; frames loaded without them get them back from the
+    # fighter store
+    fighters_df = fighter_store.with_store_columns(fighters_df)
+    
+    labels = {'theme': [tags['themes'] for tags in fighter_tags], 'genre': [], 'narrative': []}
+    for _, fighter_row in fighters_df.iterrows():
+        labels['genre'].append(mapping_builder.fighter_genres(fighter_row))
+        labels['narrative'].append(mapping_builder.fighter_narratives(fighter_row))
+    return labels, [tags['fighting_style'] for tags in fighter_tags]
+
+
+def _block(kind, rows, width):
+    """Dense (len(rows), width) block with each non-empty row scaled to norm sqrt(weight)."""
+    block = np.zeros((len(rows), width), dtype=np.float32)
+    for i, row_labels in enumerate(rows):
+        ids = np.unique(vocabulary.register(kind, row_labels))
+        ids = ids[ids < width]
+        if len(ids) > 0:
+            block[i, ids] = np.sqrt(BLOCK_WEIGHTS[kind] / len(ids))
+    return block
+
+
+def _vectors(labels, widths):
+    """Concatenate the per-kind blocks of a label set into one vector per row."""
+    return np.hstack([_block(kind, labels[kind], widths[kind]) for kind in BLOCK_WEIGHTS])
+
+
+def build_vector_index(content_df, fighters_df):
+    """
+    Build content and fighter vectors (and an HNSW index over fighters when available).
+    
+    Args:
+        content_df: Content catalog DataFrame
+        fighters_df: Fighters DataFrame
+    
+    Returns:
+        Index dictionary with content/fighter vectors, titles, fighter names, labels,
+        fighting styles, clusters and the optional HNSW index
+    """
+    content = content_labels(content_df)
+    
+    # Cluster IDs are stats columns; frames loaded without them get them from the store
+    fighters_df = fighter_store.with_store_columns(fighters_df)
+    fighters, fighting_styles = fighter_labels(fighters_df)
+    
+    # One entry per fighter name, first row wins (like the mapping)
+    fighter_names = fighters_df['fighter'].tolist() if 'fighter' in fighters_df.columns else [None] * len(fighters_df)
+    seen = set()
+    keep = []
+    for i, name in enumerate(fighter_names):
+        if isinstance(name, str) and name and name not in seen:
+            seen.add(name)
+            keep.append(i)
+    fighters = {kind: [rows[i] for i in keep] for kind, rows in fighters.items()}
+    
+    # Register every label first so both sides share the block widths
+    for labels in (content, fighters):
+        for kind in BLOCK_WEIGHTS:
+            for row_labels in labels[kind]:
+                vocabulary.register(kind, row_labels)
+    widths = {kind: vocabulary.size(kind) for kind in BLOCK_WEIGHTS}
+    
+    fighter_vectors = _vectors(fighters, widths)
+    titles = content_df['title'].tolist() if 'title' in content_df.columns else [None] * len(content_df)
+    clusters = fighters_df['kmeans_cluster'].tolist() if 'kmeans_cluster' in fighters_df.columns else [np.nan] * len(fighters_df)
+    
+    index = {
+        'widths': widths,
+        'content_vectors': _vectors(content, widths),
+        'titles': titles,
+        'title_rows': {title: i for i, title in reversed(list(enumerate(titles))) if isinstance(title, str)},  # First row wins
+        'content_labels': content,
+        'fighter_vectors': fighter_vectors,
+        'fighter_names': [fighter_names[i] for i in keep],
+        'fighter_labels': fighters,
+        'fighting_styles': [fighting_styles[i] for i in keep],
+        'fighter_clusters': [clusters[i] for i in keep],
+        'ann': None
+    }
+    
+    if hnswlib is not None and len(keep) >= ANN_MIN_FIGHTERS:
+        ann = hnswlib.Index(space='ip', dim=fighter_vectors.shape[1])
+        ann.init_index(max_elements=len(keep), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        ann.add_items(fighter_vectors, np.arange(len(keep)))
+        ann.set_ef(HNSW_EF_SEARCH)
+        index['ann'] = ann
+    
+    return index
+
+
+def _normalise_blocks(vectors, widths):
+    """Rescale each kind's block of every row to norm sqrt(weight) (empty blocks stay zero)."""
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    start = 0
+    for kind, weight in BLOCK_WEIGHTS.items():
+        block = vectors[:, start:start + widths[kind]]
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        np.divide(block * np.sqrt(weight), norms, out=block, where=norms > 0)
+        start += widths[kind]
+    return vectors
+
+
+def query_vector(index, content_titles=None, labels=None):
+    """
+    Build a query vector from titles and/or explicit labels.
+    The query is the centroid of the titles' vectors plus, weighted like that centroid,
+    a vector of the explicit labels, with each kind's block renormalised.
+    
+    Args:
+        index: Index dictionary from build_vector_index
+        content_titles: List of content titles (unknown titles are ignored)
+        labels: Dictionary of kind -> list of labels (e.g. selected themes / genres)
+    
+    Returns:
+        Query vector, or None if nothing in the query is known to the index
+    """
+    widths = index['widths']
+    parts = []
+    
+    rows = [index['title_rows'][title] for title in content_titles or [] if title in index['title_rows']]
+    if rows:
+        parts.append(index['content_vectors'][rows].mean(axis=0))
+    
+    if labels:
+        blocks = []
+        for kind in BLOCK_WEIGHTS:
+            block = np.zeros(widths[kind], dtype=np.float32)
+            ids = vocabulary.lookup(kind, labels.get(kind) or [])
+            ids = np.unique(ids[ids < widths[kind]])
+            if len(ids) > 0:
+                block[ids] = np.sqrt(BLOCK_WEIGHTS[kind] / len(ids))
+            blocks.append(block)
+        explicit = np.concatenate(blocks)
+        if explicit.any():
+            parts.append(explicit)
+    
+    if not parts:
+        return None
+    return _normalise_blocks(np.sum(parts, axis=0), widths)[0]
+
+
+def _exact_top_k(fighter_vectors, queries, k):
+    """Exact top-k fighters per query, scoring SCORE_BLOCK_ROWS fighters at a time."""
+    # Products in float64 rounded back to float32, so near-ties come out the same whether
+    # a query is scored alone or in a batch (BLAS sums in a shape-dependent order)
+    n_queries = len(queries)
+    queries = queries.astype(np.float64)
+    best_scores = np.full((n_queries, 0), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((n_queries, 0), dtype=np.int64)
+    
+    for start in range(0, len(fighter_vectors), SCORE_BLOCK_ROWS):
+        block_scores = (queries @ fighter_vectors[start:start + SCORE_BLOCK_ROWS].T.astype(np.float64)).astype(np.float32)
+        block_rows = np.broadcast_to(np.arange(start, start + block_scores.shape[1]), block_scores.shape)
+        scores = np.hstack([best_scores, block_scores])
+        rows = np.hstack([best_rows, block_rows])
+        
+        # Keep the k best of the running set and this block: highest score first, ties by
+        # fighter row (a partial selection could drop rows tied with the k-th score)
+        order = np.lexsort((rows, -scores), axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, order, axis=1)
+        best_rows = np.take_along_axis(rows, order, axis=1)
+    
+    return best_rows, best_scores
+
+
+def top_fighters(index, queries, k):
+    """
+    Get the k fighters closest to each query vector.
+    
+    Args:
+        index: Index dictionary from build_vector_index
+        queries: Query vectors, shape (n_queries, dim) or (dim,)
+        k: Number of fighters per query
+    
+    Returns:
+        Tuple of (fighter rows, scores) arrays of shape (n_queries, k'), k' = min(k, n_fighters),
+        best match first
+    """
+    queries = np.array(queries, dtype=np.float32, ndmin=2)
+    k = min(max(int(k), 0), len(index['fighter_names']))
+    if k == 0 or len(queries) == 0:
+        return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0), dtype=np.float32)
+    
+    ann = index['ann']
+    if ann is not None:
+        ann.set_ef(max(HNSW_EF_SEARCH, k))
+        rows, distances = ann.knn_query(queries, k=k)
+        return rows.astype(np.int64), (1.0 - distances).astype(np.float32)
+    return _exact_top_k(index['fighter_vectors'], queries, k)
+
+
+def shared_labels(index, fighter_row, query_labels):
+    """
+    Get the labels of each kind a fighter shares with a query, in query order.
+    
+    Args:
+        index: Index dictionary from build_vector_index
+        fighter_row: Fighter position in the index
+        query_labels: Dictionary of kind -> list of query labels
+    
+    Returns:
+        Dictionary of kind -> list of shared labels
+    """
+    shared = {}
+    for kind in BLOCK_WEIGHTS:
+        fighter_set = set(index['fighter_labels'][kind][fighter_row])
+        shared[kind] = [label for label in dict.fromkeys(query_labels.get(kind) or []) if label in fighter_set]
+    return shared
+
+
+def title_labels(index, content_titles):
+    """
+    Collect the labels of some titles, in title order.
+    
+    Args:
+        index: Index dictionary from build_vector_index
+        content_titles: List of content titles
+    
+    Returns:
+        Dictionary of kind -> list of labels (may repeat)
+    """
+    labels = {kind: [] for kind in BLOCK_WEIGHTS}
+    for title in content_titles or []:
+        row = index['title_rows'].get(title)
+        if row is None:
+            continue
+        for kind in BLOCK_WEIGHTS:
+            labels[kind].extend(index['content_labels'][kind][row])
+    return labels
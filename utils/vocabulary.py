@@ -0,0 +1,213 @@
+"""
+Tag vocabulary registry with integer IDs and packed bitsets.
+Themes, genres, character archetypes and narratives each get stable integer IDs, so tag
+sets can be stored as uint64 bitsets and overlaps counted with popcount(AND).
+"""
+
+import threading
+import numpy as np
+
+
+# Tag kinds with their own ID space
+TAG_KINDS = ('theme', 'genre', 'archetype', 'narrative')
+
+# Bits per packed word
+WORD_BITS = 64
+
+# kind -> {'names': [...], 'ids': {name: id}}; IDs are append-only for the process lifetime,
+# so bitsets packed earlier stay valid as the vocabulary grows (they are zero-padded on use)
+_registry = {kind: {'names': [], 'ids': {}} for kind in TAG_KINDS}
+_registry_lock = threading.Lock()
+
+# Bit counts of every byte value (popcount fallback for NumPy < 2.0)
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def register(kind, names):
+    """
+    Assign integer IDs to tag names, adding unseen names to the vocabulary.
+    
+    Args:
+        kind: Tag kind (one of TAG_KINDS)
+        names: Iterable of tag names
+    
+    Returns:
+        int64 array of IDs, aligned with names
+    """
+    vocabulary = _registry[kind]
+    names = list(names)
+    with _registry_lock:
+        for name in names:
+            if name not in vocabulary['ids']:
+                vocabulary['ids'][name] = len(vocabulary['names'])
+                vocabulary['names'].append(name)
+        return np.array([vocabulary['ids'][name] for name in names], dtype=np.int64)
+
+
+def lookup(kind, names):
+    """
+    Get the IDs of known tag names without growing the vocabulary (e.g. for user selections).
+    
+    Args:
+        kind: Tag kind (one of TAG_KINDS)
+        names: Iterable of tag names
+    
+    Returns:
+        int64 array of IDs of the names that are in the vocabulary
+    """
+    ids = _registry[kind]['ids']
+    return np.array([ids[name] for name in names if name in ids], dtype=np.int64)
+
+
+def names_for(kind, ids):
+    """
+    Get tag names for IDs.
+    
+    Args:
+        kind: Tag kind (one of TAG_KINDS)
+        ids: Iterable of IDs
+    
+    Returns:
+        List of tag names
+    """
+    names = _registry[kind]['names']
+    return [names[i] for i in ids]
+
+
+def size(kind):
+    """Number of tags registered for a kind."""
+    return len(_registry[kind]['names'])
+
+
+def n_words(kind):
+    """Number of uint64 words needed to hold a bitset of every tag of a kind."""
+    return max(1, -(-size(kind) // WORD_BITS))
+
+
+def pack(ids, words):
+    """
+    Pack tag IDs into a uint64 bitset.
+    
+    Args:
+        ids: Iterable of IDs
+        words: Bitset width in uint64 words
+    
+    Returns:
+        uint64 array of length words
+    """
+    bits = np.zeros(words, dtype=np.uint64)
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(ids) > 0:
+        np.bitwise_or.at(bits, ids // WORD_BITS, np.left_shift(np.uint64(1), (ids % WORD_BITS).astype(np.uint64)))
+    return bits
+
+
+def encode(kind, names, words=None):
+    """
+    Register tag names and pack them into a bitset.
+    
+    Args:
+        kind: Tag kind (one of TAG_KINDS)
+        names: Iterable of tag names
+        words: Bitset width in uint64 words (defaults to the current vocabulary width)
+    
+    Returns:
+        uint64 bitset
+    """
+    ids = register(kind, names)
+    return pack(ids, words if words is not None else n_words(kind))
+
+
+def encode_rows(kind, rows):
+    """
+    Register and pack one tag list per row into a bitset matrix.
+    
+    Args:
+        kind: Tag kind (one of TAG_KINDS)
+        rows: List of tag name lists
+    
+    Returns:
+        uint64 array of shape (len(rows), words)
+    """
+    row_ids = [register(kind, names) for names in rows]
+    words = n_words(kind)
+    matrix = np.zeros((len(rows), words), dtype=np.uint64)
+    for i, ids in enumerate(row_ids):
+        if len(ids) > 0:
+            np.bitwise_or.at(matrix[i], ids // WORD_BITS, np.left_shift(np.uint64(1), (ids % WORD_BITS).astype(np.uint64)))
+    return matrix
+
+
+def decode(kind, bits):
+    """
+    Get the tag names set in a bitset.
+    
+    Args:
+        kind: Tag kind (one of TAG_KINDS)
+        bits: uint64 bitset
+    
+    Returns:
+        List of tag names, in ID order
+    """
+    bits = np.asarray(bits, dtype='<u8')  # Little-endian words, so bit i of the bitset is unpacked bit i
+    unpacked = np.unpackbits(bits.view(np.uint8), bitorder='little')
+    return names_for(kind, np.flatnonzero(unpacked))
+
+
+def _align(bits, words):
+    """Zero-pad (or trim) the last axis of a bitset array to a word count."""
+    width = bits.shape[-1]
+    if width == words:
+        return bits
+    if width > words:
+        return bits[..., :words]
+    padding = [(0, 0)] * (bits.ndim - 1) + [(0, words - width)]
+    return np.pad(bits, padding)
+
+
+def popcount(bits):
+    """
+    Count set bits per uint64 word.
+    
+    Args:
+        bits: uint64 array
+    
+    Returns:
+        Array of bit counts with the same shape
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits)
+    bits = np.ascontiguousarray(bits, dtype=np.uint64)
+    return _BYTE_POPCOUNT[bits.view(np.uint8)].reshape(bits.shape + (8,)).sum(axis=-1)
+
+
+def overlap_counts(row_bits, query_bits):
+    """
+    Count shared tags between every row bitset and a query bitset: popcount(row AND query).
+    
+    Args:
+        row_bits: uint64 array of shape (n_rows, words)
+        query_bits: uint64 bitset
+    
+    Returns:
+        int64 array of overlap counts, one per row
+    """
+    words = max(row_bits.shape[-1], len(query_bits))
+    shared = np.bitwise_and(_align(row_bits, words), _align(np.asarray(query_bits, dtype=np.uint64), words))
+    return popcount(shared).sum(axis=-1, dtype=np.int64)
+
+
+def union(bitsets, words=None):
+    """
+    OR-reduce bitsets.
+    
+    Args:
+        bitsets: uint64 array of shape (n_rows, words)
+        words: Result width in uint64 words (defaults to the input width)
+    
+    Returns:
+        uint64 bitset
+    """
+    bitsets = np.asarray(bitsets, dtype=np.uint64)
+    result = np.bitwise_or.reduce(bitsets, axis=0) if len(bitsets) > 0 else np.zeros(bitsets.shape[-1], dtype=np.uint64)
+    return _align(result, words) if words is not None else result